@@ -0,0 +1,79 @@
+"""
+Per-customer order datasets, loaded on demand.
+
+Layout:
+    data/customers/<customer_id>/orders_2025.json
+
+Only customers that are actually requested are read from disk, and at most
+CUSTOMER_CACHE_SIZE of them are kept in memory (least recently used are
+evicted), so memory stays flat as the number of customers grows.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from scenarios import load_baseline
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CUSTOMERS_DIR = os.path.join(BASE_DIR, 'data', 'customers')
+PRODUCTS_PATH = os.path.join(BASE_DIR, 'static', 'data', 'products.json')
+ORDERS_FILE = 'orders_2025.json'
+
+DEFAULT_CUSTOMER = 'ssb'
+CUSTOMER_CACHE_SIZE = int(os.environ.get('CUSTOMER_CACHE_SIZE', '16'))
+
+_CUSTOMER_ID_RE = re.compile(r'^[a-z0-9][a-z0-9_-]{0,63}$')
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def orders_path(customer_id):
+    """Path to a customer's orders file, or None if the id is invalid or unknown."""
+    if not customer_id or not _CUSTOMER_ID_RE.match(customer_id):
+        return None
+    path = os.path.join(CUSTOMERS_DIR, customer_id, ORDERS_FILE)
+    return path if os.path.isfile(path) else None
+
+
+def _get_entry(customer_id):
+    """Return the cache entry for a customer, loading it from disk if needed."""
+    path = orders_path(customer_id)
+    if not path:
+        return None
+    stamp = (os.path.getmtime(path), os.path.getmtime(PRODUCTS_PATH))
+
+    with _cache_lock:
+        entry = _cache.get(customer_id)
+        if entry and entry['stamp'] == stamp:
+            _cache.move_to_end(customer_id)
+            return entry
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    entry = {'stamp': stamp, 'path': path, 'orders_json': raw, 'baseline': None}
+
+    with _cache_lock:
+        _cache[customer_id] = entry
+        _cache.move_to_end(customer_id)
+        while len(_cache) > CUSTOMER_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return entry
+
+
+def get_orders_json(customer_id):
+    """Raw orders JSON bytes for a customer, or None if unknown."""
+    entry = _get_entry(customer_id)
+    return entry['orders_json'] if entry else None
+
+
+def get_baseline(customer_id):
+    """Scenario baseline for a customer (built lazily on first use), or None if unknown."""
+    entry = _get_entry(customer_id)
+    if not entry:
+        return None
+    if entry['baseline'] is None:
+        entry['baseline'] = load_baseline(entry['path'], PRODUCTS_PATH)
+    return entry['baseline']
@@ -1,18 +1,28 @@
 """
 SSB Sustainability Dashboard - Flask Application
-Piana Sustainability Calculator for Simmons Serta Bedding
+Piana Sustainability Calculator for Simmons Serta Bedding (and other bedding customers)
 """
 
-from flask import Flask, render_template, send_from_directory, jsonify
+from flask import Flask, render_template, send_from_directory, jsonify, request, abort, Response
 import os
 import json
 
+from customers import DEFAULT_CUSTOMER, orders_path, get_orders_json, get_baseline
+from scenarios import compare_scenarios
+
 app = Flask(__name__)
 
 @app.route('/')
 def index():
-    """Main calculator page"""
-    return render_template('calculator.html')
+    """Main calculator page (default customer)"""
+    return customer_index(DEFAULT_CUSTOMER)
+
+@app.route('/customers/<customer_id>/')
+def customer_index(customer_id):
+    """Calculator page scoped to one customer"""
+    if not orders_path(customer_id):
+        abort(404)
+    return render_template('calculator.html', customer_id=customer_id)
 
 @app.route('/api/products')
 def get_products():
@@ -25,10 +35,51 @@ def get_products():
 @app.route('/api/orders-2025')
 def get_orders_2025():
     """API endpoint to get 2025 SSB order data"""
-    json_path = os.path.join(app.static_folder, 'data', 'orders_2025.json')
-    with open(json_path, 'r') as f:
-        data = json.load(f)
-    return jsonify(data)
+    return get_customer_orders_2025(DEFAULT_CUSTOMER)
+
+@app.route('/api/customers/<customer_id>/orders-2025')
+def get_customer_orders_2025(customer_id):
+    """API endpoint to get a customer's 2025 order data"""
+    data = get_orders_json(customer_id)
+    if data is None:
+        return jsonify({'error': 'Unknown customer'}), 404
+    return Response(data, mimetype='application/json')
+
+@app.route('/api/scenarios', methods=['POST'])
+def post_scenarios():
+    """API endpoint to compare what-if scenarios against 2025 SSB orders"""
+    return post_customer_scenarios(DEFAULT_CUSTOMER)
+
+@app.route('/api/customers/<customer_id>/scenarios', methods=['POST'])
+def post_customer_scenarios(customer_id):
+    """
+    API endpoint to compare what-if product-mix scenarios against a customer's 2025 orders.
+
+    Expected JSON payload:
+    {
+        "scenarios": [
+            {"name": "30% BSPV 1.1 to rolls",
+             "rules": [{"from": "BSPV 1.1", "to": "CRS800 0.9 OSF ROLL", "share": 0.3}]}
+        ]
+    }
+    """
+    baseline = get_baseline(customer_id)
+    if baseline is None:
+        return jsonify({'error': 'Unknown customer'}), 404
+
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    scenarios = data.get('scenarios')
+    if scenarios is None and 'rules' in data:
+        scenarios = [data]
+    if not isinstance(scenarios, list):
+        return jsonify({'error': "'scenarios' must be a list"}), 400
+
+    try:
+        return jsonify(compare_scenarios(baseline, scenarios))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 @app.route('/static/<path:filename>')
 def serve_static(filename):
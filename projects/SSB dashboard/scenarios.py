@@ -0,0 +1,283 @@
+"""
+What-if scenario engine for customer order baselines.
+
+A scenario is a list of substitution rules applied to the 2025 order
+quantities, e.g. "move 30% of BSPV 1.1 volume to CRS800 0.9 OSF ROLL":
+
+    {"from": "BSPV 1.1", "to": "CRS800 0.9 OSF ROLL", "share": 0.3}
+
+- from:  product name or name prefix (e.g. "BSPV 1.1", "SYFI", "BSPV 2.2 KING")
+- to:    product name, or a prefix that is combined with the remainder of
+         each matched source name ("BSPV 1.1" -> "BSPV 2.2" maps KING to KING)
+- share: fraction of the matched quantity to move (0-1)
+- ratio: optional unit conversion applied to the moved quantity (default 1.0)
+
+Rules are applied in order. Totals and equivalencies are recomputed with
+numpy over the whole product vector, and results are memoised per
+(baseline version, scenario hash).
+"""
+
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# EPA equivalencies (same factors as the calculator methodology)
+KG_CO2_PER_TREE_YEAR = 21.77
+KG_CO2_PER_CAR_MILE = 0.4
+
+SCENARIO_CACHE_SIZE = 256
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class Baseline:
+    """Order quantities and emission factors as aligned numpy vectors."""
+
+    def __init__(self, orders, products, version):
+        self.version = version
+        self.year = orders.get('year')
+        self.customer = orders.get('customer')
+
+        names, families, quantities, factors = [], [], [], []
+        family_units = {}
+
+        # Emission factor index from the product catalogue
+        for pad in products.get('pads', []):
+            family_units.setdefault(pad['name'], pad.get('unit', 'pieces'))
+            if pad.get('has_osf'):
+                for osf, sizes in pad.get('osf_options', {}).items():
+                    for s in sizes:
+                        names.append(f"{pad['name']} {osf} {s['size']}")
+                        families.append(pad['name'])
+                        factors.append(s['emission_factor'])
+            else:
+                for s in pad.get('sizes', []):
+                    names.append(f"{pad['name']} {s['size']}")
+                    families.append(pad['name'])
+                    factors.append(s['emission_factor'])
+        for roll in products.get('rolls', []):
+            names.append(roll['name'])
+            families.append('Rolls')
+            factors.append(roll['emission_factor'])
+        family_units.setdefault('Rolls', 'linear yards')
+
+        index = {name: i for i, name in enumerate(names)}
+        quantities = [0.0] * len(names)
+
+        # Overlay the order quantities (orders may list products not in the catalogue)
+        for family in orders.get('by_family', []):
+            family_units[family['family']] = family.get('unit', family_units.get(family['family']))
+            for p in family.get('products', []):
+                i = index.get(p['name'])
+                if i is None:
+                    i = index[p['name']] = len(names)
+                    names.append(p['name'])
+                    families.append(family['family'])
+                    factors.append(p['emission_factor'])
+                    quantities.append(0.0)
+                quantities[i] = float(p['quantity'])
+
+        self.names = names
+        self.index = index
+        self.family_names = list(dict.fromkeys(families))
+        self.family_units = [family_units.get(f, '') for f in self.family_names]
+        family_pos = {f: i for i, f in enumerate(self.family_names)}
+        self.family_codes = np.array([family_pos[f] for f in families], dtype=np.intp)
+        self.quantity = np.array(quantities, dtype=np.float64)
+        self.emission_factor = np.array(factors, dtype=np.float64)
+        self._selections = {}
+
+    def select(self, source, target):
+        """Return (source indices, target indices) for a rule, cached per baseline."""
+        key = (source, target)
+        if key in self._selections:
+            return self._selections[key]
+
+        src, tgt = [], []
+        for i, name in enumerate(self.names):
+            if name != source and not name.startswith(source + ' '):
+                continue
+            target_name = target if target in self.index else target + name[len(source):]
+            j = self.index.get(target_name)
+            if j is None:
+                raise ValueError(f"Unknown target product '{target_name}'")
+            if i != j:
+                src.append(i)
+                tgt.append(j)
+
+        if not src:
+            raise ValueError(f"No products match '{source}'")
+
+        selection = (np.array(src, dtype=np.intp), np.array(tgt, dtype=np.intp))
+        self._selections[key] = selection
+        return selection
+
+    def evaluate(self, quantity):
+        """Compute totals, family subtotals and equivalencies for a quantity vector."""
+        co2e = quantity * self.emission_factor
+        n = len(self.family_names)
+        family_qty = np.bincount(self.family_codes, weights=quantity, minlength=n)
+        family_co2e = np.bincount(self.family_codes, weights=co2e, minlength=n)
+        total = float(co2e.sum())
+
+        return {
+            'summary': {
+                'total_co2e_kg': int(round(total)),
+                'total_co2e_tons': round(total / 1000, 2)
+            },
+            'by_family': [
+                {
+                    'family': self.family_names[i],
+                    'unit': self.family_units[i],
+                    'subtotal_qty': int(round(family_qty[i])),
+                    'subtotal_co2e_kg': int(round(family_co2e[i]))
+                }
+                for i in range(n)
+            ],
+            'equivalencies': {
+                'trees_per_year': int(round(total / KG_CO2_PER_TREE_YEAR)),
+                'car_miles': int(round(total / KG_CO2_PER_CAR_MILE))
+            }
+        }
+
+
+def _file_version(*paths):
+    """Short content hash identifying a baseline build."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def load_baseline(orders_path, products_path):
+    """Build a Baseline from the orders and product catalogue JSON files."""
+    with open(orders_path, 'r') as f:
+        orders = json.load(f)
+    with open(products_path, 'r') as f:
+        products = json.load(f)
+    return Baseline(orders, products, _file_version(orders_path, products_path))
+
+
+# Upper bound on units of target per unit of source; larger ratios are input
+# errors and would overflow the kg totals
+MAX_RATIO = 1000
+
+
+def normalize_rules(rules):
+    """Validate substitution rules and return them in canonical form."""
+    if not isinstance(rules, list):
+        raise ValueError("'rules' must be a list")
+
+    normalized = []
+    for rule in rules:
+        if not isinstance(rule, dict):
+            raise ValueError("Each rule must be an object")
+        source = str(rule.get('from', '')).strip().upper()
+        target = str(rule.get('to', '')).strip().upper()
+        if not source or not target:
+            raise ValueError("Each rule needs 'from' and 'to'")
+        try:
+            share = float(rule.get('share', 1.0))
+            ratio = float(rule.get('ratio', 1.0))
+        except (TypeError, ValueError):
+            raise ValueError("'share' and 'ratio' must be numbers")
+        if not (math.isfinite(share) and math.isfinite(ratio)):
+            raise ValueError("'share' and 'ratio' must be finite numbers")
+        if not 0 <= share <= 1:
+            raise ValueError("'share' must be between 0 and 1")
+        if not 0 <= ratio <= MAX_RATIO:
+            raise ValueError(f"'ratio' must be between 0 and {MAX_RATIO}")
+        normalized.append({'from': source, 'to': target, 'share': share, 'ratio': ratio})
+    return normalized
+
+
+def scenario_hash(rules):
+    """Stable hash of a normalized rule list."""
+    canonical = json.dumps(rules, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def _apply_rules(baseline, rules):
+    """Apply substitution rules in order and return the new quantity vector."""
+    quantity = baseline.quantity.copy()
+    for rule in rules:
+        src, tgt = baseline.select(rule['from'], rule['to'])
+        moved = quantity[src] * rule['share']
+        quantity[src] -= moved
+        # np.add.at accumulates correctly when several sources share a target
+        np.add.at(quantity, tgt, moved * rule['ratio'])
+    return quantity
+
+
+def _changed_products(baseline, quantity):
+    """List the products whose quantity differs from the baseline."""
+    changed = np.flatnonzero(~np.isclose(quantity, baseline.quantity))
+    co2e = quantity[changed] * baseline.emission_factor[changed]
+    return [
+        {
+            'name': baseline.names[i],
+            'baseline_quantity': int(round(baseline.quantity[i])),
+            'quantity': int(round(quantity[i])),
+            'emission_factor': float(baseline.emission_factor[i]),
+            'co2e_kg': int(round(c))
+        }
+        for i, c in zip(changed.tolist(), co2e.tolist())
+    ]
+
+
+def run_scenario(baseline, rules):
+    """
+    Evaluate a scenario against a baseline, memoised per
+    (baseline version, scenario hash).
+    """
+    rules = normalize_rules(rules)
+    key = (baseline.version, scenario_hash(rules))
+
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    quantity = _apply_rules(baseline, rules)
+    result = baseline.evaluate(quantity)
+    result['products_changed'] = _changed_products(baseline, quantity)
+    result['baseline_version'] = key[0]
+    result['scenario_hash'] = key[1]
+
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > SCENARIO_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def compare_scenarios(baseline, scenarios):
+    """
+    Evaluate several named scenarios and report each against the baseline.
+    scenarios: list of {"name": str, "rules": [...]}
+    """
+    base = run_scenario(baseline, [])
+    base_total = base['summary']['total_co2e_kg']
+
+    results = []
+    for i, scenario in enumerate(scenarios):
+        if not isinstance(scenario, dict):
+            raise ValueError("Each scenario must be an object")
+        result = run_scenario(baseline, scenario.get('rules', []))
+        delta = result['summary']['total_co2e_kg'] - base_total
+        results.append({
+            'name': scenario.get('name') or f"Scenario {i + 1}",
+            **result,
+            'delta': {
+                'co2e_kg': delta,
+                'pct': round(delta / base_total * 100, 2) if base_total else None
+            }
+        })
+
+    return {'baseline': base, 'scenarios': results}
@@ -0,0 +1,329 @@
+"""
+Build fingerprinted, pre-compressed static assets
+- Minifies and bundles the CSS, bundles the JS (BUNDLES) and copies the other
+  assets (COPY) to static/dist/ under content-hashed names, e.g.
+  css/app.1a2b3c4d5e.css. JS is concatenated but not minified (no safe
+  regex minifier); it is served compressed.
+- Extracts the above-the-fold rules of the app bundle (CRITICAL_ELEMENTS,
+  CRITICAL_CLASSES, HIDDEN_UNTIL_OPENED) into css/critical.css, which base.html inlines so the
+  full stylesheet can load without blocking the first render
+- Optionally self-hosts the web fonts (FONTS): subsets the source TTFs in
+  static/fonts/ to Latin, writes them as WOFF2 and their @font-face rules to
+  css/fonts.css, which the templates inline instead of linking Google Fonts
+  (see templates/partials/fonts.html). Needs fonttools and brotli; skipped,
+  keeping Google Fonts, when those or the source files are missing
+- Writes .gz (and .br when the brotli package is installed) next to each
+  text asset so they can be served without compressing per request
+- Writes static/dist/manifest.json (logical name -> hashed path), which the
+  asset_url() template helper resolves (see services/static_assets.py)
+- Regenerates the precache list and CACHE_VERSION in static/service-worker.js
+  from the manifest, so the service worker no longer needs a manual version bump
+
+Because every output name changes with its content, /static/dist/ can be
+served with the one-year immutable Cache-Control header from vercel.json.
+
+Usage:
+  cd projects/pianabihub
+  python build_assets.py        # run after editing anything under static/css, static/js or static/icons
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from fontTools import subset
+except ImportError:
+    subset = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(SCRIPT_DIR, 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+SERVICE_WORKER_PATH = os.path.join(STATIC_DIR, 'service-worker.js')
+
+# Output bundle -> source files (relative to static/), concatenated in order
+BUNDLES = {
+    'css/app.css': ['css/base.css', 'css/components.css', 'css/shell.css'],
+    'css/base.css': ['css/base.css'],
+    'js/app.js': ['js/nav.js', 'js/pwa.js', 'js/install-prompt.js', 'js/auto-update.js'],
+}
+
+# Critical CSS: only what is on screen before any interaction - page reset and
+# typography, the top and bottom navigation bars and the stale-data banner
+# (the admin-mode banner is rare enough to wait for the bundle). A
+# selector qualifies if every class in it has one of CRITICAL_CLASSES'
+# prefixes (state classes aside), or it has no class and starts with one of
+# CRITICAL_ELEMENTS. Overlays that open on click (HIDDEN_UNTIL_OPENED) only
+# get display:none; interaction states are left to the bundle.
+CRITICAL_SOURCE = 'css/app.css'
+CRITICAL_ELEMENTS = (':root', '*', 'html', 'body', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'a')
+CRITICAL_CLASSES = ('.container', '.hide-', '.show-', '.main-nav', '.nav-content', '.nav-home-link',
+                    '.nav-links', '.nav-user-dropdown', '.nav-user-btn', '.hamburger-', '.bottom-nav',
+                    '.stale-data-banner')
+HIDDEN_UNTIL_OPENED = ('.mobile-menu', '.nav-user-menu')
+STATE_CLASSES = ('.active',)
+INTERACTION_STATES = (':hover', ':focus', ':active')
+
+# Assets fingerprinted as-is
+COPY = ['icons/icon-192.png', 'icons/icon-512.png']
+
+COMPRESSIBLE = ('.css', '.js', '.json', '.svg')
+
+# Self-hosted fonts: (family, weight, output name, source under static/) - the
+# static TTFs from the Inter and JetBrains Mono releases
+FONTS = [
+    ('Inter', 400, 'fonts/inter-400.woff2', 'fonts/Inter-Regular.ttf'),
+    ('Inter', 500, 'fonts/inter-500.woff2', 'fonts/Inter-Medium.ttf'),
+    ('Inter', 600, 'fonts/inter-600.woff2', 'fonts/Inter-SemiBold.ttf'),
+    ('Inter', 700, 'fonts/inter-700.woff2', 'fonts/Inter-Bold.ttf'),
+    ('JetBrains Mono', 400, 'fonts/jetbrains-mono-400.woff2', 'fonts/JetBrainsMono-Regular.ttf'),
+    ('JetBrains Mono', 500, 'fonts/jetbrains-mono-500.woff2', 'fonts/JetBrainsMono-Medium.ttf'),
+]
+
+# Google Fonts' "latin" subset
+FONT_UNICODE_RANGE = ('U+0000-00FF,U+0131,U+0152-0153,U+02BB-02BC,U+02C6,U+02DA,U+02DC,U+0304,U+0308,'
+                      'U+0329,U+2000-206F,U+20AC,U+2122,U+2191,U+2193,U+2212,U+2215,U+FEFF,U+FFFD')
+
+# Built files that are inlined into pages and never requested
+INLINE_ONLY = ('css/critical.css', 'css/fonts.css')
+
+# Pages the service worker pre-caches alongside the manifest's assets
+PRECACHE_PAGES = ['/', '/offline', '/maintenance', '/static/manifest.json']
+
+SW_BEGIN = '// --- BEGIN GENERATED by build_assets.py (do not edit) ---'
+SW_END = '// --- END GENERATED ---'
+
+_STRING = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+
+
+def minify_css(css):
+    """Conservative CSS minifier: comments, whitespace, and spaces around { } ; , and after :"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    parts = _STRING.split(css)
+    for i in range(0, len(parts), 2):  # even parts are outside string literals
+        text = re.sub(r'\s+', ' ', parts[i])
+        text = re.sub(r'\s*([{};,])\s*', r'\1', text)
+        text = re.sub(r':\s+', ':', text)
+        parts[i] = text.replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+def split_rules(css):
+    """Top-level (prelude, block) pairs of minified CSS."""
+    rules, depth, start, prelude_end, quote = [], 0, 0, 0, None
+    for i, ch in enumerate(css):
+        if quote:
+            if ch == quote and css[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '{':
+            if depth == 0:
+                prelude_end = i
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                rules.append((css[start:prelude_end], css[prelude_end + 1:i]))
+                start = i + 1
+    return rules
+
+
+def is_critical(selector):
+    selector = selector.strip()
+    if any(state in selector for state in INTERACTION_STATES):
+        return False
+    classes = [c for c in re.findall(r'\.[\w-]+', selector) if c not in STATE_CLASSES]
+    if classes:
+        return all(c.startswith(CRITICAL_CLASSES) for c in classes)
+    element = re.match(r'[^\s.#\[:>+~]+|:root|\*', selector)
+    return bool(element) and element.group(0) in CRITICAL_ELEMENTS
+
+
+def critical_rules(css):
+    """Rules (also inside @media/@supports) with at least one critical selector."""
+    out = []
+    for prelude, block in split_rules(css):
+        if prelude.startswith(('@media', '@supports')):
+            inner = critical_rules(block)
+            if inner:
+                out.append(f"{prelude}{{{inner}}}")
+        elif prelude in HIDDEN_UNTIL_OPENED:
+            # Only needs to stay hidden until the bundle has loaded
+            if 'display:none' in block:
+                out.append(f"{prelude}{{display:none}}")
+        elif not prelude.startswith('@') and any(is_critical(s) for s in prelude.split(',')):
+            out.append(f"{prelude}{{{block}}}")
+    return ''.join(out)
+
+
+def critical_css(css):
+    """
+    Critical rules, with the :root custom properties cut down to the ones
+    they use (directly or through other properties); the bundle's own :root
+    defines the rest once it loads.
+    """
+    rules = critical_rules(css)
+    root = [block for prelude, block in split_rules(rules) if prelude == ':root']
+    others = ''.join(f"{prelude}{{{block}}}" for prelude, block in split_rules(rules) if prelude != ':root')
+    declarations = {}
+    for block in root:
+        for declaration in block.split(';'):
+            name, _, value = declaration.partition(':')
+            if name.startswith('--'):
+                declarations[name] = value
+
+    used, queue = set(), re.findall(r'var\((--[\w-]+)', others)
+    while queue:
+        name = queue.pop()
+        if name in declarations and name not in used:
+            used.add(name)
+            queue.extend(re.findall(r'var\((--[\w-]+)', declarations[name]))
+    kept = ';'.join(f"{name}:{value}" for name, value in declarations.items() if name in used)
+    return (f":root{{{kept}}}" if kept else '') + others
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def hashed_name(logical, data):
+    stem, ext = os.path.splitext(logical)
+    return f"{stem}.{content_hash(data)}{ext}"
+
+
+def write_output(rel_path, data):
+    path = os.path.join(DIST_DIR, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    if rel_path.endswith(COMPRESSIBLE):
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli:
+            with open(path + '.br', 'wb') as f:
+                f.write(brotli.compress(data, quality=11))
+
+
+def subset_font(path):
+    """WOFF2 bytes of a font reduced to FONT_UNICODE_RANGE."""
+    options = subset.Options()
+    options.flavor = 'woff2'
+    font = subset.load_font(path, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=subset.parse_unicodes(FONT_UNICODE_RANGE))
+    subsetter.subset(font)
+    out = io.BytesIO()
+    subset.save_font(font, out, options)
+    return out.getvalue()
+
+
+def build_fonts(manifest):
+    """Subset FONTS into dist/fonts/ and write css/fonts.css; returns False if skipped."""
+    missing = [src for _, _, _, src in FONTS if not os.path.isfile(os.path.join(STATIC_DIR, src))]
+    if missing:
+        print(f"Fonts: {len(missing)} of {len(FONTS)} sources missing under static/ - keeping Google Fonts")
+        return False
+    if not (subset and brotli):
+        print("Fonts: fonttools and brotli are needed for WOFF2 - keeping Google Fonts "
+              "(pip install fonttools brotli)")
+        return False
+
+    rules = []
+    for family, weight, logical, src in FONTS:
+        path = os.path.join(STATIC_DIR, src)
+        data = subset_font(path)
+        manifest[logical] = hashed_name(logical, data)
+        write_output(manifest[logical], data)
+        rules.append(f"@font-face{{font-family:'{family}';font-style:normal;font-weight:{weight};"
+                     f"font-display:swap;src:url(/static/dist/{manifest[logical]}) format('woff2');"
+                     f"unicode-range:{FONT_UNICODE_RANGE}}}")
+        print(f"{src}: {os.path.getsize(path) / 1024:.1f} KiB -> {len(data) / 1024:.1f} KiB woff2 "
+              f"-> dist/{manifest[logical]}")
+
+    data = ''.join(rules).encode('utf-8')
+    manifest['css/fonts.css'] = hashed_name('css/fonts.css', data)
+    write_output(manifest['css/fonts.css'], data)
+    return True
+
+
+def update_service_worker(manifest):
+    """Rewrite the generated block of the service worker from the manifest."""
+    assets = [f"/static/dist/{path}" for name, path in sorted(manifest.items(), key=lambda item: item[1])
+              if name not in INLINE_ONLY]
+    version = content_hash(json.dumps(manifest, sort_keys=True).encode())
+    block = '\n'.join([
+        SW_BEGIN,
+        f"const CACHE_VERSION = 'piana-bi-{version}';",
+        '',
+        '// Assets to cache immediately on install',
+        'const PRECACHE_ASSETS = [',
+        ',\n'.join(f"  '{url}'" for url in PRECACHE_PAGES + assets),
+        '];',
+        SW_END,
+    ])
+
+    with open(SERVICE_WORKER_PATH, encoding='utf-8') as f:
+        source = f.read()
+    start = source.index(SW_BEGIN)
+    end = source.index(SW_END) + len(SW_END)
+    with open(SERVICE_WORKER_PATH, 'w', encoding='utf-8') as f:
+        f.write(source[:start] + block + source[end:])
+    return version
+
+
+def main():
+    if not brotli:
+        print("NOTE: brotli not installed - writing gzip only (pip install brotli)")
+
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    os.makedirs(DIST_DIR)
+
+    manifest = {}
+    built = {}
+    for bundle, sources in BUNDLES.items():
+        text = '\n'.join(open(os.path.join(STATIC_DIR, src), encoding='utf-8').read() for src in sources)
+        if bundle.endswith('.css'):
+            text = minify_css(text)
+        built[bundle] = text
+        data = text.encode('utf-8')
+        original = sum(os.path.getsize(os.path.join(STATIC_DIR, src)) for src in sources)
+        manifest[bundle] = hashed_name(bundle, data)
+        write_output(manifest[bundle], data)
+        print(f"{bundle}: {original / 1024:.1f} KiB -> {len(data) / 1024:.1f} KiB, "
+              f"{len(gzip.compress(data, 9)) / 1024:.1f} KiB gzip -> dist/{manifest[bundle]}")
+
+    data = critical_css(built[CRITICAL_SOURCE]).encode('utf-8')
+    manifest['css/critical.css'] = hashed_name('css/critical.css', data)
+    write_output(manifest['css/critical.css'], data)
+    print(f"css/critical.css: {len(data) / 1024:.1f} KiB inline -> dist/{manifest['css/critical.css']}")
+
+    for asset in COPY:
+        with open(os.path.join(STATIC_DIR, asset), 'rb') as f:
+            data = f.read()
+        manifest[asset] = hashed_name(asset, data)
+        write_output(manifest[asset], data)
+        print(f"{asset} -> dist/{manifest[asset]}")
+
+    build_fonts(manifest)
+
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    version = update_service_worker(manifest)
+    print(f"\nManifest: {len(manifest)} assets, service worker cache piana-bi-{version}")
+
+
+if __name__ == '__main__':
+    main()
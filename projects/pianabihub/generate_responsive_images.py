@@ -0,0 +1,144 @@
+"""
+Generate responsive WebP/AVIF variants of the large static images
+Creates resized copies at several widths under content-hashed names in
+static/img/ and records them in static/img/manifest.json, which the
+responsive_image() template helper reads (see services/responsive_images.py)
+
+Incremental: a source whose content hash matches the manifest and whose
+variants all exist is skipped; variants of older versions are removed.
+
+Usage:
+  cd projects/pianabihub
+  python generate_responsive_images.py          # build new/changed images
+  python generate_responsive_images.py --force  # rebuild everything
+"""
+
+from PIL import Image, features
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(SCRIPT_DIR, 'static')
+OUTPUT_DIR = os.path.join(STATIC_DIR, 'img')
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, 'manifest.json')
+
+# Source images, relative to static/
+SOURCES = ['*.png', '*.jpg', '*.jpeg']
+
+# Target widths; each image gets the ones below its own width, plus its own
+# width (capped at the largest target)
+WIDTHS = [320, 640, 960, 1280]
+
+# Encoder settings per output format
+FORMATS = {
+    'avif': {'quality': 55},
+    'webp': {'quality': 78, 'method': 6},
+}
+
+
+def file_hash(path):
+    """Short content hash of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:10]
+
+
+def slugify(name):
+    """'piana 26.png' -> 'piana-26'"""
+    stem = os.path.splitext(os.path.basename(name))[0]
+    return re.sub(r'[^a-z0-9]+', '-', stem.lower()).strip('-')
+
+
+def target_widths(width):
+    widths = [w for w in WIDTHS if w < width]
+    widths.append(min(width, WIDTHS[-1]))
+    return sorted(set(widths))
+
+
+def build_image(rel_path, source_hash, formats):
+    """Write every variant of one source image. Returns its manifest entry"""
+    image = Image.open(os.path.join(STATIC_DIR, rel_path))
+    image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    entry = {
+        'hash': source_hash,
+        'width': image.width,
+        'height': image.height,
+        'variants': {fmt: [] for fmt in formats}
+    }
+    slug = slugify(rel_path)
+
+    for width in target_widths(image.width):
+        height = round(image.height * width / image.width)
+        resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            name = f"{slug}-{width}w.{source_hash}.{fmt}"
+            resized.save(os.path.join(OUTPUT_DIR, name), fmt.upper(), **FORMATS[fmt])
+            entry['variants'][fmt].append([width, f"img/{name}"])
+
+    return entry
+
+
+def variants_exist(entry):
+    return all(os.path.exists(os.path.join(STATIC_DIR, path))
+               for variants in entry['variants'].values() for _, path in variants)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate responsive image variants')
+    parser.add_argument('--force', action='store_true', help='Rebuild every image')
+    args = parser.parse_args()
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    formats = [fmt for fmt in FORMATS if features.check(fmt)]
+    if 'avif' not in formats:
+        print("WARNING: this Pillow build has no AVIF support - generating WebP only")
+
+    try:
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+
+    sources = sorted({os.path.relpath(p, STATIC_DIR).replace(os.sep, '/')
+                      for pattern in SOURCES for p in glob.glob(os.path.join(STATIC_DIR, pattern))})
+
+    new_manifest = {}
+    for rel_path in sources:
+        source_hash = file_hash(os.path.join(STATIC_DIR, rel_path))
+        entry = manifest.get(rel_path)
+        if not args.force and entry and entry['hash'] == source_hash \
+                and set(entry['variants']) == set(formats) and variants_exist(entry):
+            new_manifest[rel_path] = entry
+            print(f"Unchanged {rel_path}")
+            continue
+        new_manifest[rel_path] = build_image(rel_path, source_hash, formats)
+        print(f"Built {rel_path} ({len(new_manifest[rel_path]['variants'][formats[0]])} widths x {len(formats)} formats)")
+
+    # Remove variants no longer referenced (old hashes, deleted sources)
+    keep = {os.path.basename(path) for entry in new_manifest.values()
+            for variants in entry['variants'].values() for _, path in variants}
+    for name in os.listdir(OUTPUT_DIR):
+        if name != 'manifest.json' and name not in keep:
+            os.remove(os.path.join(OUTPUT_DIR, name))
+            print(f"Removed stale {name}")
+
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(new_manifest, f, indent=2, sort_keys=True)
+
+    original = sum(os.path.getsize(os.path.join(STATIC_DIR, p)) for p in new_manifest)
+    largest = sum(os.path.getsize(os.path.join(STATIC_DIR, e['variants'][formats[0]][-1][1]))
+                  for e in new_manifest.values())
+    print(f"\nOriginals: {original / 1024:.0f} KiB, largest {formats[0]} variants: {largest / 1024:.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+-- updated_at columns used as sync high-water marks by the local SQLite mirror
+-- (services/local_mirror.py). Run in the Supabase SQL editor.
+
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$;
+
+ALTER TABLE events ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+CREATE INDEX IF NOT EXISTS events_updated_at_idx ON events (updated_at);
+-- (updated_at, id) keyset cursor of /api/sync/events: the backfill above gives
+-- every existing row the same updated_at
+CREATE INDEX IF NOT EXISTS events_updated_at_id_idx ON events (updated_at, id);
+DROP TRIGGER IF EXISTS events_set_updated_at ON events;
+CREATE TRIGGER events_set_updated_at
+    BEFORE UPDATE ON events
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+ALTER TABLE event_summaries ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+CREATE INDEX IF NOT EXISTS event_summaries_updated_at_idx ON event_summaries (updated_at);
+CREATE INDEX IF NOT EXISTS event_summaries_updated_at_event_id_idx ON event_summaries (updated_at, event_id);
+DROP TRIGGER IF EXISTS event_summaries_set_updated_at ON event_summaries;
+CREATE TRIGGER event_summaries_set_updated_at
+    BEFORE UPDATE ON event_summaries
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+CREATE INDEX IF NOT EXISTS intelligence_reports_created_at_idx ON intelligence_reports (created_at);
@@ -2,16 +2,35 @@ import os
 import json
 import ast
 import string
-from flask import Flask, render_template, request, redirect, url_for, jsonify, session, make_response
+from flask import Flask, render_template, request, redirect, url_for, jsonify, session, make_response, g, has_request_context, template_rendered
 from datetime import date, datetime
 import csv
 import io
-from supabase import create_client, Client
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
 from services.perplexity_service import generate_event_summary
+from services.write_behind import WriteBehindBuffer
+from services.single_flight import single_flight
+from services.ttl_cache import ttl_cached
+from services.circuit_breaker import BreakerRegistry
+from services.stale_cache import stale_if_error
+from services.sampling_profiler import SamplingProfiler
+from services.event_records import to_event_records
+from services.fragment_cache import FragmentCache
+from services.compression import Compressor
+from services.responsive_images import ResponsiveImages
+from services.static_assets import StaticAssets
+from services.resource_hints import AssetGraph
+from services.local_mirror import LocalMirror
+from services.datastore import create_store
+from markupsafe import Markup
 from werkzeug.security import generate_password_hash, check_password_hash
 
 import requests as http_requests  # Rename to avoid confusion with flask.request
 import secrets
+import hashlib
+import functools
+import tempfile
+import threading
 from urllib.parse import urlparse
 
 
@@ -71,6 +90,19 @@ app.config['SESSION_COOKIE_SECURE'] = True       # Required when SameSite=None
 app.config['SESSION_COOKIE_HTTPONLY'] = True     # Security best practice
 
 
+# {{ responsive_image(...) }}: AVIF/WebP srcsets built by generate_responsive_images.py.
+# No template shows these images yet, so no variants are committed; run the
+# script when one does. Until then the helper renders a plain <img>.
+responsive_images = ResponsiveImages(os.path.join(app.static_folder, 'img', 'manifest.json'))
+app.jinja_env.globals['responsive_image'] = responsive_images.render
+
+# {{ asset_url('css/app.css') }}: content-hashed bundles built by build_assets.py
+static_assets = StaticAssets(app.static_folder)
+app.jinja_env.globals['asset_url'] = static_assets.url
+app.jinja_env.globals['inline_asset'] = static_assets.inline
+app.jinja_env.globals['asset_built'] = static_assets.built
+
+
 @app.context_processor
 def inject_user():
     """Make user info available in all templates."""
@@ -99,6 +131,9 @@ def inject_user():
         'user_type': user_type,
         'is_admin': is_admin,
         'maintenance_active': maintenance_active,
+        # Age of the oldest last-known-good data served on this page (see stale_if_error)
+        'stale_minutes': int((time.time() - min(g.stale_reads.values())) // 60)
+                         if g.get('stale_reads') else None,
         'auth_enabled': all([
             os.environ.get('AZURE_CLIENT_ID'),
             os.environ.get('AZURE_CLIENT_SECRET'),
@@ -118,6 +153,16 @@ AZURE_SCOPE = "openid profile email User.Read"
 AZURE_AUTH_ENDPOINT = f"https://login.microsoftonline.com/{AZURE_TENANT_ID}/oauth2/v2.0/authorize" if AZURE_TENANT_ID else None
 AZURE_TOKEN_ENDPOINT = f"https://login.microsoftonline.com/{AZURE_TENANT_ID}/oauth2/v2.0/token" if AZURE_TENANT_ID else None
 AZURE_LOGOUT_ENDPOINT = f"https://login.microsoftonline.com/{AZURE_TENANT_ID}/oauth2/v2.0/logout" if AZURE_TENANT_ID else None
+AZURE_JWKS_ENDPOINT = f"https://login.microsoftonline.com/{AZURE_TENANT_ID}/discovery/v2.0/keys" if AZURE_TENANT_ID else None
+AZURE_ISSUER = f"https://login.microsoftonline.com/{AZURE_TENANT_ID}/v2.0" if AZURE_TENANT_ID else None
+
+# Signing keys are cached and refreshed after this many seconds (or when an unknown kid appears)
+AZURE_JWKS_TTL = int(os.environ.get('AZURE_JWKS_TTL', '86400'))
+
+# Pooled HTTP session for outbound auth calls, with explicit (connect, read) timeouts
+AUTH_HTTP_TIMEOUT = (3.05, 10)
+auth_http = http_requests.Session()
+auth_http.mount('https://', http_requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16))
 
 # Check if Azure AD is configured
 AZURE_AUTH_ENABLED = all([AZURE_CLIENT_ID, AZURE_CLIENT_SECRET, AZURE_TENANT_ID])
@@ -324,7 +369,7 @@ def exchange_code_for_tokens(code, redirect_uri):
     }
 
     try:
-        response = http_requests.post(AZURE_TOKEN_ENDPOINT, data=data)
+        response = auth_http.post(AZURE_TOKEN_ENDPOINT, data=data, timeout=AUTH_HTTP_TIMEOUT)
         if response.status_code == 200:
             return response.json()
         else:
@@ -335,11 +380,89 @@ def exchange_code_for_tokens(code, redirect_uri):
         return None
 
 
+_jwks_cache = {'keys': {}, 'fetched_at': 0}
+_jwks_lock = threading.Lock()
+
+
+def get_azure_signing_key(kid):
+    """
+    Returns the Azure AD signing key for a token's kid, from a cached JWKS.
+    The key set is refetched when the TTL expires or an unknown kid shows up
+    (key rollover), at most once a minute in the latter case.
+    """
+    now = time.time()
+    with _jwks_lock:
+        age = now - _jwks_cache['fetched_at']
+        key = _jwks_cache['keys'].get(kid)
+        if key and age < AZURE_JWKS_TTL:
+            return key
+        if key is None and age < 60:
+            return None
+
+        try:
+            response = auth_http.get(AZURE_JWKS_ENDPOINT, timeout=AUTH_HTTP_TIMEOUT)
+            response.raise_for_status()
+            keys = {}
+            for jwk in response.json().get('keys', []):
+                try:
+                    keys[jwk['kid']] = jwt.PyJWK(jwk, algorithm='RS256').key
+                except Exception:
+                    continue
+            _jwks_cache['keys'] = keys
+            _jwks_cache['fetched_at'] = now
+        except Exception as e:
+            print(f"[Auth] JWKS fetch error: {e}")
+            # Keep serving a stale key rather than failing logins
+            return key
+
+        return _jwks_cache['keys'].get(kid)
+
+
+def get_user_from_id_token(id_token):
+    """
+    Verify the Azure id_token locally and return user info from its claims.
+    Returns None if the token can't be verified (caller falls back to Graph).
+    """
+    if not id_token or not CRYPTO_AVAILABLE:
+        return None
+
+    try:
+        kid = jwt.get_unverified_header(id_token).get('kid')
+        key = get_azure_signing_key(kid)
+        if not key:
+            return None
+
+        claims = jwt.decode(
+            id_token,
+            key,
+            algorithms=['RS256'],
+            audience=AZURE_CLIENT_ID,
+            issuer=AZURE_ISSUER,
+            leeway=60
+        )
+    except Exception as e:
+        print(f"[Auth] id_token verification failed: {e}")
+        return None
+
+    # oid is the same object id Graph returns as /me.id
+    user_id = claims.get('oid')
+    email = claims.get('email') or claims.get('preferred_username')
+    if not user_id or not email:
+        return None
+
+    return {
+        'name': claims.get('name') or 'User',
+        'email': email,
+        'id': user_id
+    }
+
+
 def get_user_info(access_token):
     """Get user info from Microsoft Graph API."""
     try:
         headers = {'Authorization': f'Bearer {access_token}'}
-        response = http_requests.get('https://graph.microsoft.com/v1.0/me', headers=headers)
+        response = auth_http.get('https://graph.microsoft.com/v1.0/me', headers=headers,
+                                 timeout=AUTH_HTTP_TIMEOUT)
         if response.status_code == 200:
             return response.json()
         else:
@@ -360,29 +483,83 @@ def get_current_user():
     return session.get('user', None)
 
 
-url = os.environ.get("SUPABASE_URL")
-key = os.environ.get("SUPABASE_KEY")
+# Data store: Supabase by default, or a local SQLite file with DATA_BACKEND=sqlite
+# (see services/datastore). Raises if the configured backend is unusable.
+db = create_store()
+
+# Optional local SQLite mirror of events, summaries and reports (see services/local_mirror.py).
+# Only meaningful in front of Supabase; the sqlite backend is already local.
+LOCAL_MIRROR_PATH = os.environ.get('LOCAL_MIRROR_PATH')
+local_mirror = None
+if LOCAL_MIRROR_PATH and db.backend == 'supabase':
+    try:
+        local_mirror = LocalMirror(
+            db.client,
+            LOCAL_MIRROR_PATH,
+            max_staleness=float(os.environ.get('LOCAL_MIRROR_STALENESS', '60')),
+            full_sync_interval=float(os.environ.get('LOCAL_MIRROR_FULL_SYNC', '3600'))
+        )
+        local_mirror.start()
+        print(f"[Mirror] Local mirror enabled at {LOCAL_MIRROR_PATH}")
+    except Exception as e:
+        print(f"[Mirror] Local mirror disabled: {e}")
 
-if not url or not key:
-    raise ValueError(
-        f"Missing Supabase credentials! URL: {bool(url)}, KEY: {bool(key)}")
+# Shared thread pool for running independent data-store reads concurrently
+_io_pool = ThreadPoolExecutor(max_workers=int(os.environ.get('IO_POOL_SIZE', '8')),
+                              thread_name_prefix='db-io')
 
-try:
-    supabase: Client = create_client(url, key)
-except Exception as e:
-    raise ValueError(f"Failed to create Supabase client. Error: {e}")
+# Login audit timestamps (last_login, last_used_at) are written off the request path.
+# On serverless hosts set AUDIT_FLUSH_INTERVAL=0: there is no background thread, so
+# each request's updates are flushed once its response has been sent
+# (see services/write_behind.py)
+audit_writes = WriteBehindBuffer(
+    db,
+    interval=float(os.environ.get('AUDIT_FLUSH_INTERVAL', '5'))
+)
+
+
+@app.after_request
+def flush_audit_writes(response):
+    """Without a flush thread, flush buffered audit writes after the response is sent."""
+    if audit_writes.interval <= 0 and len(audit_writes):
+        response.call_on_close(audit_writes.flush)
+    return response
+
+
+# --- READ CACHE SETTINGS ---
+# Short per-process TTLs: maintenance_mode is read on every request, reports
+# and events only change when Make.com or an admin writes them.
+APP_CONFIG_CACHE_TTL = int(os.environ.get('APP_CONFIG_CACHE_TTL', '15'))
+REPORT_CACHE_TTL = int(os.environ.get('REPORT_CACHE_TTL', '60'))
+EVENT_CACHE_TTL = int(os.environ.get('EVENT_CACHE_TTL', '60'))
+
+# How long a push broadcast waits for its cache pre-warm before sending
+PREWARM_WAIT = float(os.environ.get('PREWARM_WAIT', '1'))
+
+# Rendered report and summary markup, keyed by row id (see render_cached_fragment)
+fragment_cache = FragmentCache(max_bytes=int(os.environ.get('FRAGMENT_CACHE_MB', '8')) * 1024 * 1024)
+
+VERTICALS = ['hospitality', 'automotive', 'bedding', 'textiles']
+DASHBOARD_INDUSTRIES = [v.capitalize() for v in VERTICALS]
+
+# --- READ RESILIENCE ---
+# Per-table circuit breakers for the dashboard/events reads: after a few
+# consecutive failures or timeouts (SUPABASE_TIMEOUT, see services/datastore)
+# reads fail fast and the last known good data is served with a staleness
+# marker instead of blocking workers.
+read_breakers = BreakerRegistry(
+    failure_threshold=int(os.environ.get('BREAKER_FAILURE_THRESHOLD', '3')),
+    reset_timeout=float(os.environ.get('BREAKER_RESET_TIMEOUT', '30'))
+)
 
 
 # --- APP CONFIG HELPER FUNCTIONS ---
+@ttl_cached(ttl=APP_CONFIG_CACHE_TTL)
+@single_flight
 def get_app_config(key):
     """Fetches a config value from app_config table."""
     try:
-        response = supabase.table('app_config') \
-            .select('value') \
-            .eq('key', key) \
-            .limit(1) \
-            .execute()
-        return response.data[0]['value'] if response.data else None
+        return db.config.get(key)
     except Exception as e:
         print(f"Error fetching app config {key}: {e}")
         return None
@@ -391,10 +568,8 @@ def get_app_config(key):
 def update_app_config(key, value):
     """Updates a config value in app_config table."""
     try:
-        response = supabase.table('app_config') \
-            .update({'value': value}) \
-            .eq('key', key) \
-            .execute()
+        db.config.update(key, value)
+        get_app_config.invalidate(key)
         return True
     except Exception as e:
         print(f"Error updating app config {key}: {e}")
@@ -402,10 +577,26 @@ def update_app_config(key, value):
 
 
 # --- USER PREFERENCES HELPER FUNCTIONS ---
+# Database-backed preferences are cached in the signed session cookie and kept
+# up to date by save_user_preferences (write-through). The TTL bounds staleness
+# when preferences are changed from another device.
+PREFERENCES_SESSION_TTL = int(os.environ.get('PREFERENCES_SESSION_TTL', '3600'))
+
+
+def _cache_user_preferences(user_id, prefs):
+    """Store a user's preferences in the session cache."""
+    session['cached_preferences'] = {
+        'user_id': user_id,
+        'prefs': prefs,
+        'cached_at': int(time.time())
+    }
+    session.modified = True
+
+
 def get_user_preferences(user):
     """
     Fetches user preferences.
-    - Microsoft users: from Supabase user_preferences table
+    - Microsoft users: from the session cache, else Supabase user_preferences table
     - Guest users: from session
     Returns dict with preferred_industry, notifications_enabled
     """
@@ -424,20 +615,22 @@ def get_user_preferences(user):
     if not user_id:
         return {'preferred_industry': None, 'notifications_enabled': True}
 
+    cached = session.get('cached_preferences')
+    if cached and cached.get('user_id') == user_id and \
+            time.time() - cached.get('cached_at', 0) < PREFERENCES_SESSION_TTL:
+        return cached['prefs']
+
     try:
-        response = supabase.table('user_preferences') \
-            .select('*') \
-            .eq('user_id', user_id) \
-            .limit(1) \
-            .execute()
-
-        if response.data:
-            prefs = response.data[0]
-            return {
-                'preferred_industry': prefs.get('preferred_industry'),
-                'notifications_enabled': prefs.get('notifications_enabled', True)
+        row = db.preferences.get(user_id)
+        if row:
+            prefs = {
+                'preferred_industry': row.get('preferred_industry'),
+                'notifications_enabled': row.get('notifications_enabled', True)
             }
-        return {'preferred_industry': None, 'notifications_enabled': True}
+        else:
+            prefs = {'preferred_industry': None, 'notifications_enabled': True}
+        _cache_user_preferences(user_id, prefs)
+        return prefs
     except Exception as e:
         print(f"Error fetching user preferences: {e}")
         return {'preferred_industry': None, 'notifications_enabled': True}
@@ -446,7 +639,7 @@ def get_user_preferences(user):
 def save_user_preferences(user, prefs):
     """
     Saves user preferences.
-    - Microsoft users: to Supabase user_preferences table
+    - Microsoft users: to Supabase user_preferences table (and the session cache)
     - Guest users: to session
     Returns True on success, False on failure.
     """
@@ -466,14 +659,17 @@ def save_user_preferences(user, prefs):
 
     try:
         # Upsert: insert or update if exists
-        response = supabase.table('user_preferences') \
-            .upsert({
-                'user_id': user_id,
-                'preferred_industry': prefs.get('preferred_industry'),
-                'notifications_enabled': prefs.get('notifications_enabled', True),
-                'updated_at': datetime.now().isoformat()
-            }, on_conflict='user_id') \
-            .execute()
+        db.preferences.upsert({
+            'user_id': user_id,
+            'preferred_industry': prefs.get('preferred_industry'),
+            'notifications_enabled': prefs.get('notifications_enabled', True),
+            'updated_at': datetime.now().isoformat()
+        })
+        # Write-through so the next page view needs no query
+        _cache_user_preferences(user_id, {
+            'preferred_industry': prefs.get('preferred_industry'),
+            'notifications_enabled': prefs.get('notifications_enabled', True)
+        })
         return True
     except Exception as e:
         print(f"Error saving user preferences: {e}")
@@ -496,18 +692,10 @@ def validate_invite_code(code):
         return None
 
     try:
-        response = supabase.table('invite_codes') \
-            .select('*') \
-            .eq('code', code.upper()) \
-            .is_('used_by', 'null') \
-            .limit(1) \
-            .execute()
-
-        if not response.data:
+        invite = db.partners.find_unused_invite(code.upper())
+        if not invite:
             return None
 
-        invite = response.data[0]
-
         # Check expiration if set
         if invite.get('expires_at'):
             expires = datetime.fromisoformat(invite['expires_at'].replace('Z', '+00:00'))
@@ -529,13 +717,7 @@ def create_partner_user(email, password, company_name, invite_code):
 
     # Check if email already exists
     try:
-        existing = supabase.table('partner_users') \
-            .select('id') \
-            .eq('email', email) \
-            .limit(1) \
-            .execute()
-
-        if existing.data:
+        if db.partners.find_user(email):
             return None, "An account with this email already exists"
     except Exception as e:
         print(f"Error checking existing user: {e}")
@@ -545,27 +727,18 @@ def create_partner_user(email, password, company_name, invite_code):
     try:
         password_hash = generate_password_hash(password)
 
-        response = supabase.table('partner_users') \
-            .insert({
-                'email': email,
-                'password_hash': password_hash,
-                'company_name': company_name.strip()
-            }) \
-            .execute()
+        new_user = db.partners.create_user({
+            'email': email,
+            'password_hash': password_hash,
+            'company_name': company_name.strip()
+        })
 
-        if not response.data:
+        if not new_user:
             return None, "Registration failed. Please try again."
 
-        new_user = response.data[0]
-
         # Mark invite code as used
-        supabase.table('invite_codes') \
-            .update({
-                'used_by': new_user['id'],
-                'used_at': datetime.now().isoformat()
-            }) \
-            .eq('code', invite_code.upper()) \
-            .execute()
+        db.partners.mark_invite_used(invite_code.upper(), new_user['id'],
+                                     datetime.now().isoformat())
 
         return new_user, None
 
@@ -582,27 +755,17 @@ def authenticate_partner(email, password):
     email = email.lower().strip()
 
     try:
-        response = supabase.table('partner_users') \
-            .select('*') \
-            .eq('email', email) \
-            .eq('is_active', True) \
-            .limit(1) \
-            .execute()
-
-        if not response.data:
+        user = db.partners.find_user(email, active_only=True)
+        if not user:
             return None, "Invalid email or password"
 
-        user = response.data[0]
-
         # Verify password
         if not check_password_hash(user['password_hash'], password):
             return None, "Invalid email or password"
 
-        # Update last login
-        supabase.table('partner_users') \
-            .update({'last_login': datetime.now().isoformat()}) \
-            .eq('id', user['id']) \
-            .execute()
+        # Update last login (write-behind, not on the login path)
+        audit_writes.put('partner_users', 'id', user['id'],
+                         {'last_login': datetime.now().isoformat()})
 
         return user, None
 
@@ -625,6 +788,64 @@ def get_user_type(user):
     return 'employee'
 
 
+# --- ON-DEMAND PROFILER (armed from /admin, see services/sampling_profiler.py) ---
+profiler = SamplingProfiler(
+    os.environ.get('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'pianabihub-profiles')),
+    interval=float(os.environ.get('PROFILE_INTERVAL_MS', '5')) / 1000
+)
+
+
+@app.before_request
+def start_request_profile():
+    """Sample this request's stack if an admin armed the profiler."""
+    if profiler.armed and not request.path.startswith(('/admin', '/static/')):
+        token = profiler.begin(f"{request.method} {request.path}", request.path)
+        if token:
+            g.profile_token = token
+
+
+@app.after_request
+def finish_request_profile(response):
+    token = g.pop('profile_token', None)
+    if token:
+        profiler.end(token, response.status_code)
+    return response
+
+
+# --- RESPONSE COMPRESSION ---
+# Text responses of at least COMPRESS_MIN_SIZE bytes are brotli/gzip-encoded
+# per Accept-Encoding (services/compression.py). A response with an ETag has
+# the same body every time it carries that ETag, so its compressed form is
+# cached and hot pages are not recompressed on every request.
+compressor = Compressor(min_size=int(os.environ.get('COMPRESS_MIN_SIZE', '1024')))
+compressed_responses = FragmentCache(max_bytes=int(os.environ.get('COMPRESSED_CACHE_MB', '16')) * 1024 * 1024)
+
+
+@app.after_request
+def compress_response(response):
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    data = response.get_data()
+    if not compressor.compressible(response.mimetype, len(data)):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = compressor.choose(response.mimetype, len(data), request.headers.get('Accept-Encoding'))
+    if not encoding:
+        return response
+
+    etag, _ = response.get_etag()
+    if etag:
+        body = compressed_responses.get_or_render(
+            (etag, encoding), lambda: compressor.compress(data, encoding, response.mimetype))
+    else:
+        body = compressor.compress(data, encoding, response.mimetype)
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
 # --- AUTHENTICATION & MAINTENANCE MIDDLEWARE ---
 @app.before_request
 def check_auth_and_maintenance():
@@ -678,6 +899,51 @@ def check_auth_and_maintenance():
     return None
 
 
+# --- RESOURCE HINTS ---
+# HTML responses carry a Link header preloading the CSS/JS/fonts of the
+# templates they rendered and preconnecting to third-party origins
+# (services/resource_hints.py). The templates an endpoint rendered are
+# remembered, so later requests to it get the same hints as a 103 Early
+# Hints response before the view runs, on servers that provide the
+# wsgi.early_hints callback (gunicorn). Registered after the auth check so
+# redirected requests are not hinted. EARLY_HINTS=0 disables both.
+EARLY_HINTS = os.environ.get('EARLY_HINTS', '1') != '0'
+asset_graph = AssetGraph(lambda name: app.jinja_env.loader.get_source(app.jinja_env, name)[0], static_assets)
+endpoint_templates = {}  # endpoint -> templates its last full render used
+
+
+@template_rendered.connect_via(app)
+def record_rendered_template(sender, template, context, **extra):
+    if has_request_context():
+        g.setdefault('rendered_templates', []).append(template.name)
+
+
+@app.before_request
+def send_early_hints():
+    send = request.environ.get('wsgi.early_hints')
+    templates = endpoint_templates.get(request.endpoint)
+    if not (EARLY_HINTS and send and templates and request.method == 'GET'):
+        return
+    hints = asset_graph.hints(templates)
+    if hints:
+        try:
+            send([('Link', value) for value in hints])
+        except Exception as e:
+            print(f"[Hints] Early hints failed: {e}")
+
+
+@app.after_request
+def add_resource_hints(response):
+    templates = g.pop('rendered_templates', None)
+    if not (EARLY_HINTS and templates and response.status_code == 200 and response.mimetype == 'text/html'):
+        return response
+    endpoint_templates[request.endpoint] = tuple(templates)
+    hints = asset_graph.hints(templates)
+    if hints:
+        response.headers['Link'] = ', '.join(hints)
+    return response
+
+
 # --- AUTHENTICATION ROUTES ---
 @app.route('/login')
 def login():
@@ -771,23 +1037,25 @@ def callback():
     if not tokens:
         return redirect(url_for('login', error='Failed to authenticate with Microsoft'))
 
-    # Get user info from Microsoft Graph
-    access_token = tokens.get('access_token')
-    if access_token:
+    # Read user info from the verified id_token; fall back to Microsoft Graph
+    user = get_user_from_id_token(tokens.get('id_token'))
+    if not user:
+        access_token = tokens.get('access_token')
+        if not access_token:
+            return redirect(url_for('login', error='No access token received'))
         user_info = get_user_info(access_token)
-        if user_info:
-            session['user'] = {
-                'name': user_info.get('displayName', 'User'),
-                'email': user_info.get('mail') or user_info.get('userPrincipalName', ''),
-                'id': user_info.get('id', '')
-            }
-            # Only set permanent session if user wants to stay signed in
-            remember = session.pop('remember_me', True)
-            session.permanent = remember
-        else:
+        if not user_info:
             return redirect(url_for('login', error='Failed to get user information'))
-    else:
-        return redirect(url_for('login', error='No access token received'))
+        user = {
+            'name': user_info.get('displayName', 'User'),
+            'email': user_info.get('mail') or user_info.get('userPrincipalName', ''),
+            'id': user_info.get('id', '')
+        }
+
+    session['user'] = user
+    # Only set permanent session if user wants to stay signed in
+    remember = session.pop('remember_me', True)
+    session.permanent = remember
 
     # Clear OAuth state
     session.pop('oauth_state', None)
@@ -888,79 +1156,21 @@ def partner_login():
         elif not email or '@' not in email:
             error = "Please enter a valid email"
         else:
-            # Check code in Supabase
+            # Validate code, upsert profile and stamp last_used_at in one round-trip
+            # (see partner_login_function.sql)
             try:
-                result = supabase.table('access_codes') \
-                    .select('*') \
-                    .eq('code', code) \
-                    .eq('is_active', True) \
-                    .limit(1) \
-                    .execute()
-
-                if result.data:
-                    access_code = result.data[0]
-
-                    # Only save profile if "remember me" is checked
-                    if remember:
-                        # Check if this email already has a profile for this code
-                        profile_result = supabase.table('partner_profiles') \
-                            .select('*') \
-                            .eq('access_code_id', access_code['id']) \
-                            .eq('email', email) \
-                            .limit(1) \
-                            .execute()
-
-                        if profile_result.data:
-                            # Existing user - update last login and name if changed
-                            profile = profile_result.data[0]
-                            supabase.table('partner_profiles') \
-                                .update({
-                                    'name': name,
-                                    'last_login_at': datetime.now().isoformat()
-                                }) \
-                                .eq('id', profile['id']) \
-                                .execute()
-                        else:
-                            # New user - create profile
-                            supabase.table('partner_profiles') \
-                                .insert({
-                                    'access_code_id': access_code['id'],
-                                    'name': name,
-                                    'email': email,
-                                    'last_login_at': datetime.now().isoformat()
-                                }) \
-                                .execute()
-
-                    # Re-validate code is still active (prevent race condition)
-                    recheck = supabase.table('access_codes') \
-                        .select('is_active') \
-                        .eq('id', access_code['id']) \
-                        .limit(1) \
-                        .execute()
-
-                    if not recheck.data or not recheck.data[0].get('is_active'):
-                        error = "Access code is no longer active"
-                    else:
-                        # Set session with individual's info
-                        session['user'] = {
-                            'name': name,
-                            'email': email,
-                            'company': access_code['partner_name'],
-                            'user_type': 'partner'
-                        }
-                        session.permanent = remember
-
-                        # Update access code last_used_at
-                        supabase.table('access_codes') \
-                            .update({'last_used_at': datetime.now().isoformat()}) \
-                            .eq('id', access_code['id']) \
-                            .execute()
-
-                        # Redirect to original destination or home (with validation)
-                        next_url = session.pop('next_url', None)
-                        if not next_url or not is_safe_redirect_url(next_url):
-                            next_url = '/'
-                        return redirect(next_url)
+                login = db.partners.login_with_access_code(code, name, email, remember)
+
+                if login.get('ok'):
+                    # Set session with individual's info
+                    session['user'] = login['user']
+                    session.permanent = remember
+
+                    # Redirect to original destination or home (with validation)
+                    next_url = session.pop('next_url', None)
+                    if not next_url or not is_safe_redirect_url(next_url):
+                        next_url = '/'
+                    return redirect(next_url)
                 else:
                     error = "Invalid Code"
             except Exception as e:
@@ -970,95 +1180,200 @@ def partner_login():
     return render_template('partner_login_code.html', error=error)
 
 
+def _read_store(table):
+    """The local mirror's store if it can serve `table`, else the primary store."""
+    if local_mirror and local_mirror.ready(table):
+        return local_mirror.store
+    return db
+
+
+def _note_stale_read(name, stored_at):
+    """Record that this request is rendering last-known-good data."""
+    if has_request_context():
+        g.setdefault('stale_reads', {})[name] = stored_at
+
+
+def _note_fallback_read(name):
+    """Record that this request is rendering a read's empty fallback."""
+    if has_request_context():
+        g.setdefault('fallback_reads', set()).add(name)
+
+
+def degraded_render():
+    """True when this request renders last-known-good or fallback data."""
+    return bool(g.get('stale_reads') or g.get('fallback_reads'))
+
+
 # --- HELPER FUNCTION: Fetch & Clean Data ---
+@stale_if_error('reports', fallback=None, on_stale=_note_stale_read,
+                on_fallback=_note_fallback_read)
+@ttl_cached(ttl=REPORT_CACHE_TTL)
+@single_flight
+@read_breakers.protect('intelligence_reports')
 def get_latest_report(vertical_name):
     """Fetches and cleans the latest report for a given vertical."""
-    try:
-        response = supabase.table('intelligence_reports') \
-            .select("*") \
-            .eq('vertical', vertical_name) \
-            .order('created_at', desc=True) \
-            .limit(1) \
-            .execute()
-
-        data = response.data[0] if response.data else None
-
-        if data and isinstance(data, dict):
-            # --- ROBUST JSON CLEANING ---
-            top_3 = data.get('top_3_json')
-            if isinstance(top_3, str):
-                # NEW: Strip Markdown code blocks if they exist
-                top_3 = top_3.replace('```json', '').replace('```', '').strip()
+    data = _read_store('intelligence_reports').reports.latest(vertical_name)
 
+    if data and isinstance(data, dict):
+        # --- ROBUST JSON CLEANING ---
+        top_3 = data.get('top_3_json')
+        if isinstance(top_3, str):
+            # NEW: Strip Markdown code blocks if they exist
+            top_3 = top_3.replace('```json', '').replace('```', '').strip()
+
+            try:
+                # Attempt 1: Standard JSON
+                data['top_3_json'] = json.loads(top_3)
+            except json.JSONDecodeError:
                 try:
-                    # Attempt 1: Standard JSON
-                    data['top_3_json'] = json.loads(top_3)
-                except json.JSONDecodeError:
-                    try:
-                        # Attempt 2: Python Literal
-                        data['top_3_json'] = ast.literal_eval(top_3)
-                        print(f"✅ Parsed {vertical_name} using AST")
-                    except Exception as e:
-                        print(
-                            f"❌ Failed to parse JSON for {vertical_name}: {e}")
-                        data['top_3_json'] = []
-
-            # Clean HTML
-            report_html = data.get('report_html')
-            if isinstance(report_html, str):
-                data['report_html'] = report_html.replace('\\n',
-                                                          '\n').strip('"')
-
-        return data
-    except Exception as e:
-        print(f"Error fetching {vertical_name}: {e}")
-        return None
+                    # Attempt 2: Python Literal
+                    data['top_3_json'] = ast.literal_eval(top_3)
+                    print(f"✅ Parsed {vertical_name} using AST")
+                except Exception as e:
+                    print(
+                        f"❌ Failed to parse JSON for {vertical_name}: {e}")
+                    data['top_3_json'] = []
+
+        # Clean HTML
+        report_html = data.get('report_html')
+        if isinstance(report_html, str):
+            data['report_html'] = report_html.replace('\\n',
+                                                      '\n').strip('"')
+
+    return data
 
 
 # --- EVENTS HELPER FUNCTIONS ---
+@stale_if_error('events', fallback=tuple, on_stale=_note_stale_read,
+                on_fallback=_note_fallback_read)
+@read_breakers.protect('events')
 def get_all_events(filter_type='upcoming', industry=None):
-    """Fetches events with optional filtering."""
-    try:
-        from datetime import timedelta
+    """
+    Fetches events with optional filtering, as a tuple of EventRecords. Rows
+    are converted here so the raw dicts are dropped straight away and the
+    last-known-good copy holds only the compact records.
+    """
+    from datetime import timedelta
 
-        query = supabase.table('events').select("*")
+    if industry == 'all':
+        industry = None
 
-        if industry and industry != 'all':
-            query = query.eq('industry', industry)
+    today = date.today()
+    start_gte = start_lte = start_lt = None
+
+    if filter_type == '3months':
+        # Next 3 months rolling window
+        start_gte = today.isoformat()
+        start_lte = (today + timedelta(days=90)).isoformat()
+    elif filter_type == 'upcoming':
+        start_gte = today.isoformat()
+    elif filter_type == 'past':
+        start_lt = today.isoformat()
+    # 'all' = no date filter
+
+    # Past events: newest first. Upcoming events: soonest first.
+    order_desc = (filter_type == 'past')
+
+    rows = _read_store('events').events.list(industry, start_gte, start_lte, start_lt,
+                                             desc=order_desc)
+    return tuple(to_event_records(rows, today))
+
+
+@stale_if_error('event', fallback=None, on_stale=_note_stale_read,
+                on_fallback=_note_fallback_read)
+@ttl_cached(ttl=EVENT_CACHE_TTL)
+@single_flight
+@read_breakers.protect('events')
+def get_event_by_id(event_id):
+    """Fetches a single event by ID."""
+    return _read_store('events').events.get(event_id)
 
-        today = date.today()
 
-        if filter_type == '3months':
-            # Next 3 months rolling window
-            three_months_out = (today + timedelta(days=90)).isoformat()
-            query = query.gte('start_date', today.isoformat()).lte('start_date', three_months_out)
-        elif filter_type == 'upcoming':
-            query = query.gte('start_date', today.isoformat())
-        elif filter_type == 'past':
-            query = query.lt('start_date', today.isoformat())
-        # 'all' = no date filter
+@stale_if_error('event_summary', fallback=None, on_stale=_note_stale_read,
+                on_fallback=_note_fallback_read)
+@ttl_cached(ttl=EVENT_CACHE_TTL)
+@single_flight
+@read_breakers.protect('event_summaries')
+def get_event_summary(event_id):
+    """Fetches the completed AI summary for an event, if any."""
+    return _read_store('event_summaries').summaries.completed(event_id)
 
-        # Past events: newest first. Upcoming events: soonest first.
-        order_desc = (filter_type == 'past')
-        response = query.order('start_date', desc=order_desc).execute()
-        return response.data
-    except Exception as e:
-        print(f"Error fetching events: {e}")
-        return []
 
+def get_archive_reports(vertical='all', timeframe='3months'):
+    """Fetches up to 8 recent reports for the archive, newest first."""
+    from datetime import timedelta
 
-def get_event_by_id(event_id):
-    """Fetches a single event by ID."""
-    try:
-        response = supabase.table('events') \
-            .select("*") \
-            .eq('id', event_id) \
-            .limit(1) \
-            .execute()
-        return response.data[0] if response.data else None
-    except Exception as e:
-        print(f"Error fetching event {event_id}: {e}")
+    vertical = vertical.lower() if vertical and vertical != 'all' else None
+
+    # Filter by timeframe (no 'all' option - only 1 month or 3 months)
+    today = date.today()
+    cutoff = None
+    if timeframe == '1month':
+        cutoff = (today - timedelta(days=30)).isoformat()
+    elif timeframe == '3months':
+        cutoff = (today - timedelta(days=90)).isoformat()
+
+    # Newest first, max 8
+    return _read_store('intelligence_reports').reports.recent(vertical, cutoff, limit=8)
+
+
+@functools.lru_cache(maxsize=None)
+def template_version(name):
+    """Short hash of a template's source, so cached renders change with the markup."""
+    source = app.jinja_env.loader.get_source(app.jinja_env, name)[0]
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()[:8]
+
+
+def render_cached_fragment(template, content_id, **context):
+    """
+    Render a partial whose output depends only on an immutable row (a report,
+    a completed summary), reusing the cached markup for the same row and
+    template version. Returns Markup for inclusion with {{ ... }}.
+    """
+    key = (template, content_id, template_version(template))
+    return Markup(fragment_cache.get_or_render(key, lambda: render_template(template, **context)))
+
+
+def page_etag(template, *content, partials=()):
+    """
+    Weak ETag for a page built from `content` (row ids, timestamps, filter
+    params) plus everything else the rendered HTML depends on: the template
+    sources (including the `partials` it renders), asset URLs, and the
+    per-user chrome from base.html. None when part of the page is
+    last-known-good or fallback data, which must not be revalidated: a
+    later healthy render could otherwise match it.
+    """
+    if degraded_render():
         return None
+    user = session.get('user') or {}
+    is_admin = bool(session.get('admin_authenticated'))
+    maintenance = is_admin and bool((get_app_config('maintenance_mode') or {}).get('enabled'))
+    parts = [template, template_version(template), template_version('base.html'),
+             template_version('partials/fonts.html'), template_version('partials/stale_banner.html'), *(template_version(p) for p in partials),
+             *(static_assets.url(name) for name in ('css/app.css', 'css/critical.css', 'css/fonts.css', 'js/app.js')),
+             user.get('email'), user.get('name'), user.get('user_type'), user.get('is_guest'),
+             is_admin, maintenance, *content]
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:20]
+
+
+def conditional_response(etag, render):
+    """
+    Answer If-None-Match before rendering: a body-less 304 when the client's
+    copy is current, otherwise `render()` with the ETag attached. Degraded
+    renders (stale or fallback reads) get no ETag and are not stored, so a
+    later healthy render never revalidates against them.
+    """
+    if etag and not degraded_render() and request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(render())
+    if degraded_render():
+        response.headers['Cache-Control'] = 'no-store'
+    elif etag:
+        response.set_etag(etag, weak=True)
+        # Stored, but revalidated on every use
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 # --- ROUTES ---
@@ -1120,67 +1435,78 @@ def settings():
 def dashboard():
     """
     The Main Dashboard.
-    Fetches reports for ALL 4 verticals.
+    Renders only the default vertical; the other tabs load their fragment
+    from /dashboard/vertical/<industry> when opened or once the page is idle.
     """
-    # Fetch all 4 verticals
-    hospitality = get_latest_report('hospitality')
-    automotive = get_latest_report('automotive')
-    bedding = get_latest_report('bedding')
-    textiles = get_latest_report('textiles')
-
     # Get user's preferred industry for default tab
     # Query parameter ?industry=X overrides user preference (for notification deep links)
     user = get_current_user()
     prefs = get_user_preferences(user)
     query_industry = request.args.get('industry')
-    if query_industry and query_industry in ['Hospitality', 'Automotive', 'Bedding', 'Textiles']:
+    if query_industry and query_industry in DASHBOARD_INDUSTRIES:
         default_industry = query_industry
     else:
         default_industry = prefs.get('preferred_industry') or 'Hospitality'
+    if default_industry not in DASHBOARD_INDUSTRIES:
+        default_industry = 'Hospitality'
+
+    report = get_latest_report(default_industry.lower())
+    etag = page_etag('index.html', default_industry, report.get('id') if report else None,
+                     partials=('partials/dashboard_vertical.html',))
+    return conditional_response(etag, lambda: render_template(
+        'index.html',
+        industries=DASHBOARD_INDUSTRIES,
+        vertical_html=render_vertical(default_industry.lower(), report),
+        default_industry=default_industry))
 
-    # Render with all datasets
-    return render_template('index.html',
-                           hospitality_data=hospitality,
-                           automotive_data=automotive,
-                           bedding_data=bedding,
-                           textiles_data=textiles,
-                           default_industry=default_industry)
+
+def render_vertical(vertical, report):
+    """Cached markup of one dashboard tab (partials/dashboard_vertical.html)."""
+    return render_cached_fragment('partials/dashboard_vertical.html',
+                                  report['id'] if report else f'none-{vertical}',
+                                  industry=vertical.capitalize(),
+                                  report=report)
+
+
+@app.route('/dashboard/vertical/<vertical>')
+def dashboard_vertical(vertical):
+    """
+    HTML fragment for one dashboard tab, revalidated with an ETag. A
+    last-known-good report is prefixed with the stale-data banner; it and the
+    empty fallback of a failed read get no ETag and are not stored.
+    """
+    if vertical not in VERTICALS:
+        return "Unknown vertical", 404
+
+    report = get_latest_report(vertical)
+    # Reports are immutable once written: the latest row's id identifies the content
+    template = 'partials/dashboard_vertical.html'
+    etag = page_etag(template, vertical, report.get('id') if report else None)
+
+    def render():
+        html = render_vertical(vertical, report)
+        if g.get('stale_reads'):
+            html = Markup(render_template('partials/stale_banner.html')) + html
+        return html
+
+    return conditional_response(etag, render)
 
 
 @app.route('/archive')
 def archive():
     """Archive page with search/filter capability."""
     try:
-        from datetime import timedelta
-
         # Get filter parameters
         vertical = request.args.get('vertical', 'all')
         timeframe = request.args.get('timeframe', '3months')
 
-        # Build query
-        query = supabase.table('intelligence_reports').select("*")
-
-        # Filter by vertical
-        if vertical and vertical != 'all':
-            query = query.eq('vertical', vertical.lower())
-
-        # Filter by timeframe
-        today = date.today()
-        if timeframe == '1month':
-            cutoff = (today - timedelta(days=30)).isoformat()
-            query = query.gte('created_at', cutoff)
-        elif timeframe == '3months':
-            cutoff = (today - timedelta(days=90)).isoformat()
-            query = query.gte('created_at', cutoff)
-        # No 'all' option - only 1 month or 3 months
-
-        # Order and limit results (max 8)
-        response = query.order('created_at', desc=True).limit(8).execute()
-
-        return render_template('archive.html',
-                             reports=response.data,
-                             current_vertical=vertical,
-                             current_timeframe=timeframe)
+        reports = get_archive_reports(vertical, timeframe)
+
+        etag = page_etag('archive.html', vertical, timeframe, [r.get('id') for r in reports])
+        return conditional_response(etag, lambda: render_template('archive.html',
+                                                                  reports=reports,
+                                                                  current_vertical=vertical,
+                                                                  current_timeframe=timeframe))
     except Exception as e:
         return f"<h3>Archive Error: {e}</h3>", 500
 
@@ -1208,37 +1534,12 @@ def events():
     per_page = 8
     offset = (page - 1) * per_page
 
-    # Get all events (for count and upcoming section)
+    # Get all events (for count and upcoming section) as compact records;
+    # display flags are computed on access against the day they were fetched
     all_events = get_all_events(filter_type, industry)
-    today = date.today()
 
-    # Process events for display
-    upcoming_events = []
-    for event in all_events:
-        if not event:
-            continue
-        try:
-            start_date = datetime.strptime(event['start_date'], '%Y-%m-%d').date()
-            end_date_str = event.get('end_date') or event['start_date']
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-
-            days_until = (start_date - today).days
-            event['days_until'] = days_until
-            event['is_upcoming'] = 0 < days_until <= 14
-            event['is_past'] = end_date < today
-            event['is_this_week'] = 0 < days_until <= 7
-
-            # Collect upcoming for featured section
-            if 0 < days_until <= 14:
-                upcoming_events.append(event)
-        except Exception:
-            event['days_until'] = None
-            event['is_upcoming'] = False
-            event['is_past'] = False
-            event['is_this_week'] = False
-
-    # Sort upcoming by soonest first
-    upcoming_events.sort(key=lambda x: x.get('days_until', 999))
+    # Upcoming (next 14 days) for the featured section, soonest first
+    upcoming_events = sorted((e for e in all_events if e.is_upcoming), key=lambda e: e.start)
 
     # Paginate main events list
     total_events = len(all_events)
@@ -1264,17 +1565,7 @@ def event_detail(event_id):
         return "<h3>Event not found</h3>", 404
 
     # Fetch summary if exists
-    summary = None
-    try:
-        summary_response = supabase.table('event_summaries') \
-            .select('*') \
-            .eq('event_id', event_id) \
-            .eq('status', 'completed') \
-            .limit(1) \
-            .execute()
-        summary = summary_response.data[0] if summary_response.data else None
-    except Exception as e:
-        print(f"Error fetching summary: {e}")
+    summary = get_event_summary(event_id)
 
     # Determine if event is past
     end_date_str = event.get('end_date') or event.get('start_date')
@@ -1284,10 +1575,25 @@ def event_detail(event_id):
     except:
         is_past_event = False
 
-    return render_template('event_detail.html',
-                           event=event,
-                           summary=summary,
-                           is_past_event=is_past_event)
+    # The upcoming/past labels depend on today's date
+    etag = page_etag('event_detail.html', event.get('id'), event.get('updated_at'),
+                     summary.get('id') if summary else None,
+                     summary.get('generated_at') if summary else None, date.today().isoformat(),
+                     partials=('partials/event_summary.html',))
+
+    def render():
+        # Completed summaries are immutable; regenerating one writes a new generated_at
+        summary_html = None
+        if summary:
+            summary_html = render_cached_fragment('partials/event_summary.html',
+                                                  f"{summary.get('id')}:{summary.get('generated_at')}",
+                                                  summary=summary)
+        return render_template('event_detail.html',
+                               event=event,
+                               summary_html=summary_html,
+                               is_past_event=is_past_event)
+
+    return conditional_response(etag, render)
 
 
 @app.route('/upload-events', methods=['GET', 'POST'])
@@ -1328,19 +1634,15 @@ def upload_events():
 
                 if event_data['name'] and event_data['start_date']:
                     # Check for duplicates
-                    existing = supabase.table('events') \
-                        .select('id') \
-                        .eq('name', event_data['name']) \
-                        .eq('start_date', event_data['start_date']) \
-                        .execute()
-
-                    if existing.data:
+                    if db.events.exists(event_data['name'], event_data['start_date']):
                         skipped += 1
                         continue
 
-                    supabase.table('events').insert(event_data).execute()
+                    db.events.insert(event_data)
                     count += 1
 
+            if local_mirror and count:
+                local_mirror.mark_stale('events')
             return redirect(url_for('events') + f'?uploaded={count}&skipped={skipped}')
 
         except Exception as e:
@@ -1365,6 +1667,66 @@ def maintenance():
     return render_template('maintenance.html', message=message)
 
 
+# --- ADMIN PANEL DATA ---
+def _admin_health_check():
+    """Cheap query to confirm the data store is reachable."""
+    health = {'supabase': False, 'status': 'unknown'}
+    try:
+        db.config.ping()
+        health['supabase'] = True
+        health['status'] = 'healthy'
+    except:
+        health['status'] = 'database error'
+    return health
+
+
+def _admin_invite_codes():
+    """Recent 10 invite codes."""
+    try:
+        return db.partners.recent_invites(limit=10)
+    except Exception as e:
+        print(f"Error fetching invite codes: {e}")
+        return []
+
+
+def _admin_access_codes():
+    """Recent 20 access codes."""
+    try:
+        return db.partners.recent_access_codes(limit=20)
+    except Exception as e:
+        print(f"Error fetching access codes: {e}")
+        return []
+
+
+def _admin_partner_count(active_only=False):
+    """Count partner users server-side (no rows transferred)."""
+    try:
+        return db.partners.count_users(active_only)
+    except Exception as e:
+        print(f"Error fetching partner stats: {e}")
+        return 0
+
+
+def load_admin_data():
+    """Runs the admin panel's independent reads concurrently."""
+    tasks = {
+        'maintenance': lambda: get_app_config('maintenance_mode'),
+        'version': lambda: get_app_config('app_version'),
+        'health': _admin_health_check,
+        'invite_codes': _admin_invite_codes,
+        'access_codes': _admin_access_codes,
+        'partners_total': _admin_partner_count,
+        'partners_active': lambda: _admin_partner_count(active_only=True),
+    }
+    futures = {name: _io_pool.submit(fn) for name, fn in tasks.items()}
+    data = {name: future.result() for name, future in futures.items()}
+    data['partner_stats'] = {
+        'total': data.pop('partners_total'),
+        'active': data.pop('partners_active')
+    }
+    return data
+
+
 @app.route('/admin', methods=['GET', 'POST'])
 def admin():
     """Admin control panel for app management."""
@@ -1463,11 +1825,11 @@ def admin():
             company_name = request.form.get('company_name', '').strip()
             code = generate_invite_code()
             try:
-                supabase.table('invite_codes').insert({
+                db.partners.create_invite({
                     'code': code,
                     'company_name': company_name if company_name else None,
                     'created_by': 'admin'
-                }).execute()
+                })
                 # Store the full link for display
                 base_url = request.url_root.rstrip('/')
                 session['new_invite_link'] = f"{base_url}/register?invite={code}"
@@ -1482,10 +1844,10 @@ def admin():
             else:
                 code = generate_invite_code()  # Reuse same code generator
                 try:
-                    supabase.table('access_codes').insert({
+                    db.partners.create_access_code({
                         'code': code,
                         'partner_name': partner_name
-                    }).execute()
+                    })
                     session['new_access_code'] = code
                     message = f"Access code created for {partner_name}"
                 except Exception as e:
@@ -1495,60 +1857,32 @@ def admin():
             code_id = request.form.get('code_id')
             is_active = request.form.get('is_active') == 'true'
             try:
-                supabase.table('access_codes') \
-                    .update({'is_active': is_active}) \
-                    .eq('id', code_id) \
-                    .execute()
+                db.partners.set_access_code_active(code_id, is_active)
                 message = f"Access code {'activated' if is_active else 'deactivated'}"
             except Exception as e:
                 error = f"Failed to update access code: {e}"
 
-    # Get current config
-    maintenance_config = get_app_config('maintenance_mode') or {'enabled': False, 'message': ''}
-    version_config = get_app_config('app_version') or {'version': '1.0.0', 'min_version': '1.0.0'}
-
-    # Health check
-    health = {'supabase': False, 'status': 'unknown'}
-    try:
-        test = supabase.table('app_config').select('key').limit(1).execute()
-        health['supabase'] = True
-        health['status'] = 'healthy'
-    except:
-        health['status'] = 'database error'
-
-    # Get invite codes (recent 10, unused first)
-    invite_codes = []
-    try:
-        response = supabase.table('invite_codes') \
-            .select('*') \
-            .order('created_at', desc=True) \
-            .limit(10) \
-            .execute()
-        invite_codes = response.data or []
-    except Exception as e:
-        print(f"Error fetching invite codes: {e}")
-
-    # Get partner stats
-    partner_stats = {'total': 0, 'active': 0}
-    try:
-        response = supabase.table('partner_users').select('id, is_active').execute()
-        if response.data:
-            partner_stats['total'] = len(response.data)
-            partner_stats['active'] = sum(1 for p in response.data if p.get('is_active', True))
-    except Exception as e:
-        print(f"Error fetching partner stats: {e}")
-
-    # Get access codes
-    access_codes = []
-    try:
-        response = supabase.table('access_codes') \
-            .select('*') \
-            .order('created_at', desc=True) \
-            .limit(20) \
-            .execute()
-        access_codes = response.data or []
-    except Exception as e:
-        print(f"Error fetching access codes: {e}")
+        elif action == 'start_profiler':
+            try:
+                count = min(max(int(request.form.get('requests', '10')), 1), 100)
+            except ValueError:
+                count = 10
+            pattern = request.form.get('pattern', '').strip()
+            profiler.arm(count, pattern)
+            message = f"Profiling the next {count} request(s)" + (f" matching {pattern}" if pattern else "")
+
+        elif action == 'stop_profiler':
+            profiler.disarm()
+            message = "Profiler stopped"
+
+    # Load panel data (independent reads run concurrently)
+    data = load_admin_data()
+    maintenance_config = data['maintenance'] or {'enabled': False, 'message': ''}
+    version_config = data['version'] or {'version': '1.0.0', 'min_version': '1.0.0'}
+    health = data['health']
+    invite_codes = data['invite_codes']
+    partner_stats = data['partner_stats']
+    access_codes = data['access_codes']
 
     # Build base URL for invite links
     base_url = request.url_root.rstrip('/')
@@ -1570,10 +1904,22 @@ def admin():
                            base_url=base_url,
                            new_invite_link=new_invite_link,
                            new_access_code=new_access_code,
+                           profiler=profiler,
+                           profiles=profiler.profiles(),
                            message=message,
                            error=error)
 
 
+@app.route('/admin/profiles/<name>')
+def admin_profile(name):
+    """Download a stored collapsed-stack profile (open it in speedscope.app)."""
+    if not session.get('admin_authenticated'):
+        return redirect(url_for('admin'))
+    from flask import send_from_directory
+    return send_from_directory(profiler.output_dir, name, mimetype='text/plain',
+                               as_attachment=request.args.get('download') == '1')
+
+
 @app.route('/admin/logout')
 def admin_logout():
     """Logout from admin panel."""
@@ -1594,6 +1940,11 @@ def api_auth_status():
     })
 
 
+# How long the service worker may show a cached page instantly while it
+# revalidates (stale-while-revalidate); app_version.swr_max_age overrides it
+SWR_MAX_AGE = int(os.environ.get('SWR_MAX_AGE', str(12 * 60 * 60)))
+
+
 @app.route('/api/version')
 def api_version():
     """Returns app version info for service worker update checks."""
@@ -1601,12 +1952,14 @@ def api_version():
     if version_config:
         return jsonify({
             'version': version_config.get('version', '1.0.0'),
-            'min_version': version_config.get('min_version', '1.0.0')
+            'min_version': version_config.get('min_version', '1.0.0'),
+            'swr_max_age': int(version_config.get('swr_max_age') or SWR_MAX_AGE)
         })
     # Default if config not found
     return jsonify({
         'version': '1.0.0',
-        'min_version': '1.0.0'
+        'min_version': '1.0.0',
+        'swr_max_age': SWR_MAX_AGE
     })
 
 
@@ -1624,8 +1977,68 @@ def service_worker():
     return send_from_directory('static', 'service-worker.js', mimetype='application/javascript')
 
 
+@app.route('/static/dist/<path:filename>')
+def static_dist(filename):
+    """Serve fingerprinted assets, pre-compressed when the client accepts it"""
+    from flask import send_from_directory
+    import mimetypes
+    path, encoding = static_assets.precompressed(filename, request.headers.get('Accept-Encoding'))
+    response = send_from_directory(static_assets.dist_folder, path,
+                                   mimetype=mimetypes.guess_type(filename)[0])
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    # Names change with content, so they never need revalidating
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
 # --- API ENDPOINTS ---
 
+# Offline event sync (service worker -> IndexedDB)
+SYNC_PAGE_SIZE = 500
+SYNC_EVENT_FIELDS = ('id', 'name', 'industry', 'start_date', 'end_date', 'location',
+                     'country', 'website', 'description', 'created_at', 'updated_at')
+SYNC_SUMMARY_FIELDS = ('event_id', 'summary_text', 'generated_at', 'updated_at')
+
+
+@app.route('/api/sync/events')
+def api_sync_events():
+    """
+    Delta feed of events and completed summaries for the offline copy.
+
+    The query params are the `cursor` returned by the previous call (omit
+    them for a full sync). Each table is paged by an (updated_at, id) keyset,
+    so the cursor advances even when many rows share one updated_at (as after
+    the local_mirror_columns.sql backfill). Rows after the cursor are returned
+    oldest first, SYNC_PAGE_SIZE per table per call; has_more means call again
+    with the new cursor.
+    """
+    args = request.args
+    try:
+        events = _read_store('events').events.changed_since(
+            args.get('events_since') or None, args.get('events_since_id') or None, limit=SYNC_PAGE_SIZE)
+        summaries = _read_store('event_summaries').summaries.completed_since(
+            args.get('summaries_since') or None, args.get('summaries_since_id') or None, limit=SYNC_PAGE_SIZE)
+    except Exception as e:
+        print(f"[Sync] Delta query failed: {e}")
+        return jsonify({'error': 'Sync unavailable'}), 503
+
+    return jsonify({
+        'events': [{k: e.get(k) for k in SYNC_EVENT_FIELDS} for e in events],
+        'summaries': [{k: s.get(k) for k in SYNC_SUMMARY_FIELDS} for s in summaries],
+        'cursor': {
+            'events_since': events[-1].get('updated_at') if events else args.get('events_since'),
+            'events_since_id': events[-1].get('id') if events else args.get('events_since_id'),
+            'summaries_since': summaries[-1].get('updated_at') if summaries else args.get('summaries_since'),
+            'summaries_since_id': (summaries[-1].get('event_id') if summaries
+                                   else args.get('summaries_since_id')),
+        },
+        'has_more': len(events) == SYNC_PAGE_SIZE or len(summaries) == SYNC_PAGE_SIZE,
+        'server_time': datetime.utcnow().isoformat() + 'Z'
+    })
+
+
 @app.route('/api/generate-summary', methods=['POST'])
 def api_generate_summary():
     """
@@ -1649,10 +2062,9 @@ def api_generate_summary():
     if not event_id:
         return jsonify({'error': 'event_id required'}), 400
 
-    # Fetch event from Supabase
+    # Fetch event from the data store
     try:
-        event_response = supabase.table('events').select('*').eq('id', event_id).single().execute()
-        event = event_response.data
+        event = db.events.get(event_id)
     except Exception as e:
         return jsonify({'error': f'Event not found: {e}'}), 404
 
@@ -1671,11 +2083,14 @@ def api_generate_summary():
     if result['success']:
         # Save to event_summaries table (upsert to prevent duplicates on retry)
         try:
-            supabase.table('event_summaries').upsert({
+            db.summaries.upsert({
                 'event_id': event_id,
                 'summary_text': result['summary'],
                 'status': 'completed'
-            }, on_conflict='event_id').execute()
+            })
+            if local_mirror:
+                local_mirror.mark_stale('event_summaries')
+            get_event_summary.invalidate(event_id)
 
             return jsonify({'success': True, 'summary': result['summary']})
         except Exception as e:
@@ -1683,11 +2098,11 @@ def api_generate_summary():
     else:
         # Log failure (upsert to prevent duplicates)
         try:
-            supabase.table('event_summaries').upsert({
+            db.summaries.upsert({
                 'event_id': event_id,
                 'summary_text': '',
                 'status': 'failed'
-            }, on_conflict='event_id').execute()
+            })
         except:
             pass
 
@@ -1782,14 +2197,14 @@ def api_push_subscribe():
 
     try:
         # Upsert subscription (update if endpoint already exists)
-        supabase.table('push_subscriptions').upsert({
+        db.push_subscriptions.upsert({
             'user_id': user_id,
             'user_type': user_type,
             'endpoint': data['endpoint'],
             'p256dh': data['keys']['p256dh'],
             'auth': data['keys']['auth'],
             'preferred_industry': preferred_industry
-        }, on_conflict='endpoint').execute()
+        })
 
         return jsonify({'success': True, 'message': 'Subscription saved'})
     except Exception as e:
@@ -1810,16 +2225,60 @@ def api_push_unsubscribe():
         return jsonify({'error': 'Endpoint required'}), 400
 
     try:
-        supabase.table('push_subscriptions') \
-            .delete() \
-            .eq('endpoint', endpoint) \
-            .execute()
+        db.push_subscriptions.delete(endpoint)
         return jsonify({'success': True, 'message': 'Subscription removed'})
     except Exception as e:
         print(f"[Push] Error removing subscription: {e}")
         return jsonify({'error': 'Failed to remove subscription'}), 500
 
 
+def prewarm_broadcast_target(url, vertical=None, wait=PREWARM_WAIT):
+    """
+    Refresh the server-side caches a notification click will hit, so the
+    first wave of clicks after a broadcast finds warm data.
+
+    The refreshes run in _io_pool; the caller waits at most `wait` seconds
+    for them, so sending is never held up by a slow data store.
+    """
+    path = urlparse(url or '').path
+    tasks = [
+        ('maintenance_mode', lambda: get_app_config.refresh('maintenance_mode')),
+        ('app_version', lambda: get_app_config.refresh('app_version')),
+    ]
+
+    def warm_vertical(v):
+        # Fresh report row, then its rendered tab in the fragment cache
+        report = get_latest_report.refresh(v)
+        with app.test_request_context(f'/dashboard/vertical/{v}'):
+            render_vertical(v, report)
+
+    if vertical and vertical.lower() in VERTICALS:
+        v = vertical.lower()
+        tasks.append((f'vertical {v}', lambda: warm_vertical(v)))
+    elif path.startswith('/dashboard'):
+        # The dashboard renders the reader's preferred vertical and fetches the
+        # other tabs as fragments right after, so any of them may be hit
+        tasks += [(f'vertical {v}', lambda v=v: warm_vertical(v)) for v in VERTICALS]
+
+    if path.startswith('/events/'):
+        event_id = path[len('/events/'):].strip('/')
+        if event_id:
+            # The event page reads both the event row and its summary
+            tasks += [(f'event {event_id}', lambda: get_event_by_id.refresh(event_id)),
+                      (f'event summary {event_id}', lambda: get_event_summary.refresh(event_id))]
+
+    def run(name, task):
+        try:
+            task()
+        except Exception as e:
+            print(f"[Push] Cache pre-warm of {name} failed: {e}")
+
+    futures = [_io_pool.submit(run, name, task) for name, task in tasks]
+    done, pending = wait_futures(futures, timeout=wait)
+    print(f"[Push] Pre-warming {len(tasks)} cache entries for {path or '/'} "
+          f"({len(done)} done, {len(pending)} still running)")
+
+
 @app.route('/api/send-notifications', methods=['POST'])
 def api_send_notifications():
     """
@@ -1869,25 +2328,22 @@ def api_send_notifications():
         'badge': '/static/icons/icon-192.png'
     })
 
+    # Warm caches for the target before anyone can click the notification
+    prewarm_broadcast_target(url, vertical)
+
     # Query subscriptions - filter by industry preference
     try:
-        query = supabase.table('push_subscriptions').select('*')
+        subscriptions = db.push_subscriptions.all()
 
         # If vertical is specified, get subscriptions that:
         # 1. Match the vertical preference, OR
         # 2. Have no preference set (null)
         if vertical:
-            # Get all subscriptions and filter in Python
-            # (Supabase doesn't have great OR null support)
-            response = query.execute()
+            # Filter in Python (Supabase doesn't have great OR null support)
             subscriptions = [
-                sub for sub in response.data
+                sub for sub in subscriptions
                 if not sub.get('preferred_industry') or sub.get('preferred_industry') == vertical
             ]
-        else:
-            # No vertical filter - send to everyone
-            response = query.execute()
-            subscriptions = response.data
 
         print(f"[Push] Sending to {len(subscriptions)} subscriptions (vertical: {vertical})")
 
@@ -1919,10 +2375,7 @@ def api_send_notifications():
                 # If subscription is expired/invalid (404/410), remove it
                 if '404' in error_msg or '410' in error_msg:
                     try:
-                        supabase.table('push_subscriptions') \
-                            .delete() \
-                            .eq('endpoint', sub['endpoint']) \
-                            .execute()
+                        db.push_subscriptions.delete(sub['endpoint'])
                         print(f"[Push] Removed expired subscription")
                     except:
                         pass
@@ -0,0 +1,71 @@
+-- Partner access-code login in a single round-trip.
+-- Run in the Supabase SQL editor. Called from main.py as supabase.rpc('partner_login', ...).
+
+-- One profile per (access code, email) - required for the upsert below.
+-- Remove existing duplicates first, keeping the most recent login of each.
+DELETE FROM partner_profiles p
+USING (
+    SELECT id,
+           ROW_NUMBER() OVER (PARTITION BY access_code_id, email
+                              ORDER BY last_login_at DESC NULLS LAST, id DESC) AS rn
+    FROM partner_profiles
+) ranked
+WHERE p.id = ranked.id
+  AND ranked.rn > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS partner_profiles_access_code_email_key
+    ON partner_profiles (access_code_id, email);
+
+CREATE OR REPLACE FUNCTION partner_login(
+    p_code TEXT,
+    p_name TEXT,
+    p_email TEXT,
+    p_remember BOOLEAN DEFAULT FALSE
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_code access_codes%ROWTYPE;
+BEGIN
+    -- Lock the code row so it cannot be deactivated while this login completes
+    SELECT * INTO v_code
+    FROM access_codes
+    WHERE code = upper(trim(p_code))
+      AND is_active = TRUE
+    LIMIT 1
+    FOR SHARE;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('ok', FALSE, 'error', 'invalid_code');
+    END IF;
+
+    -- Only save a profile if "remember me" is checked
+    IF p_remember THEN
+        INSERT INTO partner_profiles (access_code_id, name, email, last_login_at)
+        VALUES (v_code.id, p_name, lower(trim(p_email)), NOW())
+        ON CONFLICT (access_code_id, email) DO UPDATE
+            SET name = EXCLUDED.name,
+                last_login_at = EXCLUDED.last_login_at;
+    END IF;
+
+    UPDATE access_codes SET last_used_at = NOW() WHERE id = v_code.id;
+
+    RETURN jsonb_build_object(
+        'ok', TRUE,
+        'user', jsonb_build_object(
+            'name', p_name,
+            'email', lower(trim(p_email)),
+            'company', v_code.partner_name,
+            'user_type', 'partner'
+        )
+    );
+END;
+$$;
+
+-- SECURITY DEFINER bypasses RLS: only the server (service role key) may call it,
+-- not clients holding the anon key via PostgREST
+REVOKE EXECUTE ON FUNCTION partner_login(TEXT, TEXT, TEXT, BOOLEAN) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION partner_login(TEXT, TEXT, TEXT, BOOLEAN) TO service_role;
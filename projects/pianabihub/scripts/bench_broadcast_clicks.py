@@ -0,0 +1,99 @@
+"""
+Benchmark notification clicks arriving right after a push broadcast.
+
+Simulates a burst of concurrent GET /dashboard requests (the default
+notification target) against a stand-in Supabase client with a fixed
+round-trip time, twice:
+  - cold: caches empty, as if the broadcast had not pre-warmed anything
+  - warm: prewarm_broadcast_target() ran before the burst, as
+          /api/send-notifications now does before fan-out
+
+Usage:
+  cd projects/pianabihub
+  python scripts/bench_broadcast_clicks.py --rtt 60 --clicks 100
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# main.py requires credentials at import time; the client is replaced below
+os.environ.setdefault('SUPABASE_URL', 'https://bench.supabase.co')
+os.environ.setdefault('SUPABASE_KEY', 'bench')
+
+import main
+from bench_utils import install_latency_client, percentile
+
+
+def reset_caches():
+    main.get_app_config.invalidate()
+    main.get_latest_report.invalidate()
+    main.get_event_by_id.invalidate()
+
+
+def click_burst(app, url, clicks):
+    """Fire `clicks` concurrent GETs at url and return per-request latencies in ms."""
+    timings = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(clicks)
+
+    def click():
+        with app.test_client() as c:
+            with c.session_transaction() as sess:
+                sess['user'] = {'name': 'Guest', 'email': 'guest@piana.com', 'is_guest': True}
+            start_gate.wait()
+            start = time.perf_counter()
+            response = c.get(url)
+            elapsed = (time.perf_counter() - start) * 1000
+            assert response.status_code == 200, response.status_code
+            with lock:
+                timings.append(elapsed)
+
+    threads = [threading.Thread(target=click) for _ in range(clicks)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return timings
+
+
+def report(label, timings, round_trips):
+    print(f"{label:<6} p50 {statistics.median(timings):7.1f} ms   "
+          f"p95 {percentile(timings, 95):7.1f} ms   "
+          f"max {max(timings):7.1f} ms   db round-trips {round_trips}")
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description='Benchmark clicks right after a push broadcast')
+    parser.add_argument('--rtt', type=float, default=60, help='Simulated round-trip time in ms')
+    parser.add_argument('--clicks', type=int, default=100, help='Concurrent clicks in the burst')
+    parser.add_argument('--url', default='/dashboard', help='Notification target URL')
+    parser.add_argument('--vertical', default='Hospitality', help='Broadcast vertical')
+    args = parser.parse_args()
+
+    client = install_latency_client(main, args.rtt / 1000)
+    app = main.app
+    app.config['SESSION_COOKIE_SECURE'] = False
+
+    print(f"Simulated RTT {args.rtt:.0f} ms, {args.clicks} concurrent clicks on {args.url}")
+
+    reset_caches()
+    client.round_trips = 0
+    cold = click_burst(app, args.url, args.clicks)
+    report('cold', cold, client.round_trips)
+
+    reset_caches()
+    main.prewarm_broadcast_target(args.url, args.vertical)
+    client.round_trips = 0
+    warm = click_burst(app, args.url, args.clicks)
+    report('warm', warm, client.round_trips)
+
+
+if __name__ == '__main__':
+    main_bench()
@@ -0,0 +1,96 @@
+"""
+Benchmark response compression on the large HTML pages.
+
+Runs the real routes against a throwaway SQLite store seeded with a report
+per vertical, an event and a long AI summary, and reports for each page the
+bytes on the wire and the in-process time to the complete response for:
+  identity  Accept-Encoding: identity (the previous behaviour)
+  cold      compressed, compressed-response cache cleared before every request
+  warm      compressed, body served from the compressed-response cache
+
+Add --link-kbps to estimate the transfer time on a slow mobile link.
+
+Usage:
+  cd projects/pianabihub
+  python scripts/bench_compression.py --runs 50
+  python scripts/bench_compression.py --link-kbps 1600   # ~ "Fast 3G"
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ['DATA_BACKEND'] = 'sqlite'
+os.environ['DATA_SQLITE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='bench-compression-'), 'bench.sqlite3')
+
+import main
+
+SUMMARY_PARAGRAPH = ('<p>The show confirmed strong demand for performance fabrics in contract '
+                     'hospitality, with several exhibitors presenting <strong>recycled</strong> '
+                     'and flame-retardant ranges aimed at European hotel groups.</p>')
+
+
+def seed():
+    tables = main.db.tables
+    top_3 = json.dumps([{'headline': f'Headline {i}', 'summary': 'Market summary sentence. ' * 8,
+                         'source_url': f'https://example.com/{i}'} for i in range(3)])
+    for vertical in main.VERTICALS:
+        tables['intelligence_reports'].insert({'vertical': vertical, 'top_3_json': top_3, 'pdf_url': None})
+    event = tables['events'].insert({'name': 'Heimtextil', 'industry': 'Textiles',
+                                     'start_date': '2025-01-14', 'end_date': '2025-01-17',
+                                     'location': 'Frankfurt', 'country': 'Germany'})
+    tables['event_summaries'].insert({'event_id': event['id'], 'status': 'completed',
+                                      'summary_text': '<h3>Highlights</h3>' + SUMMARY_PARAGRAPH * 60})
+    return event['id']
+
+
+def measure(client, url, accept_encoding, runs, clear_cache):
+    timings, size = [], 0
+    for _ in range(runs):
+        if clear_cache:
+            main.compressed_responses.invalidate()
+        start = time.perf_counter()
+        response = client.get(url, headers={'Accept-Encoding': accept_encoding})
+        size = len(response.get_data())
+        timings.append((time.perf_counter() - start) * 1000)
+    return size, statistics.median(timings)
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description='Benchmark response compression')
+    parser.add_argument('--runs', type=int, default=50, help='Requests per page and mode')
+    parser.add_argument('--link-kbps', type=float, default=0, help='Estimate transfer time at this bandwidth')
+    args = parser.parse_args()
+
+    event_id = seed()
+    client = main.app.test_client()
+    with client.session_transaction() as sess:
+        sess['user'] = {'email': 'bench@example.com', 'name': 'Bench User', 'is_guest': True}
+
+    encoding = main.compressor.encodings[0]
+    print(f"Compression: {encoding} (min size {main.compressor.min_size} B), {args.runs} runs per mode\n")
+    print(f"{'page':<26}{'identity':>18}{'cold ' + encoding:>22}{'warm ' + encoding:>22}")
+    for url in ('/dashboard', '/events', f'/events/{event_id}', '/archive'):
+        results = [measure(client, url, 'identity', args.runs, False),
+                   measure(client, url, encoding, args.runs, True),
+                   measure(client, url, encoding, args.runs, False)]
+        label = '/events/<id>' if event_id in url else url
+        cells = []
+        for size, ms in results:
+            cell = f"{size / 1024:6.1f} KiB {ms:6.2f} ms"
+            if args.link_kbps:
+                cell += f" +{size * 8 / args.link_kbps:5.0f} ms"
+            cells.append(cell)
+        print(f"{label:<26}" + ''.join(f"{c:>22}" for c in cells)
+              + f"   {results[0][0] / max(results[1][0], 1):4.1f}x smaller")
+
+
+if __name__ == '__main__':
+    main_bench()
@@ -0,0 +1,129 @@
+"""
+Benchmark the events listing pipeline: raw rows -> display-ready events.
+
+Compares the previous in-place dict processing (two strptime calls per row,
+four flags written into every dict, sort of the upcoming section) with the
+EventRecord conversion now used by /events, on a synthetic calendar. Reports
+CPU time per listing and the memory retained by the processed list.
+
+Usage:
+  cd projects/pianabihub
+  python scripts/bench_events_listing.py --events 5000 --runs 50
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.event_records import to_event_records
+
+INDUSTRIES = ['Hospitality', 'Automotive', 'Bedding', 'Textiles']
+
+
+def make_rows(n, today):
+    """Rows shaped like the Supabase events table."""
+    rng = random.Random(42)
+    rows = []
+    for i in range(n):
+        start = today + timedelta(days=rng.randint(-365, 365))
+        rows.append({
+            'id': f'00000000-0000-0000-0000-{i:012d}',
+            'name': f'Trade Fair {i}',
+            'industry': rng.choice(INDUSTRIES),
+            'start_date': start.isoformat(),
+            'end_date': (start + timedelta(days=rng.randint(0, 4))).isoformat() if i % 3 else None,
+            'location': 'Milan',
+            'country': 'Italy',
+            'website': f'https://example.com/fair-{i}',
+            'description': 'Annual trade fair for the industry. ' * 4,
+            'created_at': '2025-01-01T00:00:00+00:00',
+            'updated_at': '2025-01-01T00:00:00+00:00',
+        })
+    return rows
+
+
+def legacy_listing(all_events, today):
+    """The /events processing before EventRecord (mutates the rows)."""
+    upcoming_events = []
+    for event in all_events:
+        if not event:
+            continue
+        try:
+            start_date = datetime.strptime(event['start_date'], '%Y-%m-%d').date()
+            end_date_str = event.get('end_date') or event['start_date']
+            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+
+            days_until = (start_date - today).days
+            event['days_until'] = days_until
+            event['is_upcoming'] = 0 < days_until <= 14
+            event['is_past'] = end_date < today
+            event['is_this_week'] = 0 < days_until <= 7
+
+            if 0 < days_until <= 14:
+                upcoming_events.append(event)
+        except Exception:
+            event['days_until'] = None
+            event['is_upcoming'] = False
+            event['is_past'] = False
+            event['is_this_week'] = False
+
+    upcoming_events.sort(key=lambda x: x.get('days_until', 999))
+    return all_events, upcoming_events
+
+
+def record_listing(rows, today):
+    """The current /events processing."""
+    all_events = to_event_records(rows, today)
+    upcoming_events = sorted((e for e in all_events if e.is_upcoming), key=lambda e: e.start)
+    # The template reads the flags of every rendered event
+    for e in all_events:
+        e.is_this_week, e.is_upcoming, e.is_past, e.days_until
+    return all_events, upcoming_events
+
+
+def measure(label, pipeline, n, today, runs):
+    timings = []
+    for _ in range(runs):
+        rows = make_rows(n, today)
+        start = time.perf_counter()
+        pipeline(rows, today)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # Memory retained by the listing once the raw rows are no longer referenced
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    rows = make_rows(n, today)
+    result = pipeline(rows, today)
+    del rows
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del result
+
+    print(f"{label:<12} p50 {statistics.median(timings):7.2f} ms   "
+          f"min {min(timings):7.2f} ms   retained {retained / 1024:8.0f} KiB")
+    return statistics.median(timings), retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the events listing pipeline')
+    parser.add_argument('--events', type=int, default=5000, help='Events in the calendar')
+    parser.add_argument('--runs', type=int, default=50, help='Listings to time')
+    args = parser.parse_args()
+
+    today = date.today()
+    print(f"{args.events} events, {args.runs} runs")
+    legacy_ms, legacy_mem = measure('dict rows', legacy_listing, args.events, today, args.runs)
+    record_ms, record_mem = measure('EventRecord', record_listing, args.events, today, args.runs)
+    print(f"CPU {legacy_ms / record_ms:.1f}x faster, memory {legacy_mem / max(record_mem, 1):.1f}x smaller")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark the partner access-code login (POST /partner-login).
+
+Runs against a stand-in Supabase client that sleeps for a simulated network
+round-trip on every execute(), and reports round-trips and latency for:
+  legacy  the pre-RPC query sequence for a returning "remember me" partner
+          (code lookup, profile lookup, profile update, code recheck,
+          last_used_at update), replayed against the same client
+  rpc     the partner_login RPC (see partner_login_function.sql)
+  route   the real Flask route, which makes the RPC call
+
+Usage:
+  cd projects/pianabihub
+  python scripts/bench_partner_login.py --rtt 40 --runs 50
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# main.py requires credentials at import time; the client is replaced below
+os.environ.setdefault('SUPABASE_URL', 'https://bench.supabase.co')
+os.environ.setdefault('SUPABASE_KEY', 'bench')
+
+import main
+from bench_utils import install_latency_client, percentile
+
+
+def legacy_login(client, code, name, email, remember):
+    """The login queries main.py issued before the partner_login RPC."""
+    result = client.table('access_codes').select('*').eq('code', code).eq('is_active', True) \
+        .limit(1).execute()
+    if not result.data:
+        return None
+    access_code = result.data[0]
+
+    if remember:
+        profile_result = client.table('partner_profiles').select('*') \
+            .eq('access_code_id', access_code['id']).eq('email', email).limit(1).execute()
+        if profile_result.data:
+            client.table('partner_profiles') \
+                .update({'name': name, 'last_login_at': datetime.now().isoformat()}) \
+                .eq('id', profile_result.data[0]['id']).execute()
+        else:
+            client.table('partner_profiles').insert({
+                'access_code_id': access_code['id'],
+                'name': name,
+                'email': email,
+                'last_login_at': datetime.now().isoformat()
+            }).execute()
+
+    recheck = client.table('access_codes').select('is_active').eq('id', access_code['id']).limit(1).execute()
+    if not recheck.data or not recheck.data[0].get('is_active'):
+        return None
+
+    client.table('access_codes').update({'last_used_at': datetime.now().isoformat()}) \
+        .eq('id', access_code['id']).execute()
+    return {'name': name, 'email': email, 'company': access_code['partner_name'], 'user_type': 'partner'}
+
+
+def measure(client, runs, login):
+    """(round-trips per login, latencies in ms) of `login(i)` over `runs` calls."""
+    timings, trips = [], []
+    for i in range(runs):
+        before = client.round_trips
+        start = time.perf_counter()
+        login(i)
+        timings.append((time.perf_counter() - start) * 1000)
+        trips.append(client.round_trips - before)
+    return statistics.mean(trips), timings
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description='Benchmark partner access-code login')
+    parser.add_argument('--rtt', type=float, default=40, help='Simulated round-trip time in ms')
+    parser.add_argument('--runs', type=int, default=50, help='Number of logins per path')
+    args = parser.parse_args()
+
+    client = install_latency_client(main, args.rtt / 1000)
+    app = main.app
+    app.config['SESSION_COOKIE_SECURE'] = False
+
+    def route_login(i):
+        with app.test_client() as c:
+            response = c.post('/partner-login', data={
+                'code': 'BENCH123',
+                'name': f'User {i}',
+                'email': f'user{i}@example.com',
+                'remember': 'on'
+            })
+            assert response.status_code == 302, response.status_code
+
+    paths = [
+        ('legacy', lambda i: legacy_login(client, 'BENCH123', f'User {i}', f'user{i}@example.com', True)),
+        ('rpc', lambda i: main.db.partners.login_with_access_code('BENCH123', f'User {i}',
+                                                                  f'user{i}@example.com', True)),
+        ('route', route_login),
+    ]
+
+    print(f"Simulated RTT {args.rtt:.0f} ms, {args.runs} logins per path\n")
+    print(f"{'path':<8}{'round-trips':>12}{'p50 ms':>10}{'p95 ms':>10}")
+    results = {}
+    for label, login in paths:
+        trips, timings = measure(client, args.runs, login)
+        results[label] = statistics.median(timings)
+        print(f"{label:<8}{trips:>12.1f}{statistics.median(timings):>10.1f}{percentile(timings, 95):>10.1f}")
+    print(f"\nRPC saves {results['legacy'] - results['rpc']:.1f} ms per login at p50")
+
+
+if __name__ == '__main__':
+    main_bench()
@@ -0,0 +1,120 @@
+"""
+Shared helpers for the benchmark scripts.
+
+LatencyClient is a minimal stand-in for the Supabase client: every execute()
+counts as one round-trip and sleeps for the configured RTT, and reads return
+small canned rows so the real routes can render.
+"""
+
+import time
+from datetime import date, datetime
+
+from services.datastore import SupabaseStore
+
+
+class _Result:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+def _canned_rows(table, filters):
+    """Plausible rows for the tables the hot routes read."""
+    if table == 'app_config':
+        key = filters.get('key')
+        if key == 'maintenance_mode':
+            return [{'key': key, 'value': {'enabled': False, 'message': ''}}]
+        if key == 'app_version':
+            return [{'key': key, 'value': {'version': '1.0.0', 'min_version': '1.0.0'}}]
+        return []
+    if table == 'intelligence_reports':
+        vertical = filters.get('vertical', 'hospitality')
+        return [{
+            'id': 1,
+            'vertical': vertical,
+            'created_at': datetime.now().isoformat(),
+            'top_3_json': '[{"headline": "Headline", "summary": "Summary", "source_url": "https://example.com"}]',
+            'report_html': '<h4>Report</h4>' + '<p>Lorem ipsum dolor sit amet.</p>' * 200,
+            'pdf_url': None
+        }]
+    if table == 'access_codes':
+        return [{'id': 'code-1', 'code': filters.get('code', 'BENCH123'), 'partner_name': 'Bench Partner',
+                 'is_active': True}]
+    if table == 'partner_profiles':
+        # A returning "remember me" partner
+        return [{'id': 'profile-1', 'access_code_id': filters.get('access_code_id', 'code-1'),
+                 'email': filters.get('email', 'user@example.com'), 'name': 'Returning User'}]
+    if table == 'events':
+        return [{
+            'id': filters.get('id', 'evt-1'),
+            'name': 'Bench Expo',
+            'industry': 'Hospitality',
+            'start_date': date.today().isoformat(),
+            'end_date': None,
+            'location': 'Milan',
+            'country': 'Italy',
+            'website': None,
+            'description': None,
+            'created_at': datetime.now().isoformat(),
+            'updated_at': datetime.now().isoformat()
+        }]
+    return []
+
+
+class _Query:
+    """Chainable query that records eq() filters and one round-trip per execute()."""
+
+    def __init__(self, client, target, params=None):
+        self.client = client
+        self.target = target
+        self.params = params or {}
+        self.filters = {}
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        self.client.round_trips += 1
+        time.sleep(self.client.rtt)
+        if self.target == 'rpc:partner_login':
+            return _Result({'ok': True, 'user': {
+                'name': self.params['p_name'],
+                'email': self.params['p_email'],
+                'company': 'Bench Partner',
+                'user_type': 'partner'
+            }})
+        rows = _canned_rows(self.target, self.filters)
+        return _Result(rows, count=len(rows))
+
+
+class LatencyClient:
+    """Minimal stand-in for the Supabase client with a fixed round-trip time."""
+
+    def __init__(self, rtt):
+        self.rtt = rtt
+        self.round_trips = 0
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def rpc(self, fn, params=None):
+        return _Query(self, f'rpc:{fn}', params)
+
+
+def install_latency_client(main, rtt):
+    """Point main.py's data store (and write-behind buffer) at a LatencyClient."""
+    client = LatencyClient(rtt)
+    main.db = SupabaseStore(client)
+    main.audit_writes.store = main.db
+    return client
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
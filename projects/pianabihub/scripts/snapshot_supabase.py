@@ -0,0 +1,84 @@
+"""
+Copy Supabase tables into a local SQLite file for the sqlite data backend.
+
+The snapshot can then be used to run, load-test and profile the app offline:
+
+  DATA_BACKEND=sqlite DATA_SQLITE_PATH=data/local.sqlite3 python main.py
+
+Usage:
+  cd projects/pianabihub
+
+  # Snapshot every table the app uses
+  python scripts/snapshot_supabase.py
+
+  # Snapshot only events and reports into a custom file
+  python scripts/snapshot_supabase.py --out /tmp/hub.sqlite3 --tables events intelligence_reports
+"""
+
+import os
+import sys
+import argparse
+
+# Fix Windows encoding issues
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv('.env.local')
+
+from supabase import create_client
+from services.datastore import DEFAULT_SQLITE_PATH
+from services.datastore.sqlite_store import SQLiteStore, TABLES
+
+PAGE_SIZE = 1000
+
+# Initialize Supabase
+SUPABASE_URL = os.environ.get('SUPABASE_URL', '').strip()
+SUPABASE_KEY = os.environ.get('SUPABASE_KEY', '').strip()
+
+if not SUPABASE_URL or not SUPABASE_KEY:
+    print("ERROR: SUPABASE_URL and SUPABASE_KEY must be set in .env.local")
+    sys.exit(1)
+
+supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+def fetch_all(table: str):
+    """Fetch every row of a table in pages."""
+    rows = []
+    offset = 0
+    while True:
+        response = supabase.table(table).select('*').range(offset, offset + PAGE_SIZE - 1).execute()
+        page = response.data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        offset += PAGE_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Snapshot Supabase into a local SQLite file')
+    parser.add_argument('--out', default=DEFAULT_SQLITE_PATH, help='SQLite file to write')
+    parser.add_argument('--tables', nargs='+', default=list(TABLES), help='Tables to copy')
+    args = parser.parse_args()
+
+    store = SQLiteStore(args.out)
+    for table in args.tables:
+        try:
+            rows = fetch_all(table)
+        except Exception as e:
+            print(f"  {table}: skipped ({e})")
+            continue
+        with store.transaction() as conn:
+            conn.execute(f'DELETE FROM {table}')
+            store.tables[table].put(rows, conn)
+        print(f"  {table}: {len(rows)} rows")
+
+    print(f"Snapshot written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Per-dependency circuit breakers.
+
+After `failure_threshold` consecutive failures a breaker opens and calls fail
+immediately with CircuitOpenError for `reset_timeout` seconds, instead of
+tying up a worker on a query that is likely to time out. It then lets a
+single trial call through (half-open): success closes it, failure re-opens it.
+
+    breakers = BreakerRegistry(failure_threshold=3, reset_timeout=30)
+
+    @breakers.protect('events')
+    def fetch_events(...): ...
+"""
+
+import functools
+import threading
+import time
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker."""
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def _before_call(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN  # this caller is the trial
+                return
+            raise CircuitOpenError(f"{self.name} circuit is {self.state}")
+
+    def _on_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def _on_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    print(f"[Breaker] {self.name} circuit opened after {self.failures} failure(s)")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def call(self, fn, *args, **kwargs):
+        self._before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self._on_failure()
+            raise
+        self._on_success()
+        return result
+
+    def snapshot(self) -> dict:
+        return {'name': self.name, 'state': self.state, 'failures': self.failures}
+
+
+class BreakerRegistry:
+    """Named breakers sharing one configuration, created on first use."""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(name, self.failure_threshold, self.reset_timeout)
+            return self._breakers[name]
+
+    def protect(self, name: str):
+        """Decorator running the function through the named breaker."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                return self.get(name).call(fn, *args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [b.snapshot() for b in self._breakers.values()]
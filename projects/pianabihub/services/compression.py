@@ -0,0 +1,69 @@
+"""
+Response compression for dynamic pages.
+
+Vercel passes the Flask responses through uncompressed, and the HTML pages
+are large (inline CSS/JS in base.html, AI-generated report and summary HTML).
+Compressor picks brotli or gzip from Accept-Encoding and compresses bodies
+above `min_size`, with levels tuned per content type: dynamic HTML and JSON
+use fast levels that keep time-to-first-byte low, text assets use the
+maximum since they are compressed once and cached.
+
+brotli is optional (pip install brotli); without it responses are gzipped.
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# mimetype -> {encoding: level}; brotli quality 0-11, gzip level 1-9
+LEVELS = {
+    'text/html': {'br': 5, 'gzip': 6},
+    'application/json': {'br': 4, 'gzip': 5},
+    'text/plain': {'br': 5, 'gzip': 6},
+    'text/css': {'br': 11, 'gzip': 9},
+    'application/javascript': {'br': 11, 'gzip': 9},
+    'text/javascript': {'br': 11, 'gzip': 9},
+    'image/svg+xml': {'br': 11, 'gzip': 9},
+    'application/manifest+json': {'br': 11, 'gzip': 9},
+}
+
+
+def accepted_encodings(header):
+    """Content codings an Accept-Encoding header allows (q=0 excluded)."""
+    accepted = set()
+    for part in (header or '').lower().split(','):
+        coding, _, params = part.partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            accepted.add(coding.strip())
+    return accepted
+
+
+class Compressor:
+    """Chooses and applies a content coding for a response body."""
+
+    def __init__(self, min_size: int = 1024):
+        self.min_size = min_size
+        self.encodings = ('br', 'gzip') if brotli else ('gzip',)
+
+    def compressible(self, mimetype: str, size: int) -> bool:
+        return mimetype in LEVELS and size >= self.min_size
+
+    def choose(self, mimetype: str, size: int, accept_encoding: str):
+        """Encoding to use for a body, or None to send it as-is."""
+        if not self.compressible(mimetype, size):
+            return None
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in self.encodings:
+            if encoding in accepted:
+                return encoding
+        return None
+
+    def compress(self, data: bytes, encoding: str, mimetype: str) -> bytes:
+        level = LEVELS[mimetype][encoding]
+        if encoding == 'br':
+            mode = brotli.MODE_TEXT if mimetype.startswith('text/') else brotli.MODE_GENERIC
+            return brotli.compress(data, quality=level, mode=mode)
+        return gzip.compress(data, compresslevel=level, mtime=0)
@@ -0,0 +1,58 @@
+"""
+Data-access layer.
+
+main.py talks to repositories (config, preferences, partners, reports, events,
+summaries, push_subscriptions) instead of a database client. Two backends
+implement the same API and query semantics:
+
+  DATA_BACKEND=supabase (default)  SUPABASE_URL / SUPABASE_KEY, SUPABASE_TIMEOUT
+  DATA_BACKEND=sqlite              DATA_SQLITE_PATH (default data/local.sqlite3)
+
+The SQLite backend needs no network credentials, so the app can be run,
+load-tested and profiled offline (see scripts/snapshot_supabase.py to seed it).
+With TRAFFIC_MODE=record/replay the Supabase client is wrapped by
+services/replay.py; replay needs no credentials either.
+"""
+
+import os
+
+from services import replay
+from services.datastore.sqlite_store import SQLiteStore
+from services.datastore.supabase_store import SupabaseStore
+
+DEFAULT_SQLITE_PATH = os.path.join('data', 'local.sqlite3')
+
+# PostgREST request timeout in seconds (the client default is 120)
+SUPABASE_TIMEOUT = float(os.environ.get('SUPABASE_TIMEOUT', '5'))
+
+
+def create_store(backend=None):
+    """Build the configured store. Raises ValueError on missing configuration."""
+    backend = (backend or os.environ.get('DATA_BACKEND', 'supabase')).lower()
+
+    if backend == 'sqlite':
+        return SQLiteStore(os.environ.get('DATA_SQLITE_PATH', DEFAULT_SQLITE_PATH))
+
+    if backend != 'supabase':
+        raise ValueError(f"Unknown DATA_BACKEND: {backend}")
+
+    if replay.MODE == 'replay':
+        return SupabaseStore(replay.wrap_client(None))
+
+    from supabase import ClientOptions, create_client
+
+    url = os.environ.get("SUPABASE_URL")
+    key = os.environ.get("SUPABASE_KEY")
+    if not url or not key:
+        raise ValueError(
+            f"Missing Supabase credentials! URL: {bool(url)}, KEY: {bool(key)}")
+
+    try:
+        client = create_client(url, key,
+                               options=ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT))
+        return SupabaseStore(replay.wrap_client(client))
+    except Exception as e:
+        raise ValueError(f"Failed to create Supabase client. Error: {e}")
+
+
+__all__ = ['create_store', 'SupabaseStore', 'SQLiteStore']
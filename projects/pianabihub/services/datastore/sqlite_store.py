@@ -0,0 +1,442 @@
+"""
+Local SQLite backend for the data-access layer.
+
+Lets the app run, be load-tested and profiled without network credentials
+(DATA_BACKEND=sqlite). Every table stores the full row as JSON next to the
+handful of columns that queries filter and sort on, so repositories return
+the same dicts Supabase does and apply the same filters, ordering and limits.
+Insert defaults (id, created_at, is_active, ...) mirror the Postgres column
+defaults; events and summaries get updated_at on every write.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+
+# table -> (primary key, indexed columns)
+TABLES = {
+    'app_config': ('key', []),
+    'user_preferences': ('user_id', []),
+    'invite_codes': ('id', ['code', 'used_by', 'created_at']),
+    'partner_users': ('id', ['email', 'is_active']),
+    'partner_profiles': ('id', ['access_code_id', 'email']),
+    'access_codes': ('id', ['code', 'is_active', 'created_at']),
+    'intelligence_reports': ('id', ['vertical', 'created_at']),
+    'events': ('id', ['name', 'industry', 'start_date', 'updated_at']),
+    'event_summaries': ('event_id', ['status', 'updated_at']),
+    'push_subscriptions': ('endpoint', ['preferred_industry']),
+}
+
+# Composite indexes for the hot read paths
+COMPOSITE_INDEXES = {
+    'intelligence_reports': [('vertical', 'created_at')],
+    'events': [('industry', 'start_date'), ('updated_at', 'id')],
+    'event_summaries': [('updated_at', 'event_id')],
+    'partner_profiles': [('access_code_id', 'email')],
+}
+
+INSERT_DEFAULTS = {
+    'partner_users': {'is_active': True},
+    'access_codes': {'is_active': True},
+}
+
+# Timestamp columns filled on insert (Postgres DEFAULT NOW())
+INSERT_TIMESTAMPS = {
+    'event_summaries': ('created_at', 'generated_at'),
+}
+
+TOUCH_UPDATED_AT = {'events', 'event_summaries'}
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _after(since, since_key, key):
+    """Keyset condition for rows after the (updated_at, key) cursor; >= since without a key."""
+    if not since:
+        return []
+    if since_key is None:
+        return [('updated_at', '>=', since)]
+    return [(('updated_at', key), '>', (since, since_key))]
+
+
+class DocTable:
+    """A table of JSON rows with a primary key and a few queryable columns."""
+
+    def __init__(self, store, name, key, columns):
+        self.store = store
+        self.name = name
+        self.key = key
+        self.columns = columns
+        self._all = [key] + columns
+
+    def schema(self):
+        cols = ', '.join(f'"{c}"' for c in self.columns)
+        sql = [f'CREATE TABLE IF NOT EXISTS {self.name} ('
+               f'"{self.key}" TEXT PRIMARY KEY{", " + cols if cols else ""}, data TEXT NOT NULL)']
+        for c in self.columns:
+            sql.append(f'CREATE INDEX IF NOT EXISTS {self.name}_{c} ON {self.name} ("{c}")')
+        for combo in COMPOSITE_INDEXES.get(self.name, []):
+            sql.append(f'CREATE INDEX IF NOT EXISTS {self.name}_{"_".join(combo)} '
+                       f'ON {self.name} ({", ".join(combo)})')
+        return sql
+
+    def migrate(self, conn):
+        """Add indexed columns missing from an older file, filled from the JSON rows."""
+        existing = {r[1] for r in conn.execute(f'PRAGMA table_info({self.name})')}
+        for c in self.columns:
+            if c not in existing:
+                conn.execute(f'ALTER TABLE {self.name} ADD COLUMN "{c}"')
+                conn.execute(f'UPDATE {self.name} SET "{c}" = json_extract(data, \'$.{c}\')')
+
+    def _values(self, row):
+        key = row.get(self.key)
+        return (None if key is None else str(key),) + \
+            tuple(row.get(c) for c in self.columns) + (json.dumps(row),)
+
+    def _where(self, where):
+        clauses, params = [], []
+        for column, op, value in where:
+            if isinstance(column, tuple):
+                # Row-value comparison, e.g. (updated_at, id) > (?, ?) for keyset paging
+                names = ', '.join(f'"{c}"' for c in column)
+                clauses.append(f'({names}) {op} ({", ".join("?" for _ in column)})')
+                params.extend(str(v) if c == self.key else v for c, v in zip(column, value))
+            elif op == 'IS NULL':
+                clauses.append(f'"{column}" IS NULL')
+            elif op == 'IN':
+                clauses.append(f'"{column}" IN ({", ".join("?" for _ in value)})')
+                params.extend(str(v) if column == self.key else v for v in value)
+            else:
+                clauses.append(f'"{column}" {op} ?')
+                params.append(str(value) if column == self.key else value)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def put(self, rows, conn=None):
+        """Write complete rows (insert or replace by primary key)."""
+        conn = conn or self.store.conn()
+        placeholders = ', '.join('?' for _ in range(len(self._all) + 1))
+        columns = ', '.join(f'"{c}"' for c in self._all)
+        conn.executemany(
+            f'INSERT OR REPLACE INTO {self.name} ({columns}, data) VALUES ({placeholders})',
+            [self._values(r) for r in rows]
+        )
+
+    def select(self, where=(), order=None, desc=False, limit=None, conn=None):
+        conn = conn or self.store.conn()
+        clause, params = self._where(where)
+        sql = f'SELECT data FROM {self.name}{clause}'
+        if order:
+            direction = 'DESC' if desc else 'ASC'
+            columns = order if isinstance(order, tuple) else (order,)
+            sql += ' ORDER BY ' + ', '.join(f'"{c}" {direction}' for c in columns)
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [json.loads(r[0]) for r in conn.execute(sql, params).fetchall()]
+
+    def first(self, where=(), order=None, desc=False, conn=None):
+        rows = self.select(where, order, desc, limit=1, conn=conn)
+        return rows[0] if rows else None
+
+    def count(self, where=()):
+        clause, params = self._where(where)
+        return self.store.conn().execute(f'SELECT COUNT(*) FROM {self.name}{clause}', params).fetchone()[0]
+
+    def insert(self, row, conn=None):
+        row = {**INSERT_DEFAULTS.get(self.name, {}), **row}
+        if self.key == 'id' and row.get('id') is None:
+            row['id'] = str(uuid.uuid4())
+        for column in INSERT_TIMESTAMPS.get(self.name, ('created_at',)):
+            row.setdefault(column, _now())
+        if self.name in TOUCH_UPDATED_AT:
+            row['updated_at'] = _now()
+        with self.store.transaction(conn) as c:
+            if c.execute(f'SELECT 1 FROM {self.name} WHERE "{self.key}" = ?',
+                         (str(row[self.key]),)).fetchone():
+                raise sqlite3.IntegrityError(f'duplicate key {self.key}={row[self.key]} in {self.name}')
+            self.put([row], c)
+        return row
+
+    def upsert(self, row, conn=None):
+        """Insert, or update the given columns of the row with the same primary key."""
+        with self.store.transaction(conn) as c:
+            existing = self.first([(self.key, '=', row[self.key])], conn=c)
+            if existing is None:
+                return self.insert(row, c)
+            merged = {**existing, **row}
+            if self.name in TOUCH_UPDATED_AT:
+                merged['updated_at'] = _now()
+            self.put([merged], c)
+            return merged
+
+    def update(self, values, where, conn=None):
+        """Apply `values` to every matching row. Returns the number of rows updated."""
+        with self.store.transaction(conn) as c:
+            rows = self.select(where, conn=c)
+            for row in rows:
+                row.update(values)
+                if self.name in TOUCH_UPDATED_AT:
+                    row['updated_at'] = _now()
+            self.put(rows, c)
+            return len(rows)
+
+    def delete(self, where, conn=None):
+        clause, params = self._where(where)
+        with self.store.transaction(conn) as c:
+            c.execute(f'DELETE FROM {self.name}{clause}', params)
+
+
+class _Transaction:
+    """Context manager that joins an outer transaction or opens its own."""
+
+    def __init__(self, store, conn):
+        self.store = store
+        self.outer = conn
+
+    def __enter__(self):
+        if self.outer is not None:
+            return self.outer
+        self.conn = self.store.conn()
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.outer is not None:
+            return False
+        if exc_type is None:
+            self.conn.execute('COMMIT')
+        else:
+            self.conn.execute('ROLLBACK')
+        return False
+
+
+class SQLiteConfig:
+    def __init__(self, store):
+        self.table = store.tables['app_config']
+
+    def get(self, key):
+        row = self.table.first([('key', '=', key)])
+        return row['value'] if row else None
+
+    def update(self, key, value):
+        self.table.update({'value': value}, [('key', '=', key)])
+
+    def ping(self):
+        self.table.count()
+
+
+class SQLitePreferences:
+    def __init__(self, store):
+        self.table = store.tables['user_preferences']
+
+    def get(self, user_id):
+        return self.table.first([('user_id', '=', user_id)])
+
+    def upsert(self, row):
+        self.table.upsert(row)
+
+
+class SQLitePartners:
+    def __init__(self, store):
+        self.store = store
+        self.invites = store.tables['invite_codes']
+        self.users = store.tables['partner_users']
+        self.profiles = store.tables['partner_profiles']
+        self.codes = store.tables['access_codes']
+
+    def find_unused_invite(self, code):
+        return self.invites.first([('code', '=', code), ('used_by', 'IS NULL', None)])
+
+    def mark_invite_used(self, code, user_id, used_at):
+        self.invites.update({'used_by': user_id, 'used_at': used_at}, [('code', '=', code)])
+
+    def create_invite(self, row):
+        self.invites.insert(row)
+
+    def recent_invites(self, limit=10):
+        return self.invites.select(order='created_at', desc=True, limit=limit)
+
+    def find_user(self, email, active_only=False):
+        where = [('email', '=', email)]
+        if active_only:
+            where.append(('is_active', '=', True))
+        return self.users.first(where)
+
+    def create_user(self, row):
+        return self.users.insert(row)
+
+    def count_users(self, active_only=False):
+        return self.users.count([('is_active', '=', True)] if active_only else [])
+
+    def recent_access_codes(self, limit=20):
+        return self.codes.select(order='created_at', desc=True, limit=limit)
+
+    def create_access_code(self, row):
+        self.codes.insert(row)
+
+    def set_access_code_active(self, code_id, is_active):
+        self.codes.update({'is_active': is_active}, [('id', '=', code_id)])
+
+    def login_with_access_code(self, code, name, email, remember):
+        """Same contract as the partner_login Postgres function, in one transaction."""
+        code = code.strip().upper()
+        email = email.strip().lower()
+        with self.store.transaction() as c:
+            access_code = self.codes.first([('code', '=', code), ('is_active', '=', True)], conn=c)
+            if not access_code:
+                return {'ok': False, 'error': 'invalid_code'}
+
+            now = _now()
+            if remember:
+                profile = self.profiles.first(
+                    [('access_code_id', '=', access_code['id']), ('email', '=', email)], conn=c)
+                if profile:
+                    self.profiles.put([{**profile, 'name': name, 'last_login_at': now}], c)
+                else:
+                    self.profiles.insert({'access_code_id': access_code['id'], 'name': name,
+                                          'email': email, 'last_login_at': now}, c)
+
+            self.codes.put([{**access_code, 'last_used_at': now}], c)
+
+        return {'ok': True, 'user': {
+            'name': name,
+            'email': email,
+            'company': access_code['partner_name'],
+            'user_type': 'partner'
+        }}
+
+
+class SQLiteReports:
+    def __init__(self, store):
+        self.table = store.tables['intelligence_reports']
+
+    def latest(self, vertical):
+        return self.table.first([('vertical', '=', vertical)], order='created_at', desc=True)
+
+    def recent(self, vertical=None, since=None, limit=8):
+        where = []
+        if vertical:
+            where.append(('vertical', '=', vertical))
+        if since:
+            where.append(('created_at', '>=', since))
+        return self.table.select(where, order='created_at', desc=True, limit=limit)
+
+
+class SQLiteEvents:
+    def __init__(self, store):
+        self.table = store.tables['events']
+
+    def list(self, industry=None, start_gte=None, start_lte=None, start_lt=None, desc=False):
+        where = []
+        if industry:
+            where.append(('industry', '=', industry))
+        if start_gte:
+            where.append(('start_date', '>=', start_gte))
+        if start_lte:
+            where.append(('start_date', '<=', start_lte))
+        if start_lt:
+            where.append(('start_date', '<', start_lt))
+        return self.table.select(where, order='start_date', desc=desc)
+
+    def get(self, event_id):
+        return self.table.first([('id', '=', event_id)])
+
+    def exists(self, name, start_date):
+        return self.table.count([('name', '=', name), ('start_date', '=', start_date)]) > 0
+
+    def insert(self, row):
+        self.table.insert(row)
+
+    def changed_since(self, since=None, since_id=None, limit=500):
+        where = _after(since, since_id, 'id')
+        return self.table.select(where, order=('updated_at', 'id'), limit=limit)
+
+
+class SQLiteSummaries:
+    def __init__(self, store):
+        self.table = store.tables['event_summaries']
+
+    def completed(self, event_id):
+        return self.table.first([('event_id', '=', event_id), ('status', '=', 'completed')])
+
+    def completed_since(self, since=None, since_event_id=None, limit=500):
+        where = [('status', '=', 'completed')] + _after(since, since_event_id, 'event_id')
+        return self.table.select(where, order=('updated_at', 'event_id'), limit=limit)
+
+    def upsert(self, row):
+        self.table.upsert(row)
+
+
+class SQLitePushSubscriptions:
+    def __init__(self, store):
+        self.table = store.tables['push_subscriptions']
+
+    def upsert(self, row):
+        self.table.upsert(row)
+
+    def delete(self, endpoint):
+        self.table.delete([('endpoint', '=', endpoint)])
+
+    def all(self):
+        return self.table.select()
+
+
+class SQLiteStore:
+    """All repositories backed by one local SQLite file."""
+
+    backend = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.tables = {name: DocTable(self, name, key, columns)
+                       for name, (key, columns) in TABLES.items()}
+        conn = self.conn()
+        conn.execute('PRAGMA journal_mode=WAL')
+        for table in self.tables.values():
+            conn.execute(table.schema()[0])
+            table.migrate(conn)
+            for statement in table.schema()[1:]:
+                conn.execute(statement)
+
+        self.config = SQLiteConfig(self)
+        self.preferences = SQLitePreferences(self)
+        self.partners = SQLitePartners(self)
+        self.reports = SQLiteReports(self)
+        self.events = SQLiteEvents(self)
+        self.summaries = SQLiteSummaries(self)
+        self.push_subscriptions = SQLitePushSubscriptions(self)
+
+    def conn(self):
+        """One autocommit connection per thread; writes use explicit transactions."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def transaction(self, conn=None):
+        return _Transaction(self, conn)
+
+    def bulk_update(self, table, match_column, match_values, values):
+        self.tables[table].update(values, [(match_column, 'IN', list(match_values))])
+
+    def bulk_update_rows(self, table, match_column, rows):
+        """Apply per-row values ({match_value: values}) in one transaction."""
+        t = self.tables[table]
+        with self.transaction() as c:
+            matched = t.select([(match_column, 'IN', list(rows))], conn=c)
+            by_value = {str(v): values for v, values in rows.items()}
+            for row in matched:
+                row.update(by_value.get(str(row.get(match_column)), {}))
+                if table in TOUCH_UPDATED_AT:
+                    row['updated_at'] = _now()
+            t.put(matched, c)
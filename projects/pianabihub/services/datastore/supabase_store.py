@@ -0,0 +1,282 @@
+"""
+Supabase (PostgREST) backend for the data-access layer.
+
+Each repository wraps the queries main.py used to issue directly against the
+global client. Errors propagate to the caller, which decides how to degrade.
+"""
+
+
+def _after(query, since, since_key, key):
+    """Keyset filter for rows after the (updated_at, key) cursor; >= since without a key."""
+    if not since:
+        return query
+    if since_key is None:
+        return query.gte('updated_at', since)
+    # Quoted: timestamps contain the reserved characters : and .
+    return query.or_(f'updated_at.gt."{since}",and(updated_at.eq."{since}",{key}.gt."{since_key}")')
+
+
+class SupabaseConfig:
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key):
+        response = self.client.table('app_config') \
+            .select('value') \
+            .eq('key', key) \
+            .limit(1) \
+            .execute()
+        return response.data[0]['value'] if response.data else None
+
+    def update(self, key, value):
+        self.client.table('app_config') \
+            .update({'value': value}) \
+            .eq('key', key) \
+            .execute()
+
+    def ping(self):
+        self.client.table('app_config').select('key').limit(1).execute()
+
+
+class SupabasePreferences:
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, user_id):
+        response = self.client.table('user_preferences') \
+            .select('*') \
+            .eq('user_id', user_id) \
+            .limit(1) \
+            .execute()
+        return response.data[0] if response.data else None
+
+    def upsert(self, row):
+        self.client.table('user_preferences') \
+            .upsert(row, on_conflict='user_id') \
+            .execute()
+
+
+class SupabasePartners:
+    def __init__(self, client):
+        self.client = client
+
+    # Invite codes
+    def find_unused_invite(self, code):
+        response = self.client.table('invite_codes') \
+            .select('*') \
+            .eq('code', code) \
+            .is_('used_by', 'null') \
+            .limit(1) \
+            .execute()
+        return response.data[0] if response.data else None
+
+    def mark_invite_used(self, code, user_id, used_at):
+        self.client.table('invite_codes') \
+            .update({'used_by': user_id, 'used_at': used_at}) \
+            .eq('code', code) \
+            .execute()
+
+    def create_invite(self, row):
+        self.client.table('invite_codes').insert(row).execute()
+
+    def recent_invites(self, limit=10):
+        response = self.client.table('invite_codes') \
+            .select('*') \
+            .order('created_at', desc=True) \
+            .limit(limit) \
+            .execute()
+        return response.data or []
+
+    # Partner users (email + password)
+    def find_user(self, email, active_only=False):
+        query = self.client.table('partner_users').select('*').eq('email', email)
+        if active_only:
+            query = query.eq('is_active', True)
+        response = query.limit(1).execute()
+        return response.data[0] if response.data else None
+
+    def create_user(self, row):
+        response = self.client.table('partner_users').insert(row).execute()
+        return response.data[0] if response.data else None
+
+    def count_users(self, active_only=False):
+        # HEAD request with an exact count - no rows transferred
+        query = self.client.table('partner_users').select('id', count='exact', head=True)
+        if active_only:
+            query = query.eq('is_active', True)
+        return query.execute().count or 0
+
+    # Access codes (code + name/email login)
+    def recent_access_codes(self, limit=20):
+        response = self.client.table('access_codes') \
+            .select('*') \
+            .order('created_at', desc=True) \
+            .limit(limit) \
+            .execute()
+        return response.data or []
+
+    def create_access_code(self, row):
+        self.client.table('access_codes').insert(row).execute()
+
+    def set_access_code_active(self, code_id, is_active):
+        self.client.table('access_codes') \
+            .update({'is_active': is_active}) \
+            .eq('id', code_id) \
+            .execute()
+
+    def login_with_access_code(self, code, name, email, remember):
+        """One round-trip login (see partner_login_function.sql)."""
+        result = self.client.rpc('partner_login', {
+            'p_code': code,
+            'p_name': name,
+            'p_email': email,
+            'p_remember': remember
+        }).execute()
+        return result.data or {}
+
+
+class SupabaseReports:
+    def __init__(self, client):
+        self.client = client
+
+    def latest(self, vertical):
+        response = self.client.table('intelligence_reports') \
+            .select("*") \
+            .eq('vertical', vertical) \
+            .order('created_at', desc=True) \
+            .limit(1) \
+            .execute()
+        return response.data[0] if response.data else None
+
+    def recent(self, vertical=None, since=None, limit=8):
+        query = self.client.table('intelligence_reports').select("*")
+        if vertical:
+            query = query.eq('vertical', vertical)
+        if since:
+            query = query.gte('created_at', since)
+        response = query.order('created_at', desc=True).limit(limit).execute()
+        return response.data or []
+
+
+class SupabaseEvents:
+    def __init__(self, client):
+        self.client = client
+
+    def list(self, industry=None, start_gte=None, start_lte=None, start_lt=None, desc=False):
+        query = self.client.table('events').select("*")
+        if industry:
+            query = query.eq('industry', industry)
+        if start_gte:
+            query = query.gte('start_date', start_gte)
+        if start_lte:
+            query = query.lte('start_date', start_lte)
+        if start_lt:
+            query = query.lt('start_date', start_lt)
+        response = query.order('start_date', desc=desc).execute()
+        return response.data or []
+
+    def get(self, event_id):
+        response = self.client.table('events') \
+            .select("*") \
+            .eq('id', event_id) \
+            .limit(1) \
+            .execute()
+        return response.data[0] if response.data else None
+
+    def exists(self, name, start_date):
+        response = self.client.table('events') \
+            .select('id') \
+            .eq('name', name) \
+            .eq('start_date', start_date) \
+            .limit(1) \
+            .execute()
+        return bool(response.data)
+
+    def insert(self, row):
+        self.client.table('events').insert(row).execute()
+
+    def changed_since(self, since=None, since_id=None, limit=500):
+        query = _after(self.client.table('events').select("*"), since, since_id, 'id')
+        response = query.order('updated_at').order('id').limit(limit).execute()
+        return response.data or []
+
+
+class SupabaseSummaries:
+    def __init__(self, client):
+        self.client = client
+
+    def completed(self, event_id):
+        response = self.client.table('event_summaries') \
+            .select('*') \
+            .eq('event_id', event_id) \
+            .eq('status', 'completed') \
+            .limit(1) \
+            .execute()
+        return response.data[0] if response.data else None
+
+    def completed_since(self, since=None, since_event_id=None, limit=500):
+        query = self.client.table('event_summaries') \
+            .select('*') \
+            .eq('status', 'completed')
+        query = _after(query, since, since_event_id, 'event_id')
+        response = query.order('updated_at').order('event_id').limit(limit).execute()
+        return response.data or []
+
+    def upsert(self, row):
+        self.client.table('event_summaries').upsert(row, on_conflict='event_id').execute()
+
+
+class SupabasePushSubscriptions:
+    def __init__(self, client):
+        self.client = client
+
+    def upsert(self, row):
+        self.client.table('push_subscriptions').upsert(row, on_conflict='endpoint').execute()
+
+    def delete(self, endpoint):
+        self.client.table('push_subscriptions') \
+            .delete() \
+            .eq('endpoint', endpoint) \
+            .execute()
+
+    def all(self):
+        response = self.client.table('push_subscriptions').select('*').execute()
+        return response.data or []
+
+
+class SupabaseStore:
+    """All repositories backed by one Supabase client."""
+
+    backend = 'supabase'
+
+    def __init__(self, client):
+        self.client = client
+        self.config = SupabaseConfig(client)
+        self.preferences = SupabasePreferences(client)
+        self.partners = SupabasePartners(client)
+        self.reports = SupabaseReports(client)
+        self.events = SupabaseEvents(client)
+        self.summaries = SupabaseSummaries(client)
+        self.push_subscriptions = SupabasePushSubscriptions(client)
+
+    def bulk_update(self, table, match_column, match_values, values):
+        """UPDATE table SET values WHERE match_column IN match_values (one round-trip)."""
+        query = self.client.table(table).update(values)
+        if len(match_values) == 1:
+            query = query.eq(match_column, match_values[0])
+        else:
+            query = query.in_(match_column, list(match_values))
+        query.execute()
+
+    def bulk_update_rows(self, table, match_column, rows):
+        """Apply per-row values ({match_value: values}).
+
+        PostgREST has no multi-row UPDATE with different values per row, so rows
+        that share identical values go in one bulk_update and the rest cost one
+        request each.
+        """
+        groups = {}
+        for match_value, values in rows.items():
+            groups.setdefault(tuple(sorted(values.items())), []).append(match_value)
+        for values, match_values in groups.items():
+            self.bulk_update(table, match_column, match_values, dict(values))
@@ -0,0 +1,74 @@
+"""
+Compact event records for the events listing.
+
+Rows from the data store are converted once into EventRecord objects (dates
+parsed with date.fromisoformat, only the fields the listing renders kept,
+no per-instance __dict__) and the raw dicts are dropped; get_all_events in
+main.py converts before returning, so its last-known-good copy (see
+stale_cache.py) holds records too. The display flags
+the template uses - days_until, is_upcoming, is_this_week, is_past - are
+computed on access against the request's `today` instead of being written
+into every row up front.
+"""
+
+from datetime import date
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value[:10]) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+class EventRecord:
+    """One event as shown in the listing."""
+
+    __slots__ = ('id', 'name', 'industry', 'location', 'country', 'start', 'end',
+                 'start_date_raw', 'end_date_raw', 'today')
+
+    def __init__(self, row: dict, today: date):
+        self.id = row.get('id')
+        self.name = row.get('name')
+        self.industry = row.get('industry')
+        self.location = row.get('location')
+        self.country = row.get('country')
+        self.start = _parse_date(row.get('start_date'))
+        self.end = _parse_date(row.get('end_date'))
+        # Only kept when unparseable, so the listing still shows what was entered
+        self.start_date_raw = None if self.start else row.get('start_date')
+        self.end_date_raw = None if self.end else row.get('end_date')
+        self.today = today
+
+    # Template-facing fields (same names and formats as the raw rows)
+    @property
+    def start_date(self):
+        return self.start.isoformat() if self.start else self.start_date_raw
+
+    @property
+    def end_date(self):
+        return self.end.isoformat() if self.end else self.end_date_raw
+
+    @property
+    def days_until(self):
+        return (self.start - self.today).days if self.start else None
+
+    @property
+    def is_upcoming(self):
+        days = self.days_until
+        return days is not None and 0 < days <= 14
+
+    @property
+    def is_this_week(self):
+        days = self.days_until
+        return days is not None and 0 < days <= 7
+
+    @property
+    def is_past(self):
+        last_day = self.end or self.start
+        return last_day is not None and last_day < self.today
+
+
+def to_event_records(rows, today: date) -> list:
+    """Convert data-store rows into EventRecords, skipping empty rows."""
+    return [EventRecord(row, today) for row in rows if row]
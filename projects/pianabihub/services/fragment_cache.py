@@ -0,0 +1,82 @@
+"""
+In-process cache of rendered HTML fragments.
+
+Intelligence reports and completed event summaries never change once
+written, so their rendered markup is cached under a key that names the
+content exactly - (template, row id, template version) - and never expires;
+a new report or a regenerated summary simply produces a new key.
+
+    html = fragment_cache.get_or_render(
+        ('partials/event_summary.html', summary_id, version),
+        lambda: render_template('partials/event_summary.html', summary=summary))
+
+Entries are evicted least-recently-used once the total size of the cached
+HTML exceeds `max_bytes`. Values may also be bytes (compressed response
+bodies, see compress_response in main.py), counted at their length.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class FragmentCache:
+    """Thread-safe LRU cache of rendered strings or bytes, bounded by total size."""
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()  # key -> (html, size)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the cached html, or None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, html):
+        size = len(html) if isinstance(html, bytes) else len(html.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old:
+                self.bytes -= old[1]
+            self._data[key] = (html, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def get_or_render(self, key, render) -> str:
+        """Return the cached fragment for `key`, calling `render()` on a miss."""
+        html = self.get(key)
+        if html is None:
+            html = render()
+            self.set(key, html)
+        return html
+
+    def invalidate(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._data),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,181 @@
+"""
+Optional local SQLite read-through mirror of events, event summaries and
+intelligence reports.
+
+Enabled by setting LOCAL_MIRROR_PATH. Each table is synced incrementally from
+Supabase using a high-water mark on its watermark column (updated_at for rows
+that can change, created_at for insert-only reports); a periodic full resync
+picks up deletions. Pages are read by an (watermark, key) keyset, since many
+rows can share one watermark value (local_mirror_columns.sql backfills every
+existing row with the same updated_at). Reads are answered from SQLite as long
+as the table was synced within `max_staleness` seconds. If a sync fails, the
+last synced data keeps being served; until a table's first sync completes -
+started by start() and run in the background - readers fall back to Supabase.
+
+Storage and reads reuse the SQLite backend of the data-access layer
+(services/datastore/sqlite_store.py): `mirror.store` exposes the same
+repositories as the primary store, with the same query semantics.
+
+The watermark columns require local_mirror_columns.sql to be applied.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from services.datastore.sqlite_store import SQLiteStore
+
+PAGE_SIZE = 1000
+
+# Bump when the on-disk layout changes; older mirror files are discarded and resynced
+SCHEMA_VERSION = 2
+
+# table -> (watermark column, unique key used as the paging tie-breaker)
+TABLES = {
+    'events': ('updated_at', 'id'),
+    'event_summaries': ('updated_at', 'event_id'),
+    'intelligence_reports': ('created_at', 'id'),
+}
+
+_SYNC_STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    table_name TEXT PRIMARY KEY,
+    high_water TEXT,
+    last_sync REAL,
+    last_full_sync REAL
+)
+"""
+
+
+def _schema_version(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+    finally:
+        conn.close()
+
+
+class LocalMirror:
+    """SQLite mirror of the read-heavy Supabase tables with delta sync."""
+
+    def __init__(self, client, path: str, max_staleness: float = 60,
+                 full_sync_interval: float = 3600):
+        self.client = client
+        self.path = path
+        self.max_staleness = max_staleness
+        self.full_sync_interval = full_sync_interval
+        self._sync_locks = {table: threading.Lock() for table in TABLES}
+
+        if os.path.exists(path) and _schema_version(path) != SCHEMA_VERSION:
+            for stale in (path, path + '-wal', path + '-shm'):
+                if os.path.exists(stale):
+                    os.remove(stale)
+        self.store = SQLiteStore(path)
+        conn = self.store.conn()
+        conn.execute(_SYNC_STATE_SCHEMA)
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    # --- SYNC ---
+
+    def _state(self, table):
+        row = self.store.conn().execute(
+            'SELECT high_water, last_sync, last_full_sync FROM sync_state WHERE table_name = ?',
+            (table,)
+        ).fetchone()
+        return row or (None, 0, 0)
+
+    def _fetch(self, table, watermark, key, since):
+        """Fetch rows changed since the high-water mark, oldest first, in keyset pages."""
+        rows = []
+        last = None
+        while True:
+            query = self.client.table(table).select('*')
+            if last:
+                # Quoted: timestamps contain the reserved characters : and .
+                mark, last_key = last[watermark], last[key]
+                query = query.or_(f'{watermark}.gt."{mark}",and({watermark}.eq."{mark}",{key}.gt."{last_key}")')
+            elif since:
+                # gte, not gt: rows sharing the boundary timestamp are re-upserted, never skipped
+                query = query.gte(watermark, since)
+            response = query.order(watermark).order(key).limit(PAGE_SIZE).execute()
+            page = response.data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            last = page[-1]
+
+    def sync(self, table: str, full: bool = False) -> int:
+        """Pull changes for one table into SQLite. Returns the number of rows written."""
+        watermark, key = TABLES[table]
+        high_water, _, last_full_sync = self._state(table)
+        now = time.time()
+        full = full or not high_water or now - last_full_sync > self.full_sync_interval
+
+        rows = self._fetch(table, watermark, key, None if full else high_water)
+        for row in rows:
+            mark = row.get(watermark)
+            if mark and (not high_water or mark > high_water):
+                high_water = mark
+
+        with self.store.transaction() as conn:
+            if full:
+                conn.execute(f'DELETE FROM {table}')
+            self.store.tables[table].put(rows, conn)
+            conn.execute(
+                'INSERT OR REPLACE INTO sync_state (table_name, high_water, last_sync, last_full_sync) '
+                'VALUES (?, ?, ?, ?)',
+                (table, high_water, now, now if full else last_full_sync)
+            )
+        return len(rows)
+
+    def _sync_in_background(self, table):
+        """Sync a table on a daemon thread unless a sync of it is already running."""
+        lock = self._sync_locks[table]
+        if not lock.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                count = self.sync(table)
+                print(f"[Mirror] Synced {count} {table} rows")
+            except Exception as e:
+                print(f"[Mirror] Sync of {table} failed: {e}")
+            finally:
+                lock.release()
+
+        threading.Thread(target=run, name=f'mirror-sync-{table}', daemon=True).start()
+
+    def start(self):
+        """Begin the initial sync of every table in the background (call at startup)."""
+        for table in TABLES:
+            self._sync_in_background(table)
+
+    def ready(self, table: str) -> bool:
+        """
+        Make sure a table is fresh enough to read from, syncing if it is stale.
+        Returns False while the table has never been synced successfully; its
+        first (full) sync runs in the background rather than on a request.
+        """
+        high_water, last_sync, _ = self._state(table)
+        if last_sync and time.time() - last_sync < self.max_staleness:
+            return True
+        if not last_sync:
+            self._sync_in_background(table)
+            return False
+
+        lock = self._sync_locks[table]
+        # Another thread is already syncing: serve what we have
+        if not lock.acquire(blocking=False):
+            return True
+        try:
+            self.sync(table)
+        except Exception as e:
+            print(f"[Mirror] Sync of {table} failed: {e}")
+        finally:
+            lock.release()
+        return True
+
+    def mark_stale(self, table: str):
+        """After a local write: reads go to Supabase until a background sync has caught up."""
+        self.store.conn().execute('UPDATE sync_state SET last_sync = 0 WHERE table_name = ?', (table,))
@@ -9,6 +9,8 @@ import os
 import re
 import requests
 
+from services.replay import recordable
+
 PERPLEXITY_API_KEY = os.environ.get('PERPLEXITY_API_KEY', '').strip()
 
 
@@ -54,6 +56,9 @@ OPPORTUNITY INDICATORS (for scoring):
 - Bedding RFPs or FF&E projects mentioned"""
 
 
+@recordable('perplexity',
+            key=lambda model, messages, timeout=90: {'model': model, 'messages': messages},
+            on_miss=lambda: {'success': False, 'content': None, 'error': 'No recorded response'})
 def _call_perplexity(model: str, messages: list, timeout: int = 90) -> dict:
     """Helper to call Perplexity API."""
     if not PERPLEXITY_API_KEY:
@@ -0,0 +1,204 @@
+"""
+Record-and-replay of outbound Supabase and Perplexity traffic.
+
+    TRAFFIC_MODE=record   real calls go through and every request/response pair
+                          is written to TRAFFIC_FIXTURES_DIR (default data/fixtures)
+    TRAFFIC_MODE=replay   calls are answered from the fixtures, no network or
+                          credentials needed, with injected latency
+
+Replay latency is configured per service, optionally per table/RPC/model:
+
+    REPLAY_LATENCY="supabase=lognormal:40:0.6;supabase.events=fixed:250;perplexity=recorded"
+
+Distributions (all in ms): recorded[:scale] (the duration measured while
+recording, default), fixed:ms, uniform:lo:hi, normal:mean:sd,
+lognormal:median:sigma, none. REPLAY_SEED makes the sampled latencies
+reproducible, so two runs of the same scenario can be compared directly.
+
+Fixtures are keyed on the full call (table, filter chain, RPC params, or model
+plus messages). In replay, an unrecorded Supabase read raises ReplayMiss,
+which the callers' normal error handling turns into an empty result; an
+unrecorded write succeeds without doing anything, and an unrecorded
+Perplexity call returns an API error.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+MODE = os.environ.get('TRAFFIC_MODE', '').strip().lower() or None
+FIXTURES_DIR = os.environ.get('TRAFFIC_FIXTURES_DIR', os.path.join('data', 'fixtures'))
+
+WRITE_METHODS = {'insert', 'update', 'upsert', 'delete'}
+
+
+class ReplayMiss(LookupError):
+    """No recorded response for a call made in replay mode."""
+
+
+# --- LATENCY ---
+
+def _parse_latency(spec):
+    rules = {}
+    for part in filter(None, (p.strip() for p in (spec or '').split(';'))):
+        target, _, dist = part.partition('=')
+        name, *params = dist.strip().split(':')
+        rules[target.strip()] = (name, [float(p) for p in params])
+    return rules
+
+
+class LatencyModel:
+    """Samples an injected delay (seconds) for a replayed call."""
+
+    def __init__(self, spec, seed=None):
+        self.rules = _parse_latency(spec)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self, service, target, recorded_ms):
+        name, params = self.rules.get(f'{service}.{target}') or \
+            self.rules.get(service) or ('recorded', [])
+        with self._lock:
+            r = self._random
+            if name == 'none':
+                ms = 0
+            elif name == 'fixed':
+                ms = params[0]
+            elif name == 'uniform':
+                ms = r.uniform(params[0], params[1])
+            elif name == 'normal':
+                ms = r.gauss(params[0], params[1])
+            elif name == 'lognormal':
+                ms = r.lognormvariate(0, params[1]) * params[0]
+            else:  # recorded[:scale]
+                ms = (recorded_ms or 0) * (params[0] if params else 1)
+        return max(ms, 0) / 1000
+
+
+latency = LatencyModel(os.environ.get('REPLAY_LATENCY'),
+                       seed=os.environ.get('REPLAY_SEED'))
+
+
+# --- FIXTURES ---
+
+def _fixture_path(service, request):
+    digest = hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()
+    return os.path.join(FIXTURES_DIR, service, f'{digest[:32]}.json')
+
+
+def _save(service, request, response, duration_ms):
+    path = _fixture_path(service, request)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{threading.get_ident()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'request': request, 'response': response,
+                   'duration_ms': round(duration_ms, 1)}, f, default=str, indent=1)
+    os.replace(tmp, path)
+
+
+def _load(service, request):
+    try:
+        with open(_fixture_path(service, request), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+# --- SUPABASE ---
+
+class _Response:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class _TrafficQuery:
+    """Records the builder chain of a PostgREST query; records or replays execute()."""
+
+    def __init__(self, client, target, chain):
+        self._client = client
+        self._target = target
+        self._chain = chain
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            return _TrafficQuery(self._client, self._target,
+                                 self._chain + [[name, list(args), kwargs]])
+        return call
+
+    def execute(self):
+        request = {'target': self._target, 'chain': self._chain}
+        if MODE == 'record':
+            start = time.perf_counter()
+            query = self._client.real
+            for name, args, kwargs in self._chain:
+                query = getattr(query, name)(*args, **kwargs)
+            response = query.execute()
+            _save('supabase', request,
+                  {'data': response.data, 'count': getattr(response, 'count', None)},
+                  (time.perf_counter() - start) * 1000)
+            return response
+
+        fixture = _load('supabase', request)
+        if fixture is None:
+            if any(name in WRITE_METHODS for name, _, _ in self._chain):
+                return _Response([])
+            raise ReplayMiss(f"No recorded response for {self._target} {self._chain}")
+        time.sleep(latency.delay('supabase', self._target.removeprefix('rpc:'),
+                                 fixture.get('duration_ms')))
+        return _Response(fixture['response']['data'], fixture['response'].get('count'))
+
+
+class TrafficClient:
+    """Drop-in for the Supabase client that records or replays every query."""
+
+    def __init__(self, real=None):
+        self.real = real
+
+    def table(self, name):
+        return _TrafficQuery(self, name, [['table', [name], {}]])
+
+    def rpc(self, fn, params=None):
+        return _TrafficQuery(self, f'rpc:{fn}', [['rpc', [fn, params], {}]])
+
+
+def wrap_client(client):
+    """Wrap a Supabase client according to TRAFFIC_MODE (unchanged when off)."""
+    return TrafficClient(client) if MODE in ('record', 'replay') else client
+
+
+# --- FUNCTION CALLS (Perplexity) ---
+
+def recordable(service, key=None, on_miss=None):
+    """
+    Decorator recording/replaying a function's JSON-serialisable return value.
+    `key(*args, **kwargs)` picks the arguments that identify the call
+    (defaults to all of them); `service.<key['model']>` selects the latency rule.
+    `on_miss()` supplies the replay result for unrecorded calls instead of ReplayMiss.
+    """
+    def decorator(fn):
+        if MODE not in ('record', 'replay'):
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            request = key(*args, **kwargs) if key else {'args': list(args), 'kwargs': kwargs}
+            if MODE == 'record':
+                start = time.perf_counter()
+                result = fn(*args, **kwargs)
+                _save(service, request, result, (time.perf_counter() - start) * 1000)
+                return result
+
+            fixture = _load(service, request)
+            if fixture is None:
+                if on_miss:
+                    return on_miss()
+                raise ReplayMiss(f"No recorded {service} response for {request}")
+            time.sleep(latency.delay(service, request.get('model', ''), fixture.get('duration_ms')))
+            return fixture['response']
+        return wrapper
+    return decorator
@@ -0,0 +1,98 @@
+"""
+Preload and preconnect hints for the resources each page needs.
+
+AssetGraph reads a template's source for what it loads - asset_url('...')
+references and <link href="https://..."> third-party origins - following
+{% extends %} and {% include %}, so the hints for index.html include
+everything base.html loads. hints() turns that into Link header values:
+
+    </static/dist/css/app.1a2b3c4d5e.css>; rel=preload; as=style
+    <https://fonts.gstatic.com>; rel=preconnect; crossorigin
+
+Only stylesheets, scripts and WOFF2 fonts that the build produced are
+preloaded (icons and images are not render-blocking). Blocks guarded by
+{% if asset_built('...') %} ... {% else %} ... {% endif %} are resolved
+against the manifest, so once self-hosted fonts are built the Google Fonts
+origins drop out of the hints and the font files take their place.
+"""
+
+import re
+import threading
+
+_EXTENDS = re.compile(r"""\{%-?\s*(?:extends|include)\s+["']([^"']+)["']""")
+_ASSET_URL = re.compile(r"""asset_url\(\s*["']([^"']+)["']\s*\)""")
+_LINK_TAG = re.compile(r'<link\b[^>]*>', re.I)
+_EXTERNAL_HREF = re.compile(r'href="(https://[^/"]+)', re.I)
+_IF_BUILT = re.compile(
+    r"""\{%-?\s*if\s+asset_built\(\s*["']([^"']+)["']\s*\)\s*-?%\}(.*?)"""
+    r"""(?:\{%-?\s*else\s*-?%\}(.*?))?\{%-?\s*endif\s*-?%\}""", re.S)
+
+# extension -> (as=, extra attributes)
+PRELOAD_TYPES = {
+    '.css': ('style', ''),
+    '.js': ('script', ''),
+    '.woff2': ('font', '; type="font/woff2"; crossorigin'),
+}
+
+
+class AssetGraph:
+    """Resolves templates to the Link hints for the assets they load."""
+
+    def __init__(self, get_source, static_assets):
+        """`get_source(name)` returns a template's source text."""
+        self.get_source = get_source
+        self.static_assets = static_assets
+        self._resolved = {}  # (template, manifest version) -> (assets, origins)
+        self._lock = threading.Lock()
+
+    def _resolve_conditionals(self, source):
+        def branch(match):
+            name, built, fallback = match.groups()
+            return built if self.static_assets.built(name) else (fallback or '')
+        return _IF_BUILT.sub(branch, source)
+
+    def _walk(self, name, assets, origins, seen):
+        if name in seen:
+            return
+        seen.add(name)
+        source = self._resolve_conditionals(self.get_source(name))
+        for parent in _EXTENDS.findall(source):
+            self._walk(parent, assets, origins, seen)
+        for asset in _ASSET_URL.findall(source):
+            if asset not in assets:
+                assets.append(asset)
+        for tag in _LINK_TAG.findall(source):
+            href = _EXTERNAL_HREF.search(tag)
+            if href:
+                origin = (href.group(1), 'crossorigin' in tag.lower())
+                if origin not in origins:
+                    origins.append(origin)
+
+    def references(self, template):
+        """(asset names, [(origin, crossorigin)]) a template loads, including its parents and includes."""
+        key = (template, self.static_assets.version)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            assets, origins = [], []
+            self._walk(template, assets, origins, set())
+            resolved = (tuple(assets), tuple(origins))
+            with self._lock:
+                self._resolved[key] = resolved
+        return resolved
+
+    def hints(self, templates):
+        """Link header values for the templates a page renders: preconnects first, then preloads."""
+        preconnects, preloads = [], []
+        for template in templates:
+            assets, origins = self.references(template)
+            for origin, crossorigin in origins:
+                value = f"<{origin}>; rel=preconnect" + ('; crossorigin' if crossorigin else '')
+                if value not in preconnects:
+                    preconnects.append(value)
+            for asset in assets:
+                kind = PRELOAD_TYPES.get(asset[asset.rfind('.'):])
+                if kind and self.static_assets.built(asset):
+                    value = f"<{self.static_assets.url(asset)}>; rel=preload; as={kind[0]}{kind[1]}"
+                    if value not in preloads:
+                        preloads.append(value)
+        return preconnects + preloads
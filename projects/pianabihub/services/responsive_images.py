@@ -0,0 +1,67 @@
+"""
+Template helper for the responsive image variants built by
+generate_responsive_images.py.
+
+    {{ responsive_image('piana 26.png', 'Piana fibre', sizes='(max-width: 768px) 100vw, 50vw') }}
+
+renders a <picture> with AVIF and WebP srcsets (browsers pick the smallest
+variant for the layout width and pixel density) and the original file as the
+<img> fallback, with intrinsic width/height to avoid layout shift. Images
+missing from the manifest render as a plain <img>. Extra keyword arguments
+become <img> attributes (class_='hero' -> class="hero", fetchpriority=...).
+"""
+
+import json
+import os
+import threading
+
+from markupsafe import Markup, escape
+
+
+class ResponsiveImages:
+    """Reads static/img/manifest.json, reloading it when the file changes."""
+
+    def __init__(self, manifest_path: str, static_url: str = '/static'):
+        self.manifest_path = manifest_path
+        self.static_url = static_url.rstrip('/')
+        self._manifest = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            mtime = os.path.getmtime(self.manifest_path)
+        except OSError:
+            return {}
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    with open(self.manifest_path, encoding='utf-8') as f:
+                        self._manifest = json.load(f)
+                    self._mtime = mtime
+        return self._manifest
+
+    def _url(self, path):
+        return f"{self.static_url}/{path}".replace(' ', '%20')
+
+    def render(self, src: str, alt: str, sizes: str = '100vw',
+               loading: str = 'lazy', **attrs) -> Markup:
+        entry = self._load().get(src)
+        img_attrs = {'src': self._url(src), 'alt': alt, 'loading': loading,
+                     'decoding': 'async', **attrs}
+        if entry:
+            img_attrs.setdefault('width', entry['width'])
+            img_attrs.setdefault('height', entry['height'])
+        img = '<img ' + ' '.join(f'{k.rstrip("_").replace("_", "-")}="{escape(v)}"'
+                                 for k, v in img_attrs.items()) + '>'
+        if not entry:
+            return Markup(img)
+
+        sources = []
+        for fmt in ('avif', 'webp'):
+            variants = entry['variants'].get(fmt)
+            if variants:
+                srcset = ', '.join(f"{self._url(path)} {width}w" for width, path in variants)
+                sources.append(f'<source type="image/{fmt}" srcset="{escape(srcset)}" '
+                               f'sizes="{escape(sizes)}">')
+        return Markup('<picture>' + ''.join(sources) + img + '</picture>')
@@ -0,0 +1,143 @@
+"""
+On-demand sampling profiler for individual requests.
+
+An admin arms the profiler for the next N requests, optionally only those
+whose path matches a glob pattern (e.g. "/dashboard*"). While a profiled
+request runs, a background thread samples that request thread's Python stack
+every `interval` seconds via sys._current_frames(); the request itself is not
+instrumented. When the request finishes its samples are written as a
+collapsed-stack file (one "frame;frame;frame count" line per distinct
+stack), which speedscope.app, flamegraph.pl and inferno render directly as a
+flame graph.
+
+When the profiler is not armed and nothing is being sampled there is no
+sampling thread and the request hooks only check one boolean.
+"""
+
+import fnmatch
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+
+class SamplingProfiler:
+    """Arms per-request stack sampling and stores collapsed-stack profiles."""
+
+    def __init__(self, output_dir: str, interval: float = 0.005, keep: int = 50):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.keep = keep
+        self.armed = False
+        self.remaining = 0
+        self.pattern = None
+        self._active = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    # --- CONTROL ---
+
+    def arm(self, requests: int, pattern: str = None):
+        """Profile the next `requests` requests (matching `pattern`, if given)."""
+        with self._lock:
+            self.remaining = max(0, requests)
+            self.pattern = pattern or None
+            self.armed = self.remaining > 0
+
+    def disarm(self):
+        with self._lock:
+            self.armed = False
+            self.remaining = 0
+
+    # --- PER REQUEST ---
+
+    def begin(self, label: str, path: str):
+        """Start sampling the current thread if armed and `path` matches. Returns a token or None."""
+        with self._lock:
+            if not self.armed or (self.pattern and not fnmatch.fnmatch(path, self.pattern)):
+                return None
+            self.remaining -= 1
+            self.armed = self.remaining > 0
+            thread_id = threading.get_ident()
+            self._active[thread_id] = Counter()
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+                self._thread.start()
+        return thread_id, label, time.perf_counter()
+
+    def end(self, token, status: int = None):
+        """Stop sampling and write the profile. Returns the file name."""
+        thread_id, label, started = token
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            samples = self._active.pop(thread_id, Counter())
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', label).strip('_')[:60] or 'root'
+        name = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}_{slug}_{status or 0}_{elapsed_ms:.0f}ms.folded"
+        with open(os.path.join(self.output_dir, name), 'w', encoding='utf-8') as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        self._prune()
+        return name
+
+    # --- SAMPLING ---
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                active = list(self._active.items())
+            frames = sys._current_frames()
+            for thread_id, samples in active:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    samples[self._collapse(frame)] += 1
+            time.sleep(self.interval)
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ';'.join(reversed(stack))
+
+    # --- STORED PROFILES ---
+
+    def profiles(self) -> list:
+        """Stored profiles, newest first."""
+        try:
+            names = [n for n in os.listdir(self.output_dir) if n.endswith('.folded')]
+        except FileNotFoundError:
+            return []
+        result = []
+        for name in sorted(names, reverse=True):
+            path = os.path.join(self.output_dir, name)
+            with open(path, encoding='utf-8') as f:
+                samples = sum(int(line.rsplit(' ', 1)[1]) for line in f if line.strip())
+            stamp, _, rest = name[:-len('.folded')].partition('_')
+            label, status, duration = rest.rsplit('_', 2) if rest.count('_') >= 2 else (rest, '', '')
+            result.append({
+                'name': name,
+                'created_at': datetime.strptime(stamp, '%Y%m%d-%H%M%S-%f').strftime('%Y-%m-%d %H:%M:%S'),
+                'label': label.replace('_', ' ', 1),
+                'status': status,
+                'duration': duration,
+                'samples': samples,
+            })
+        return result
+
+    def _prune(self):
+        names = sorted(n for n in os.listdir(self.output_dir) if n.endswith('.folded'))
+        for name in names[:-self.keep] if len(names) > self.keep else []:
+            try:
+                os.remove(os.path.join(self.output_dir, name))
+            except OSError:
+                pass
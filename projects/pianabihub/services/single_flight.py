@@ -0,0 +1,69 @@
+"""
+Single-flight request coalescing for read helpers.
+
+When several threads ask for the same key at the same time, only the first
+runs the underlying query; the others wait for it and receive the same
+result (or exception). Nothing is cached once the call completes, so this
+flattens thundering herds (e.g. right after a push broadcast) without
+adding staleness.
+"""
+
+import functools
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one in-flight call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) unless a call for `key` is already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+_default_group = SingleFlight()
+
+
+def single_flight(fn):
+    """
+    Decorator: concurrent calls with identical arguments share one execution.
+    Callers receive the same result object, so it must be treated as read-only.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())))
+        return _default_group.do(key, fn, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,81 @@
+"""
+Stale-if-error fallback for read helpers.
+
+    @stale_if_error('reports', fallback=None, on_stale=note_stale)
+    @ttl_cached(ttl=60)
+    def get_latest_report(vertical_name): ...   # raises on failure
+
+Every successful non-None result is kept as the last known good value for
+its arguments. When the wrapped call raises (timeout, open circuit, database
+error), the last known good value is served instead and `on_stale(name,
+stored_at)` is called so the page can show how old it is; with nothing to
+fall back on, the error is logged, `on_fallback(name)` is called and
+`fallback` is returned.
+
+The wrapper keeps the inner function's `.refresh`/`.invalidate`/`.cache`
+(see ttl_cache.py); `.refresh` also updates the last known good value.
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+
+class LastKnownGood:
+    """LRU-bounded store of the latest good value per key, with its timestamp."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns (value, stored_at) or None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+def stale_if_error(name: str, fallback=None, on_stale=None, on_fallback=None,
+                   maxsize: int = 256):
+    """Decorator serving the last known good result when the call fails."""
+    def decorator(fn):
+        last_good = LastKnownGood(maxsize)
+
+        def remember(args, value):
+            if value is not None:
+                last_good.set(args, value)
+            return value
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            try:
+                return remember(args, fn(*args))
+            except Exception as e:
+                entry = last_good.get(args)
+                if entry is None:
+                    print(f"[Stale] {name}{args} failed with nothing to fall back on: {e}")
+                    if on_fallback:
+                        on_fallback(name)
+                    return fallback() if callable(fallback) else fallback
+                print(f"[Stale] {name}{args} failed, serving last known good: {e}")
+                value, stored_at = entry
+                if on_stale:
+                    on_stale(name, stored_at)
+                return value
+
+        if hasattr(fn, 'refresh'):
+            wrapper.refresh = lambda *args: remember(args, fn.refresh(*args))
+        wrapper.last_good = last_good
+        return wrapper
+    return decorator
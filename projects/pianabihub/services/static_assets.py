@@ -0,0 +1,92 @@
+"""
+Template helper and lookup for the fingerprinted assets built by
+build_assets.py.
+
+    <link rel="stylesheet" href="{{ asset_url('css/app.css') }}">
+
+resolves a logical name through static/dist/manifest.json to its
+content-hashed file (/static/dist/css/app.1a2b3c4d5e.css), so the URL changes
+whenever the content does and the file can be cached as immutable. Names
+missing from the manifest (build not run yet) fall back to /static/<name>.
+{{ inline_asset('css/critical.css') }} returns a built file's contents, and
+{% if asset_built('css/fonts.css') %} tests whether the build produced a file.
+
+precompressed() picks the .br or .gz sibling written by the build for a
+request's Accept-Encoding, so bundles are never compressed per request.
+"""
+
+import json
+import os
+import threading
+
+from markupsafe import Markup
+
+from services.compression import accepted_encodings
+
+# Preferred first
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class StaticAssets:
+    """Reads static/dist/manifest.json, reloading it when the file changes."""
+
+    def __init__(self, static_folder: str, static_url: str = '/static'):
+        self.static_folder = static_folder
+        self.dist_folder = os.path.join(static_folder, 'dist')
+        self.manifest_path = os.path.join(self.dist_folder, 'manifest.json')
+        self.static_url = static_url.rstrip('/')
+        self._manifest = {}
+        self._mtime = None
+        self._inlined = {}  # hashed name -> contents
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            mtime = os.path.getmtime(self.manifest_path)
+        except OSError:
+            return {}
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    with open(self.manifest_path, encoding='utf-8') as f:
+                        self._manifest = json.load(f)
+                    self._mtime = mtime
+        return self._manifest
+
+    @property
+    def version(self):
+        """Changes whenever the manifest is rebuilt."""
+        self._load()
+        return self._mtime
+
+    def built(self, name: str) -> bool:
+        """Whether the last build produced `name`."""
+        return name in self._load()
+
+    def url(self, name: str) -> str:
+        """Public URL of an asset, hashed when the manifest knows it."""
+        hashed = self._load().get(name)
+        if hashed:
+            return f"{self.static_url}/dist/{hashed}"
+        return f"{self.static_url}/{name}"
+
+    def inline(self, name: str) -> Markup:
+        """Contents of a built asset for inlining (e.g. critical CSS); empty if not built."""
+        hashed = self._load().get(name)
+        if not hashed:
+            return Markup('')
+        if hashed not in self._inlined:
+            with open(os.path.join(self.dist_folder, hashed), encoding='utf-8') as f:
+                self._inlined[hashed] = Markup(f.read())
+        return self._inlined[hashed]
+
+    def precompressed(self, filename: str, accept_encoding: str):
+        """
+        Return (filename, encoding) of the best pre-compressed variant of a
+        dist file the client accepts, or (filename, None) to send it as-is.
+        """
+        accepted = accepted_encodings(accept_encoding)
+        for encoding, suffix in ENCODINGS:
+            if encoding in accepted and os.path.isfile(os.path.join(self.dist_folder, filename + suffix)):
+                return filename + suffix, encoding
+        return filename, None
@@ -0,0 +1,82 @@
+"""
+Small in-process TTL cache for read helpers.
+
+    @ttl_cached(ttl=60)
+    def get_latest_report(vertical_name): ...
+
+    get_latest_report.refresh('bedding')     # recompute and store (pre-warming)
+    get_latest_report.invalidate('bedding')  # drop one entry (or all, with no args)
+
+None results are not cached, so helpers that return None on error are
+retried on the next call.
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe LRU-bounded cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns (hit, value)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+
+def ttl_cached(ttl: float, maxsize: int = 256):
+    """Decorator caching a function's non-None results per positional arguments."""
+    def decorator(fn):
+        cache = TTLCache(ttl, maxsize)
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            hit, value = cache.get(args)
+            if hit:
+                return value
+            value = fn(*args)
+            if value is not None:
+                cache.set(args, value)
+            return value
+
+        def refresh(*args):
+            value = fn(*args)
+            if value is not None:
+                cache.set(args, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.refresh = refresh
+        wrapper.invalidate = lambda *args: cache.invalidate(args if args else None)
+        return wrapper
+    return decorator
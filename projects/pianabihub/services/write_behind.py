@@ -0,0 +1,90 @@
+"""
+Write-behind buffer for non-critical updates (audit timestamps).
+
+Updates are coalesced per (table, match column, match value) - only the
+latest values for a row are kept, each with the time it was recorded - and
+flushed off the request path:
+  - every `interval` seconds by a background thread
+  - when `max_pending` rows are waiting
+  - by flush(), e.g. from response.call_on_close once the response is sent
+  - at interpreter shutdown (atexit)
+
+On flush, the pending rows of each table are written together with one
+`store.bulk_update_rows(...)` call: a single transaction on SQLite, and one
+request per distinct value set on Supabase (see the datastore backends).
+
+Serverless (Vercel): the background thread and atexit only run while the
+instance is alive and unfrozen, so anything still buffered when an instance
+is frozen or recycled is lost. Set the interval to 0 there: no thread is
+started, and the app flushes each request's updates after its response.
+"""
+
+import atexit
+import threading
+
+
+class WriteBehindBuffer:
+    """Coalescing, batched write-behind buffer for data-store updates."""
+
+    def __init__(self, store, interval: float = 5.0, max_pending: int = 200):
+        self.store = store
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def put(self, table: str, match_column: str, match_value, values: dict):
+        """Queue an update of `values` on the row where match_column == match_value."""
+        key = (table, match_column, match_value)
+        with self._lock:
+            self._pending.setdefault(key, {}).update(values)
+            pending = len(self._pending)
+        if self.interval > 0:
+            self._ensure_thread()
+        if pending >= self.max_pending:
+            self._wakeup.set()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def flush(self) -> int:
+        """Write all pending updates now. Returns the number of rows flushed."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        # One write per (table, match column), each row keeping its own values
+        batches = {}
+        for (table, match_column, match_value), values in pending.items():
+            batches.setdefault((table, match_column), {})[match_value] = values
+
+        for (table, match_column), rows in batches.items():
+            try:
+                self.store.bulk_update_rows(table, match_column, rows)
+            except Exception as e:
+                print(f"[WriteBehind] Failed to flush {len(rows)} {table} rows: {e}")
+
+        return len(pending)
+
+    def _ensure_thread(self):
+        """Start the background flush thread on first use (and after a fork)."""
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[WriteBehind] Flush error: {e}")
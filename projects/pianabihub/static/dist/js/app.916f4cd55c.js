@@ -0,0 +1,293 @@
+// Mobile menu and user dropdown (onclick handlers in base.html)
+
+function toggleMobileMenu() {
+    const menu = document.getElementById('mobileMenu');
+    const btn = document.querySelector('.hamburger-btn');
+    menu.classList.toggle('active');
+    btn.classList.toggle('active');
+    document.body.style.overflow = menu.classList.contains('active') ? 'hidden' : '';
+}
+
+// Close menu on escape key
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+        const menu = document.getElementById('mobileMenu');
+        if (menu.classList.contains('active')) {
+            toggleMobileMenu();
+        }
+        // Also close user dropdown
+        const userMenu = document.getElementById('userMenu');
+        if (userMenu) userMenu.classList.remove('active');
+    }
+});
+
+// User dropdown toggle
+function toggleUserMenu() {
+    const menu = document.getElementById('userMenu');
+    if (menu) menu.classList.toggle('active');
+}
+
+// Close user dropdown when clicking outside
+document.addEventListener('click', function(e) {
+    const dropdown = document.querySelector('.nav-user-dropdown');
+    const userMenu = document.getElementById('userMenu');
+    if (dropdown && userMenu && !dropdown.contains(e.target)) {
+        userMenu.classList.remove('active');
+    }
+});
+
+// Service worker registration and messages from the service worker
+
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register('/service-worker.js')
+            .then(registration => {
+                console.log('[PWA] Service Worker registered:', registration.scope);
+
+                // Keep the offline copy of events current (see /api/sync/events)
+                if (navigator.onLine && navigator.serviceWorker.controller) {
+                    navigator.serviceWorker.controller.postMessage({ type: 'SYNC_EVENTS' });
+                }
+                if ('periodicSync' in registration) {
+                    registration.periodicSync.register('events-sync', { minInterval: 12 * 60 * 60 * 1000 })
+                        .catch(() => {});  // not permitted unless installed
+                }
+            })
+            .catch(error => {
+                console.error('[PWA] Service Worker registration failed:', error);
+            });
+    });
+
+    // Listen for navigation messages from service worker (notification clicks)
+    navigator.serviceWorker.addEventListener('message', (event) => {
+        if (event.data && event.data.type === 'NAVIGATE') {
+            console.log('[PWA] Navigating to:', event.data.url);
+            window.location.href = event.data.url;
+        }
+        // This page was served from cache and a newer version just arrived
+        if (event.data && event.data.type === 'CONTENT_UPDATED' &&
+                event.data.url === window.location.href &&
+                !document.getElementById('contentUpdateBanner')) {
+            const banner = document.createElement('div');
+            banner.id = 'contentUpdateBanner';
+            banner.className = 'content-update-banner';
+            banner.setAttribute('role', 'status');
+            banner.innerHTML = 'Newer content is available. <button type="button">Refresh</button>';
+            banner.querySelector('button').addEventListener('click', () => window.location.reload());
+            document.body.appendChild(banner);
+        }
+    });
+}
+
+// PWA install banner (Android prompt, iOS instructions)
+
+(function() {
+    let deferredPrompt = null;
+    const installBanner = document.getElementById('installBanner');
+    const installButton = document.getElementById('installButton');
+    const dismissButton = document.getElementById('dismissButton');
+    const installSubtext = document.getElementById('installSubtext');
+    const iosInstructions = document.getElementById('iosInstructions');
+    const iosGotIt = document.getElementById('iosGotIt');
+
+    // Detect iOS (iPhone, iPad, iPod)
+    const isIOS = /iPad|iPhone|iPod/.test(navigator.userAgent) && !window.MSStream;
+
+    // Detect if running in Safari (not Chrome/Firefox on iOS)
+    const isSafari = /^((?!chrome|android).)*safari/i.test(navigator.userAgent);
+
+    // Check if already installed (running in standalone mode)
+    const isInstalled = window.matchMedia('(display-mode: standalone)').matches ||
+                       window.navigator.standalone === true;
+
+    // Check if user previously dismissed the banner
+    const dismissed = localStorage.getItem('pwa-install-dismissed');
+
+    // Check if mobile
+    const isMobile = window.innerWidth < 768;
+
+    console.log('[PWA] iOS:', isIOS, 'Safari:', isSafari, 'Installed:', isInstalled, 'Mobile:', isMobile);
+
+    // iOS-specific: Show banner immediately (no beforeinstallprompt event)
+    if (isIOS && !isInstalled && !dismissed && isMobile) {
+        installSubtext.textContent = 'Add to your home screen for quick access';
+        installButton.textContent = 'How to Install';
+        installBanner.style.display = 'block';
+        console.log('[PWA] Showing iOS install banner');
+    }
+
+    // Listen for the beforeinstallprompt event (Android/Chrome)
+    window.addEventListener('beforeinstallprompt', (e) => {
+        e.preventDefault();
+        deferredPrompt = e;
+
+        // Show banner on mobile if not dismissed or installed
+        if (isMobile && !dismissed && !isInstalled) {
+            installButton.textContent = 'Install';
+            installSubtext.textContent = 'Quick access from your home screen';
+            installBanner.style.display = 'block';
+        }
+
+        console.log('[PWA] Android install prompt available');
+    });
+
+    // Handle install button click
+    installButton.addEventListener('click', async () => {
+        // iOS: Show step-by-step instructions
+        if (isIOS) {
+            document.querySelector('.install-banner-content').style.display = 'none';
+            iosInstructions.style.display = 'block';
+            console.log('[PWA] Showing iOS instructions');
+            return;
+        }
+
+        // Android/Chrome: Use native prompt
+        if (deferredPrompt) {
+            deferredPrompt.prompt();
+            const { outcome } = await deferredPrompt.userChoice;
+            console.log('[PWA] User choice:', outcome);
+            deferredPrompt = null;
+            installBanner.style.display = 'none';
+        }
+    });
+
+    // Handle "Got it" button for iOS instructions
+    if (iosGotIt) {
+        iosGotIt.addEventListener('click', () => {
+            installBanner.style.display = 'none';
+            localStorage.setItem('pwa-install-dismissed', 'true');
+        });
+    }
+
+    // Handle dismiss button click
+    dismissButton.addEventListener('click', () => {
+        installBanner.style.display = 'none';
+        localStorage.setItem('pwa-install-dismissed', 'true');
+    });
+
+    // Listen for app installed event
+    window.addEventListener('appinstalled', () => {
+        console.log('[PWA] App installed successfully');
+        installBanner.style.display = 'none';
+        deferredPrompt = null;
+    });
+})();
+
+// Silent auto-update when the server requires a newer app version
+
+(function() {
+    const VERSION_KEY = 'piana-bi-app-version';
+    const UPDATE_IN_PROGRESS_KEY = 'piana-bi-updating';
+
+    // Compare semver versions (returns true if v1 < v2)
+    function isVersionLower(v1, v2) {
+        if (!v1 || !v2) return false;
+        const parts1 = v1.split('.').map(Number);
+        const parts2 = v2.split('.').map(Number);
+
+        for (let i = 0; i < 3; i++) {
+            const p1 = parts1[i] || 0;
+            const p2 = parts2[i] || 0;
+            if (p1 < p2) return true;
+            if (p1 > p2) return false;
+        }
+        return false;
+    }
+
+    // Silent auto-update: clear cache and reload
+    async function performSilentUpdate(newVersion) {
+        // Prevent infinite reload loops
+        if (sessionStorage.getItem(UPDATE_IN_PROGRESS_KEY)) {
+            console.log('[Version] Update already in progress, skipping');
+            sessionStorage.removeItem(UPDATE_IN_PROGRESS_KEY);
+            localStorage.setItem(VERSION_KEY, newVersion);
+            return;
+        }
+
+        console.log('[Version] Performing silent update to', newVersion);
+        sessionStorage.setItem(UPDATE_IN_PROGRESS_KEY, 'true');
+
+        try {
+            // Tell service worker to clear all caches
+            if ('serviceWorker' in navigator && navigator.serviceWorker.controller) {
+                navigator.serviceWorker.controller.postMessage({ type: 'FORCE_UPDATE' });
+                await new Promise(resolve => setTimeout(resolve, 500));
+            }
+
+            // Store new version
+            localStorage.setItem(VERSION_KEY, newVersion);
+
+            // Silent reload - keeps user signed in
+            window.location.reload();
+        } catch (error) {
+            console.error('[Version] Silent update failed:', error);
+            sessionStorage.removeItem(UPDATE_IN_PROGRESS_KEY);
+            // Store version anyway to prevent repeated failures
+            localStorage.setItem(VERSION_KEY, newVersion);
+        }
+    }
+
+    // Check version against server
+    async function checkVersion() {
+        try {
+            const response = await fetch('/api/version', {
+                cache: 'no-store',
+                headers: { 'Cache-Control': 'no-cache' }
+            });
+
+            if (!response.ok) {
+                console.log('[Version] Could not fetch version info');
+                return;
+            }
+
+            const serverVersion = await response.json();
+            const localVersion = localStorage.getItem(VERSION_KEY);
+
+            console.log('[Version] Server:', serverVersion.version, 'Local:', localVersion);
+
+            // If no local version, store current and continue
+            if (!localVersion) {
+                localStorage.setItem(VERSION_KEY, serverVersion.version);
+                console.log('[Version] First visit, storing version:', serverVersion.version);
+                return;
+            }
+
+            // Check if local version is below minimum required - silent auto-update
+            if (isVersionLower(localVersion, serverVersion.min_version)) {
+                console.log('[Version] Update needed! Local:', localVersion, 'Min:', serverVersion.min_version);
+                performSilentUpdate(serverVersion.version);
+            }
+            // Also update stored version if server has newer (no reload needed)
+            else if (isVersionLower(localVersion, serverVersion.version)) {
+                localStorage.setItem(VERSION_KEY, serverVersion.version);
+                console.log('[Version] Updated stored version to:', serverVersion.version);
+            }
+        } catch (error) {
+            console.log('[Version] Check failed (may be offline):', error);
+        }
+    }
+
+    // Listen for cache cleared message from service worker
+    if ('serviceWorker' in navigator) {
+        navigator.serviceWorker.addEventListener('message', (event) => {
+            if (event.data && event.data.type === 'CACHE_CLEARED') {
+                console.log('[Version] Cache cleared by service worker');
+            }
+        });
+    }
+
+    // Check version on page load
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', checkVersion);
+    } else {
+        // Small delay to let page render first
+        setTimeout(checkVersion, 500);
+    }
+
+    // Also check when app becomes visible (user returns to app)
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'visible') {
+            setTimeout(checkVersion, 1000);
+        }
+    });
+})();
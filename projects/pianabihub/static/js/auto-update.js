@@ -0,0 +1,118 @@
+// Silent auto-update when the server requires a newer app version
+
+(function() {
+    const VERSION_KEY = 'piana-bi-app-version';
+    const UPDATE_IN_PROGRESS_KEY = 'piana-bi-updating';
+
+    // Compare semver versions (returns true if v1 < v2)
+    function isVersionLower(v1, v2) {
+        if (!v1 || !v2) return false;
+        const parts1 = v1.split('.').map(Number);
+        const parts2 = v2.split('.').map(Number);
+
+        for (let i = 0; i < 3; i++) {
+            const p1 = parts1[i] || 0;
+            const p2 = parts2[i] || 0;
+            if (p1 < p2) return true;
+            if (p1 > p2) return false;
+        }
+        return false;
+    }
+
+    // Silent auto-update: clear cache and reload
+    async function performSilentUpdate(newVersion) {
+        // Prevent infinite reload loops
+        if (sessionStorage.getItem(UPDATE_IN_PROGRESS_KEY)) {
+            console.log('[Version] Update already in progress, skipping');
+            sessionStorage.removeItem(UPDATE_IN_PROGRESS_KEY);
+            localStorage.setItem(VERSION_KEY, newVersion);
+            return;
+        }
+
+        console.log('[Version] Performing silent update to', newVersion);
+        sessionStorage.setItem(UPDATE_IN_PROGRESS_KEY, 'true');
+
+        try {
+            // Tell service worker to clear all caches
+            if ('serviceWorker' in navigator && navigator.serviceWorker.controller) {
+                navigator.serviceWorker.controller.postMessage({ type: 'FORCE_UPDATE' });
+                await new Promise(resolve => setTimeout(resolve, 500));
+            }
+
+            // Store new version
+            localStorage.setItem(VERSION_KEY, newVersion);
+
+            // Silent reload - keeps user signed in
+            window.location.reload();
+        } catch (error) {
+            console.error('[Version] Silent update failed:', error);
+            sessionStorage.removeItem(UPDATE_IN_PROGRESS_KEY);
+            // Store version anyway to prevent repeated failures
+            localStorage.setItem(VERSION_KEY, newVersion);
+        }
+    }
+
+    // Check version against server
+    async function checkVersion() {
+        try {
+            const response = await fetch('/api/version', {
+                cache: 'no-store',
+                headers: { 'Cache-Control': 'no-cache' }
+            });
+
+            if (!response.ok) {
+                console.log('[Version] Could not fetch version info');
+                return;
+            }
+
+            const serverVersion = await response.json();
+            const localVersion = localStorage.getItem(VERSION_KEY);
+
+            console.log('[Version] Server:', serverVersion.version, 'Local:', localVersion);
+
+            // If no local version, store current and continue
+            if (!localVersion) {
+                localStorage.setItem(VERSION_KEY, serverVersion.version);
+                console.log('[Version] First visit, storing version:', serverVersion.version);
+                return;
+            }
+
+            // Check if local version is below minimum required - silent auto-update
+            if (isVersionLower(localVersion, serverVersion.min_version)) {
+                console.log('[Version] Update needed! Local:', localVersion, 'Min:', serverVersion.min_version);
+                performSilentUpdate(serverVersion.version);
+            }
+            // Also update stored version if server has newer (no reload needed)
+            else if (isVersionLower(localVersion, serverVersion.version)) {
+                localStorage.setItem(VERSION_KEY, serverVersion.version);
+                console.log('[Version] Updated stored version to:', serverVersion.version);
+            }
+        } catch (error) {
+            console.log('[Version] Check failed (may be offline):', error);
+        }
+    }
+
+    // Listen for cache cleared message from service worker
+    if ('serviceWorker' in navigator) {
+        navigator.serviceWorker.addEventListener('message', (event) => {
+            if (event.data && event.data.type === 'CACHE_CLEARED') {
+                console.log('[Version] Cache cleared by service worker');
+            }
+        });
+    }
+
+    // Check version on page load
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', checkVersion);
+    } else {
+        // Small delay to let page render first
+        setTimeout(checkVersion, 500);
+    }
+
+    // Also check when app becomes visible (user returns to app)
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'visible') {
+            setTimeout(checkVersion, 1000);
+        }
+    });
+})();
@@ -0,0 +1,93 @@
+// PWA install banner (Android prompt, iOS instructions)
+
+(function() {
+    let deferredPrompt = null;
+    const installBanner = document.getElementById('installBanner');
+    const installButton = document.getElementById('installButton');
+    const dismissButton = document.getElementById('dismissButton');
+    const installSubtext = document.getElementById('installSubtext');
+    const iosInstructions = document.getElementById('iosInstructions');
+    const iosGotIt = document.getElementById('iosGotIt');
+
+    // Detect iOS (iPhone, iPad, iPod)
+    const isIOS = /iPad|iPhone|iPod/.test(navigator.userAgent) && !window.MSStream;
+
+    // Detect if running in Safari (not Chrome/Firefox on iOS)
+    const isSafari = /^((?!chrome|android).)*safari/i.test(navigator.userAgent);
+
+    // Check if already installed (running in standalone mode)
+    const isInstalled = window.matchMedia('(display-mode: standalone)').matches ||
+                       window.navigator.standalone === true;
+
+    // Check if user previously dismissed the banner
+    const dismissed = localStorage.getItem('pwa-install-dismissed');
+
+    // Check if mobile
+    const isMobile = window.innerWidth < 768;
+
+    console.log('[PWA] iOS:', isIOS, 'Safari:', isSafari, 'Installed:', isInstalled, 'Mobile:', isMobile);
+
+    // iOS-specific: Show banner immediately (no beforeinstallprompt event)
+    if (isIOS && !isInstalled && !dismissed && isMobile) {
+        installSubtext.textContent = 'Add to your home screen for quick access';
+        installButton.textContent = 'How to Install';
+        installBanner.style.display = 'block';
+        console.log('[PWA] Showing iOS install banner');
+    }
+
+    // Listen for the beforeinstallprompt event (Android/Chrome)
+    window.addEventListener('beforeinstallprompt', (e) => {
+        e.preventDefault();
+        deferredPrompt = e;
+
+        // Show banner on mobile if not dismissed or installed
+        if (isMobile && !dismissed && !isInstalled) {
+            installButton.textContent = 'Install';
+            installSubtext.textContent = 'Quick access from your home screen';
+            installBanner.style.display = 'block';
+        }
+
+        console.log('[PWA] Android install prompt available');
+    });
+
+    // Handle install button click
+    installButton.addEventListener('click', async () => {
+        // iOS: Show step-by-step instructions
+        if (isIOS) {
+            document.querySelector('.install-banner-content').style.display = 'none';
+            iosInstructions.style.display = 'block';
+            console.log('[PWA] Showing iOS instructions');
+            return;
+        }
+
+        // Android/Chrome: Use native prompt
+        if (deferredPrompt) {
+            deferredPrompt.prompt();
+            const { outcome } = await deferredPrompt.userChoice;
+            console.log('[PWA] User choice:', outcome);
+            deferredPrompt = null;
+            installBanner.style.display = 'none';
+        }
+    });
+
+    // Handle "Got it" button for iOS instructions
+    if (iosGotIt) {
+        iosGotIt.addEventListener('click', () => {
+            installBanner.style.display = 'none';
+            localStorage.setItem('pwa-install-dismissed', 'true');
+        });
+    }
+
+    // Handle dismiss button click
+    dismissButton.addEventListener('click', () => {
+        installBanner.style.display = 'none';
+        localStorage.setItem('pwa-install-dismissed', 'true');
+    });
+
+    // Listen for app installed event
+    window.addEventListener('appinstalled', () => {
+        console.log('[PWA] App installed successfully');
+        installBanner.style.display = 'none';
+        deferredPrompt = null;
+    });
+})();
@@ -0,0 +1,37 @@
+// Mobile menu and user dropdown (onclick handlers in base.html)
+
+function toggleMobileMenu() {
+    const menu = document.getElementById('mobileMenu');
+    const btn = document.querySelector('.hamburger-btn');
+    menu.classList.toggle('active');
+    btn.classList.toggle('active');
+    document.body.style.overflow = menu.classList.contains('active') ? 'hidden' : '';
+}
+
+// Close menu on escape key
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+        const menu = document.getElementById('mobileMenu');
+        if (menu.classList.contains('active')) {
+            toggleMobileMenu();
+        }
+        // Also close user dropdown
+        const userMenu = document.getElementById('userMenu');
+        if (userMenu) userMenu.classList.remove('active');
+    }
+});
+
+// User dropdown toggle
+function toggleUserMenu() {
+    const menu = document.getElementById('userMenu');
+    if (menu) menu.classList.toggle('active');
+}
+
+// Close user dropdown when clicking outside
+document.addEventListener('click', function(e) {
+    const dropdown = document.querySelector('.nav-user-dropdown');
+    const userMenu = document.getElementById('userMenu');
+    if (dropdown && userMenu && !dropdown.contains(e.target)) {
+        userMenu.classList.remove('active');
+    }
+});
@@ -0,0 +1,42 @@
+// Service worker registration and messages from the service worker
+
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register('/service-worker.js')
+            .then(registration => {
+                console.log('[PWA] Service Worker registered:', registration.scope);
+
+                // Keep the offline copy of events current (see /api/sync/events)
+                if (navigator.onLine && navigator.serviceWorker.controller) {
+                    navigator.serviceWorker.controller.postMessage({ type: 'SYNC_EVENTS' });
+                }
+                if ('periodicSync' in registration) {
+                    registration.periodicSync.register('events-sync', { minInterval: 12 * 60 * 60 * 1000 })
+                        .catch(() => {});  // not permitted unless installed
+                }
+            })
+            .catch(error => {
+                console.error('[PWA] Service Worker registration failed:', error);
+            });
+    });
+
+    // Listen for navigation messages from service worker (notification clicks)
+    navigator.serviceWorker.addEventListener('message', (event) => {
+        if (event.data && event.data.type === 'NAVIGATE') {
+            console.log('[PWA] Navigating to:', event.data.url);
+            window.location.href = event.data.url;
+        }
+        // This page was served from cache and a newer version just arrived
+        if (event.data && event.data.type === 'CONTENT_UPDATED' &&
+                event.data.url === window.location.href &&
+                !document.getElementById('contentUpdateBanner')) {
+            const banner = document.createElement('div');
+            banner.id = 'contentUpdateBanner';
+            banner.className = 'content-update-banner';
+            banner.setAttribute('role', 'status');
+            banner.innerHTML = 'Newer content is available. <button type="button">Refresh</button>';
+            banner.querySelector('button').addEventListener('click', () => window.location.reload());
+            document.body.appendChild(banner);
+        }
+    });
+}
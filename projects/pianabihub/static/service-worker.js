@@ -3,21 +3,44 @@
  * Handles caching strategies, offline functionality, forced updates, and push notifications
  */
 
-const CACHE_VERSION = 'piana-bi-v10';
-const OFFLINE_URL = '/offline';
+// --- BEGIN GENERATED by build_assets.py (do not edit) ---
+const CACHE_VERSION = 'piana-bi-84d6789563';
 
 // Assets to cache immediately on install
 const PRECACHE_ASSETS = [
   '/',
   '/offline',
   '/maintenance',
-  '/static/css/base.css',
-  '/static/css/components.css',
-  '/static/icons/icon-192.png',
-  '/static/icons/icon-512.png',
-  '/static/manifest.json'
+  '/static/manifest.json',
+  '/static/dist/css/app.3340fa8bb8.css',
+  '/static/dist/css/base.ed05ce3883.css',
+  '/static/dist/icons/icon-192.64e5f3a682.png',
+  '/static/dist/icons/icon-512.cf63a9cb50.png',
+  '/static/dist/js/app.916f4cd55c.js'
+];
+// --- END GENERATED ---
+
+const OFFLINE_URL = '/offline';
+
+// Stale-while-revalidate: cached pages younger than the freshness budget
+// (swr_max_age from /api/version) and cached under the current app version
+// are shown immediately while the network copy is fetched in the background.
+const DEFAULT_SWR_MAX_AGE = 12 * 60 * 60;   // seconds
+const VERSION_CHECK_INTERVAL = 5 * 60 * 1000;
+const CACHED_AT_HEADER = 'X-SW-Cached-At';
+const APP_VERSION_HEADER = 'X-SW-App-Version';
+
+// Pages that must always come from the network and are never cached
+const NETWORK_ONLY_PREFIXES = [
+  '/login', '/logout', '/register', '/auth/', '/callback', '/guest',
+  '/partner-login', '/admin', '/settings', '/upload-events', '/notification-redirect'
 ];
 
+// Sign-in entry points (GET and POST): a different user may be taking over the device
+const SIGN_IN_PREFIXES = ['/login', '/callback', '/guest', '/partner-login', '/auth/'];
+
+let appVersion = { version: null, maxAge: DEFAULT_SWR_MAX_AGE * 1000, checkedAt: 0 };
+
 // Install event: Pre-cache essential assets
 self.addEventListener('install', (event) => {
   console.log('[Service Worker] Installing...');
@@ -83,6 +106,13 @@ self.addEventListener('fetch', (event) => {
   const { request } = event;
   const url = new URL(request.url);
 
+  // Signing in: drop the previous user's cached pages before the login
+  // response is used, so an expired session never leaks into the next one
+  if (url.origin === self.location.origin && isSignIn(url.pathname)) {
+    event.respondWith(signIn(request));
+    return;
+  }
+
   // Skip non-GET requests
   if (request.method !== 'GET') {
     return;
@@ -93,13 +123,32 @@ self.addEventListener('fetch', (event) => {
     return;
   }
 
+  // Auth-sensitive pages: network only. Logging out also drops cached pages
+  // so the next user of the device never sees the previous user's data.
+  if (isNetworkOnly(url.pathname)) {
+    if (url.pathname.startsWith('/logout')) {
+      event.waitUntil(Promise.all([clearCachedPages(), clearLocalEvents()]));
+    }
+    return;
+  }
+
   // Strategy 1: Cache-first for static assets (CSS, JS, images, icons)
   if (isStaticAsset(url.pathname)) {
     event.respondWith(cacheFirst(request));
     return;
   }
 
-  // Strategy 2: Network-first for HTML pages (fresh content preferred)
+  // Strategy 2: Stale-while-revalidate for the dashboard and event pages
+  if (isRevalidatedPage(url.pathname)) {
+    event.respondWith(staleWhileRevalidate(event));
+    // Opening the events pages keeps the offline copy current
+    if (url.pathname.startsWith('/events')) {
+      event.waitUntil(syncEvents());
+    }
+    return;
+  }
+
+  // Strategy 3: Network-first for other HTML pages (fresh content preferred)
   if (isHTMLPage(url.pathname)) {
     event.respondWith(networkFirst(request));
     return;
@@ -145,7 +194,13 @@ async function networkFirst(request) {
   const cache = await caches.open(CACHE_VERSION);
 
   try {
-    const response = await fetch(request);
+    const cached = await cache.match(request);
+    const response = await fetch(conditionalRequest(request, cached));
+
+    // Server confirmed our cached copy is current (body-less 304)
+    if (response.status === 304 && cached) {
+      return cached;
+    }
 
     // Cache successful HTML responses
     if (response.status === 200) {
@@ -174,6 +229,179 @@ async function networkFirst(request) {
   }
 }
 
+/**
+ * Stale-while-revalidate strategy: serve a fresh-enough cached page at once
+ * and update it in the background, notifying open pages when it changed.
+ * Falls back to network-first when the cached copy is missing or too old.
+ */
+async function staleWhileRevalidate(event) {
+  const { request } = event;
+  const cache = await caches.open(CACHE_VERSION);
+  const cached = await cache.match(request);
+
+  event.waitUntil(refreshAppVersion());
+  const revalidation = revalidatePage(request, cached, cache);
+
+  if (cached && isWithinFreshnessBudget(cached)) {
+    console.log('[Service Worker] Serving cached page, revalidating:', request.url);
+    event.waitUntil(revalidation.catch((error) => {
+      console.log('[Service Worker] Background revalidation failed:', error);
+    }));
+    return cached;
+  }
+
+  try {
+    return await revalidation;
+  } catch (error) {
+    console.log('[Service Worker] Network failed, trying cache:', request.url);
+    if (cached) {
+      return cached;
+    }
+    const localPage = await renderFromLocalData(request);
+    if (localPage) {
+      return localPage;
+    }
+    const offlineResponse = await cache.match(OFFLINE_URL);
+    if (offlineResponse) {
+      return offlineResponse;
+    }
+    throw error;
+  }
+}
+
+/**
+ * Fetch a page (conditionally, when cached) and update the cache.
+ * Resolves to the response the page should be served with.
+ */
+async function revalidatePage(request, cached, cache) {
+  // Clone before the first await: `cached` may be handed to the page meanwhile
+  const previous = cached && cached.clone();
+  const response = await fetch(conditionalRequest(request, cached));
+
+  if (response.status === 304 && cached) {
+    // Unchanged: restart the freshness budget of the cached copy
+    const body = await previous.blob();
+    await cache.put(request, stampResponse(body, cached));
+    return cached;
+  }
+
+  if (response.status === 200) {
+    const body = await response.clone().blob();
+    await cache.put(request, stampResponse(body, response));
+    if (previous && await hasChanged(previous, response, body)) {
+      notifyClients({ type: 'CONTENT_UPDATED', url: request.url });
+    }
+    return response;
+  }
+
+  // Login redirect (session expired) or error: never keep serving the old copy
+  if (response.type === 'opaqueredirect' || response.status === 401 || response.status === 403) {
+    await cache.delete(request);
+  }
+  return response;
+}
+
+/**
+ * Compare by ETag when the page has one, otherwise by content
+ */
+async function hasChanged(previous, response, body) {
+  const etag = response.headers.get('ETag');
+  if (etag || previous.headers.get('ETag')) {
+    return etag !== previous.headers.get('ETag');
+  }
+  return (await previous.text()) !== (await body.text());
+}
+
+/**
+ * Copy of a response carrying the time it was cached and the app version
+ */
+function stampResponse(body, response) {
+  const headers = new Headers(response.headers);
+  headers.set(CACHED_AT_HEADER, String(Date.now()));
+  if (appVersion.version) {
+    headers.set(APP_VERSION_HEADER, appVersion.version);
+  }
+  return new Response(body, { status: response.status, statusText: response.statusText, headers });
+}
+
+function isWithinFreshnessBudget(cached) {
+  const cachedAt = Number(cached.headers.get(CACHED_AT_HEADER) || 0);
+  const cachedVersion = cached.headers.get(APP_VERSION_HEADER);
+  if (appVersion.version && cachedVersion && cachedVersion !== appVersion.version) {
+    return false;
+  }
+  return Date.now() - cachedAt < appVersion.maxAge;
+}
+
+/**
+ * Refresh the app version and freshness budget from /api/version,
+ * at most every VERSION_CHECK_INTERVAL. Offline keeps the last known values.
+ */
+async function refreshAppVersion() {
+  if (Date.now() - appVersion.checkedAt < VERSION_CHECK_INTERVAL) {
+    return;
+  }
+  appVersion.checkedAt = Date.now();
+  try {
+    const response = await fetch('/api/version', { cache: 'no-store' });
+    if (response.ok) {
+      const data = await response.json();
+      appVersion = {
+        version: data.version,
+        maxAge: (data.swr_max_age || DEFAULT_SWR_MAX_AGE) * 1000,
+        checkedAt: appVersion.checkedAt
+      };
+    }
+  } catch (error) {
+    console.log('[Service Worker] Version check failed (may be offline)');
+  }
+}
+
+async function notifyClients(message) {
+  const clients = await self.clients.matchAll({ type: 'window' });
+  clients.forEach((client) => client.postMessage(message));
+}
+
+/**
+ * Pass a sign-in request through, clearing cached pages and local event data
+ * before its response (usually a redirect into the app) reaches the page
+ */
+async function signIn(request) {
+  const response = await fetch(request);
+  await Promise.all([clearCachedPages(), clearLocalEvents()]);
+  return response;
+}
+
+/**
+ * Remove every cached HTML page (keeps precached static assets)
+ */
+async function clearCachedPages() {
+  const cache = await caches.open(CACHE_VERSION);
+  const requests = await cache.keys();
+  await Promise.all(requests
+    .filter((request) => {
+      const pathname = new URL(request.url).pathname;
+      return !isStaticAsset(pathname) && pathname !== OFFLINE_URL && pathname !== '/maintenance';
+    })
+    .map((request) => cache.delete(request)));
+}
+
+/**
+ * Revalidate a cached page with its ETag so unchanged pages come back as 304s.
+ * Redirects are left to the browser (opaque) so login redirects still work.
+ */
+function conditionalRequest(request, cached) {
+  const etag = cached && cached.headers.get('ETag');
+  if (!etag) {
+    return request;
+  }
+  return new Request(request.url, {
+    headers: { 'If-None-Match': etag },
+    credentials: 'same-origin',
+    redirect: 'manual'
+  });
+}
+
 /**
  * Check if pathname is a static asset
  */
@@ -182,6 +410,26 @@ function isStaticAsset(pathname) {
   return staticExtensions.some(ext => pathname.endsWith(ext)) || pathname.includes('/static/');
 }
 
+/**
+ * Check if pathname is served stale-while-revalidate
+ */
+function isRevalidatedPage(pathname) {
+  return pathname === '/dashboard' ||
+         pathname === '/events' ||
+         /^\/events\/[^/]+$/.test(pathname);
+}
+
+/**
+ * Check if pathname must bypass the cache entirely
+ */
+function isSignIn(pathname) {
+  return SIGN_IN_PREFIXES.some((prefix) => pathname.startsWith(prefix));
+}
+
+function isNetworkOnly(pathname) {
+  return NETWORK_ONLY_PREFIXES.some(prefix => pathname.startsWith(prefix));
+}
+
 /**
  * Check if pathname is an HTML page
  */
@@ -197,6 +445,268 @@ function isHTMLPage(pathname) {
          (!pathname.includes('.') && !pathname.startsWith('/api/'));
 }
 
+// --- OFFLINE EVENT SYNC ---
+
+// Events and completed summaries are mirrored into IndexedDB from the
+// /api/sync/events delta feed, so /events and /events/<id> can be rendered
+// on the device when there is no network and no cached copy of the page.
+const SYNC_DB_NAME = 'piana-bi-offline';
+const SYNC_DB_VERSION = 2;
+const SYNC_MIN_INTERVAL = 60 * 1000;
+const SYNC_FULL_INTERVAL = 24 * 60 * 60 * 1000;  // full resync picks up deleted events
+const SYNC_MAX_PAGES = 50;
+
+let syncInFlight = null;
+let lastSyncAttempt = 0;
+
+// Pages ask for a sync when they load online; periodic sync where supported
+self.addEventListener('message', (event) => {
+  if (event.data && event.data.type === 'SYNC_EVENTS') {
+    event.waitUntil(syncEvents());
+  }
+});
+
+self.addEventListener('periodicsync', (event) => {
+  if (event.tag === 'events-sync') {
+    event.waitUntil(syncEvents(true));
+  }
+});
+
+function openSyncDB() {
+  return new Promise((resolve, reject) => {
+    const request = indexedDB.open(SYNC_DB_NAME, SYNC_DB_VERSION);
+    request.onupgradeneeded = () => {
+      const db = request.result;
+      // Version 2 keys records by string id; older data is dropped and fully re-synced
+      ['events', 'summaries', 'meta'].forEach((name) => {
+        if (db.objectStoreNames.contains(name)) {
+          db.deleteObjectStore(name);
+        }
+      });
+      db.createObjectStore('events', { keyPath: 'id' });
+      db.createObjectStore('summaries', { keyPath: 'event_id' });
+      db.createObjectStore('meta');
+    };
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+function idbResult(request) {
+  return new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+function idbDone(tx) {
+  return new Promise((resolve, reject) => {
+    tx.oncomplete = () => resolve();
+    tx.onerror = tx.onabort = () => reject(tx.error);
+  });
+}
+
+async function readSyncState(db) {
+  const state = await idbResult(db.transaction('meta').objectStore('meta').get('state'));
+  return state || { cursor: null, lastSync: 0, lastFullSync: 0 };
+}
+
+/**
+ * Pull changes since the stored cursor (or everything, for a full sync).
+ * Throttled to one run per SYNC_MIN_INTERVAL unless forced.
+ */
+function syncEvents(force) {
+  if (syncInFlight) {
+    return syncInFlight;
+  }
+  if (!force && Date.now() - lastSyncAttempt < SYNC_MIN_INTERVAL) {
+    return Promise.resolve();
+  }
+  lastSyncAttempt = Date.now();
+  syncInFlight = runEventSync()
+    .catch((error) => console.log('[Service Worker] Event sync failed:', error))
+    .finally(() => { syncInFlight = null; });
+  return syncInFlight;
+}
+
+async function runEventSync() {
+  const db = await openSyncDB();
+  const state = await readSyncState(db);
+  const full = !state.cursor || Date.now() - state.lastFullSync > SYNC_FULL_INTERVAL;
+  let cursor = full ? {} : state.cursor;
+  let received = 0;
+
+  for (let page = 0; page < SYNC_MAX_PAGES; page++) {
+    // The cursor is opaque here: send back whatever the server returned
+    const params = new URLSearchParams();
+    Object.keys(cursor).forEach((key) => {
+      if (cursor[key] != null) params.set(key, cursor[key]);
+    });
+
+    // manual: a login redirect (signed out) must not be parsed as data
+    const response = await fetch('/api/sync/events?' + params, {
+      credentials: 'same-origin',
+      cache: 'no-store',
+      redirect: 'manual'
+    });
+    if (!response.ok) {
+      throw new Error('sync endpoint returned ' + (response.status || response.type));
+    }
+    const data = await response.json();
+    const done = !data.has_more;
+
+    const tx = db.transaction(['events', 'summaries', 'meta'], 'readwrite');
+    if (full && page === 0) {
+      tx.objectStore('events').clear();
+      tx.objectStore('summaries').clear();
+    }
+    // Keys are looked up by URL segment (a string), so store them as strings
+    data.events.forEach((row) => tx.objectStore('events').put({ ...row, id: String(row.id) }));
+    data.summaries.forEach((row) => tx.objectStore('summaries').put({ ...row, event_id: String(row.event_id) }));
+    cursor = data.cursor;
+    tx.objectStore('meta').put({
+      // An interrupted full sync starts over rather than resuming half-cleared
+      cursor: full && !done ? null : cursor,
+      lastSync: Date.now(),
+      lastFullSync: full && done ? Date.now() : state.lastFullSync
+    }, 'state');
+    await idbDone(tx);
+
+    received += data.events.length + data.summaries.length;
+    if (done) {
+      break;
+    }
+  }
+  console.log('[Service Worker] Event sync complete:', full ? 'full,' : 'delta,', received, 'rows');
+}
+
+async function clearLocalEvents() {
+  const db = await openSyncDB();
+  const tx = db.transaction(['events', 'summaries', 'meta'], 'readwrite');
+  ['events', 'summaries', 'meta'].forEach((name) => tx.objectStore(name).clear());
+  await idbDone(tx);
+}
+
+/**
+ * Build /events or /events/<id> from the IndexedDB copy. Resolves to null
+ * when there is no local data for the page.
+ */
+async function renderFromLocalData(request) {
+  const pathname = new URL(request.url).pathname;
+  const detail = pathname.match(/^\/events\/([^/]+)$/);
+  if (pathname !== '/events' && !detail) {
+    return null;
+  }
+
+  try {
+    const db = await openSyncDB();
+    const state = await readSyncState(db);
+    if (!state.lastSync) {
+      return null;
+    }
+
+    let body;
+    if (detail) {
+      const id = decodeURIComponent(detail[1]);
+      const tx = db.transaction(['events', 'summaries']);
+      const [event, summary] = await Promise.all([
+        idbResult(tx.objectStore('events').get(id)),
+        idbResult(tx.objectStore('summaries').get(id))
+      ]);
+      if (!event) {
+        return null;
+      }
+      body = renderOfflineEvent(event, summary);
+    } else {
+      const events = await idbResult(db.transaction('events').objectStore('events').getAll());
+      body = renderOfflineEventList(events);
+    }
+
+    return new Response(offlinePage(body, state.lastSync), {
+      headers: { 'Content-Type': 'text/html; charset=utf-8' }
+    });
+  } catch (error) {
+    console.log('[Service Worker] Local event data unavailable:', error);
+    return null;
+  }
+}
+
+function escapeHTML(value) {
+  return String(value == null ? '' : value)
+    .replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+}
+
+function eventDates(event) {
+  return escapeHTML(event.start_date) + (event.end_date ? ' → ' + escapeHTML(event.end_date) : '');
+}
+
+function renderOfflineEventList(events) {
+  const today = new Date().toISOString().slice(0, 10);
+  const upcoming = events.filter((e) => (e.end_date || e.start_date) >= today)
+    .sort((a, b) => a.start_date.localeCompare(b.start_date));
+  const past = events.filter((e) => (e.end_date || e.start_date) < today)
+    .sort((a, b) => b.start_date.localeCompare(a.start_date));
+
+  const item = (e) => `
+    <li><a href="/events/${encodeURIComponent(e.id)}">
+      <strong>${escapeHTML(e.name)}</strong>
+      <span>${eventDates(e)}${e.location ? ' · ' + escapeHTML(e.location) : ''}${e.industry ? ' · ' + escapeHTML(e.industry) : ''}</span>
+    </a></li>`;
+
+  return `
+    <h1>Events</h1>
+    <h2>// upcoming (${upcoming.length})</h2>
+    <ul class="offline-events">${upcoming.map(item).join('') || '<li>No upcoming events saved.</li>'}</ul>
+    <h2>// past (${past.length})</h2>
+    <ul class="offline-events">${past.map(item).join('')}</ul>`;
+}
+
+function renderOfflineEvent(event, summary) {
+  return `
+    <p><a href="/events">← all events</a></p>
+    <h1>${escapeHTML(event.name)}</h1>
+    <p>${eventDates(event)}</p>
+    ${event.location ? `<p>${escapeHTML(event.location)}${event.country ? ', ' + escapeHTML(event.country) : ''}</p>` : ''}
+    ${event.description ? `<p>${escapeHTML(event.description)}</p>` : ''}
+    ${summary ? `
+    <section class="offline-summary">
+      <h2>Event Summary</h2>
+      ${summary.summary_text || ''}
+      <p><small>Generated ${escapeHTML((summary.generated_at || '').slice(0, 10))}</small></p>
+    </section>` : ''}`;
+}
+
+function offlinePage(body, lastSync) {
+  const stylesheet = PRECACHE_ASSETS.find((url) => /\/css\/app\.[0-9a-f]+\.css$/.test(url));
+  return `<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0, viewport-fit=cover">
+  <title>Piana BI Hub (offline)</title>
+  ${stylesheet ? `<link rel="stylesheet" href="${stylesheet}">` : ''}
+  <style>
+    .offline-data { max-width: 900px; margin: 0 auto; padding: 24px 16px 80px; }
+    .offline-banner { background: #fef3c7; color: #92400e; padding: 0.5rem 1rem; text-align: center;
+                      font-size: 0.85rem; font-weight: 600; border-bottom: 1px solid #fcd34d; }
+    .offline-data h2 { font-family: 'JetBrains Mono', monospace; font-size: 0.8rem; color: #666; margin: 24px 0 12px; }
+    .offline-events { list-style: none; padding: 0; display: flex; flex-direction: column; gap: 8px; }
+    .offline-events a { display: block; padding: 14px 16px; background: #111; border: 1px solid #222;
+                        border-radius: 8px; color: inherit; text-decoration: none; }
+    .offline-events strong { display: block; color: #fff; }
+    .offline-events span { color: #888; font-size: 0.85rem; }
+  </style>
+</head>
+<body>
+  <div class="offline-banner" role="status">
+    You're offline - showing events saved on this device (synced ${escapeHTML(new Date(lastSync).toLocaleString())})
+  </div>
+  <main class="offline-data">${body}</main>
+</body>
+</html>`;
+}
+
 // --- PUSH NOTIFICATION HANDLERS ---
 
 /**